@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Optional
+from typing import Any, List, Optional, Sequence
 
 
 class ApiParseError(ValueError):
@@ -70,6 +70,17 @@ def parse_bool(value: Any, default: bool) -> bool:
     raise ApiParseError("invalid boolean")
 
 
+def parse_fields(value: Any, allowed: Sequence[str]) -> Optional[List[str]]:
+    """Comma-separated field projection; None when absent (all fields)."""
+    if value is None or value == "":
+        return None
+    fields = [name.strip() for name in str(value).split(",") if name.strip()]
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise ApiParseError(f"unknown fields: {', '.join(unknown)}")
+    return fields
+
+
 def parse_device(value: Any, default: str = "auto") -> str:
     device = str(value if value is not None else default).strip().lower()
     if device not in ("auto", "cuda", "cpu"):
@@ -1,38 +1,77 @@
-"""SB3 VecEnv wrapper around GPU-batched BatchedBoatSim."""
+"""SB3 VecEnv wrappers around the batched sims (torch BatchedBoatSim, NumpyBatchedBoatSim)."""
 
 from __future__ import annotations
 
-from typing import Any, List, Optional
+import time
+from typing import Any, List, Optional, Sequence, Tuple
 
 import numpy as np
 import torch
 from stable_baselines3.common.vec_env.base_vec_env import VecEnv, VecEnvIndices, VecEnvStepReturn
 
-from sim_torch import BatchedBoatSim, BatchedBoatSimConfig
+import prepare as P
+from sim_common import TRAIN_K_MAX, BatchedBoatSimConfig, FinishedEpisodes
+from sim_numpy import NumpyBatchedBoatSim
+from sim_torch import BatchedBoatSim
 
 
-def make_gpu_vec_env(
+def _sim_config(
     *,
     n_envs: int,
     mode: str,
-    device: Optional[str] = None,
     goal_hold_sec: int = 0,
     max_episode_steps: Optional[int] = None,
     current_enabled: bool = False,
     seed: Optional[int] = None,
-) -> "BatchedBoatVecEnv":
-    cfg = BatchedBoatSimConfig(
+    train_seeds: Optional[Sequence[P.ScenarioSeed]] = None,
+    train_max_contacts: int = TRAIN_K_MAX,
+    nominal_plant: Optional[P.PlantParams] = None,
+    dynamics_jitter: bool = False,
+    contact_obs_noise_m: float = 0.0,
+    contact_obs_noise_bearing_rad: float = 0.0,
+) -> BatchedBoatSimConfig:
+    return BatchedBoatSimConfig(
         mode=mode,
         n_envs=n_envs,
         max_episode_steps=max_episode_steps or 600,
         goal_hold_sec=goal_hold_sec,
         current_enabled=current_enabled,
+        train_seeds=train_seeds,
+        train_max_contacts=train_max_contacts,
+        nominal_plant=nominal_plant,
+        dynamics_jitter=dynamics_jitter,
+        contact_obs_noise_m=contact_obs_noise_m,
+        contact_obs_noise_bearing_rad=contact_obs_noise_bearing_rad,
     )
-    return BatchedBoatVecEnv(cfg, device=device, seed=seed)
+
+
+def make_gpu_vec_env(
+    *,
+    device: Optional[str] = None,
+    seed: Optional[int] = None,
+    **sim_kwargs: Any,
+) -> "BatchedBoatVecEnv":
+    """Torch-batched env; ``sim_kwargs`` are those of ``_sim_config``."""
+    return BatchedBoatVecEnv(_sim_config(**sim_kwargs), device=device, seed=seed)
+
+
+def make_cpu_batched_vec_env(*, seed: Optional[int] = None, **sim_kwargs: Any) -> "NumpyBatchedBoatVecEnv":
+    """NumPy-batched env for hosts without CUDA; same kwargs as ``make_gpu_vec_env``."""
+    return NumpyBatchedBoatVecEnv(_sim_config(**sim_kwargs), seed=seed)
 
 
 class BatchedBoatVecEnv(VecEnv):
-    """Vectorized env stepping all instances on GPU in one kernel."""
+    """Vectorized env stepping all instances on GPU in one kernel.
+
+    Host hand-off is allocation-free: on CPU the returned arrays are numpy views of
+    the sim tensors; on CUDA obs / reward / done are staged into one device block and
+    copied with a single transfer into pinned, double-buffered host memory. Either way
+    a returned obs stays valid until the step after next (SB3 keeps it as ``_last_obs``).
+
+    Only envs that finished get a non-empty info: a Monitor-style ``episode`` record,
+    ``terminal_observation``, ``TimeLimit.truncated`` and the ``success`` / ``collision``
+    outcome, so per-step host work scales with completions rather than ``n_envs``.
+    """
 
     def __init__(
         self,
@@ -40,24 +79,104 @@ class BatchedBoatVecEnv(VecEnv):
         device: Optional[str] = None,
         seed: Optional[int] = None,
     ) -> None:
-        self.sim = BatchedBoatSim(cfg, device=device)
+        self.sim = self._make_sim(cfg, device)
         self._seed = seed
         super().__init__(cfg.n_envs, self.sim.observation_space, self.sim.action_space)
+        self._init_host_buffers()
         self.reset()
 
+    def _make_sim(self, cfg: BatchedBoatSimConfig, device: Optional[str]) -> Any:
+        return BatchedBoatSim(cfg, device=device)
+
+    def _init_host_buffers(self) -> None:
+        n = self.num_envs
+        self._on_cpu = self.sim.device.type == "cpu"
+        pin = not self._on_cpu and torch.cuda.is_available()
+        self._actions_host = torch.zeros((n, 2), dtype=torch.float32, pin_memory=pin)
+        self._actions_np = self._actions_host.numpy()
+        self._infos: List[dict] = [{} for _ in range(n)]
+        self._info_rows: List[int] = []
+        if self._on_cpu:
+            self._actions_dev = self._actions_host
+            return
+        self._actions_dev = torch.zeros((n, 2), device=self.sim.device)
+        # Columns: obs | reward | done.
+        width = P.OBS_DIM + 2
+        self._staging = torch.zeros((n, width), device=self.sim.device)
+        self._host = tuple(torch.zeros((n, width), pin_memory=pin) for _ in range(2))
+        self._host_np = tuple(h.numpy() for h in self._host)
+        self._host_slot = 0
+
+    def _to_host(
+        self, obs: torch.Tensor, rewards: torch.Tensor, dones: torch.Tensor
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._on_cpu:
+            return obs.numpy(), rewards.numpy(), dones.numpy()
+        staging = self._staging
+        staging[:, : P.OBS_DIM].copy_(obs)
+        staging[:, P.OBS_DIM] = rewards
+        staging[:, P.OBS_DIM + 1] = dones.float()
+        self._host_slot ^= 1
+        self._host[self._host_slot].copy_(staging, non_blocking=True)
+        torch.cuda.current_stream(self.sim.device).synchronize()
+        host = self._host_np[self._host_slot]
+        return host[:, : P.OBS_DIM], host[:, P.OBS_DIM], host[:, P.OBS_DIM + 1] > 0.5
+
+    def _clear_infos(self) -> None:
+        for i in self._info_rows:
+            self._infos[i] = {}
+        self._info_rows = []
+
+    def _finished_infos(self, fin: FinishedEpisodes) -> None:
+        """Fill infos for finished rows with one host transfer of the stacked stats."""
+        stats = torch.stack(
+            (
+                fin.ep_return,
+                fin.ep_length,
+                fin.success.float(),
+                fin.collision.float(),
+                fin.truncated.float(),
+                fin.index.float(),
+            ),
+            dim=1,
+        )
+        self._episode_infos(torch.cat((fin.terminal_obs, stats), dim=1).cpu().numpy())
+
+    def _episode_infos(self, block: np.ndarray) -> None:
+        """``block`` rows: terminal obs | return, length, success, collision, truncated, env index."""
+        elapsed = round(time.perf_counter() - self._t_start, 6)
+        base = P.OBS_DIM
+        rows = block[:, base + 5].astype(np.int64).tolist()
+        for j, i in enumerate(rows):
+            r = block[j]
+            self._infos[i] = {
+                "episode": {"r": float(r[base]), "l": int(r[base + 1]), "t": elapsed},
+                "terminal_observation": r[:base],
+                "TimeLimit.truncated": bool(r[base + 4] > 0.5),
+                "success": bool(r[base + 2] > 0.5),
+                "collision": bool(r[base + 3] > 0.5),
+            }
+        self._info_rows = rows
+
     def reset(self) -> np.ndarray:
+        self._t_start = time.perf_counter()
+        self._clear_infos()
         obs = self.sim.reset(seed=self._seed)
-        return obs.cpu().numpy()
+        zeros = torch.zeros(self.num_envs, device=self.sim.device)
+        return self._to_host(obs, zeros, zeros.bool())[0]
 
     def step_async(self, actions: np.ndarray) -> None:
-        self._actions = np.asarray(actions, dtype=np.float32)
+        np.copyto(self._actions_np, actions, casting="same_kind")
+        if not self._on_cpu:
+            self._actions_dev.copy_(self._actions_host, non_blocking=True)
 
     def step_wait(self) -> VecEnvStepReturn:
-        act = torch.as_tensor(self._actions, device=self.sim.device, dtype=torch.float32)
-        obs, rewards, terminated, truncated = self.sim.step(act)
-        dones = (terminated | truncated).cpu().numpy()
-        infos: List[dict] = [{} for _ in range(self.num_envs)]
-        return obs.cpu().numpy(), rewards.cpu().numpy(), dones, infos
+        obs, rewards, terminated, truncated = self.sim.step(self._actions_dev)
+        obs_np, rewards_np, dones = self._to_host(obs, rewards, terminated | truncated)
+        self._clear_infos()
+        if self.sim.finished is not None:
+            self._finished_infos(self.sim.finished)
+        return obs_np, rewards_np, dones, self._infos
 
     def close(self) -> None:
         return None
@@ -93,3 +212,38 @@ class BatchedBoatVecEnv(VecEnv):
     def seed(self, seed: Optional[int] = None) -> List[Optional[int]]:
         self._seed = seed
         return [seed] * self.num_envs
+
+
+class NumpyBatchedBoatVecEnv(BatchedBoatVecEnv):
+    """``BatchedBoatVecEnv`` over ``NumpyBatchedBoatSim``: obs / reward / done are the sim arrays."""
+
+    def __init__(self, cfg: BatchedBoatSimConfig, seed: Optional[int] = None) -> None:
+        super().__init__(cfg, device="cpu", seed=seed)
+
+    def _make_sim(self, cfg: BatchedBoatSimConfig, device: Optional[str]) -> NumpyBatchedBoatSim:
+        return NumpyBatchedBoatSim(cfg)
+
+    def _init_host_buffers(self) -> None:
+        n = self.num_envs
+        self._on_cpu = True
+        self._actions_np = np.zeros((n, 2), dtype=np.float32)
+        self._actions_dev = self._actions_np
+        self._infos = [{} for _ in range(n)]
+        self._info_rows = []
+
+    def _to_host(
+        self, obs: np.ndarray, rewards: np.ndarray, dones: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return obs, rewards, dones
+
+    def _finished_infos(self, fin: FinishedEpisodes) -> None:
+        stats = np.stack(
+            (fin.ep_return, fin.ep_length, fin.success, fin.collision, fin.truncated, fin.index),
+            axis=1,
+        ).astype(np.float32)
+        self._episode_infos(np.concatenate((fin.terminal_obs, stats), axis=1))
+
+    def reset(self) -> np.ndarray:
+        self._t_start = time.perf_counter()
+        self._clear_infos()
+        return self.sim.reset(seed=self._seed)
@@ -10,8 +10,9 @@ from stable_baselines3.common.callbacks import BaseCallback
 
 from async_eval import AsyncEvalRunner
 from checkpoint_util import save_best_checkpoint, save_periodic_snapshot
-from curriculum import check_exit, get_phase, is_summary_better, metrics_to_summary
+from curriculum import PhaseSpec, check_exit, get_phase, is_summary_better, metrics_to_summary
 from eval_parallel import EvalResult, checkpoint_zip_path, run_eval_from_snapshot, snapshot_model_for_eval
+from eval_pool import active_eval_pool, run_eval_from_weights
 from eval_runner import run_eval
 from runs_util import score_key_for_mode
 from scenario_seeds import eval_seeds_for_mode
@@ -37,6 +38,13 @@ def _eval_metrics(result: Any) -> Dict[str, Any]:
     return result
 
 
+def _episodes_used(summary: Dict[str, Any]) -> str:
+    planned = summary.get("eval_episodes_planned")
+    if planned is None:
+        return ""
+    return f" episodes={summary.get('eval_episodes')}/{planned} ({summary.get('sequential_decision') or 'full'})"
+
+
 class TimeBudgetCallback(BaseCallback):
     def __init__(self, budget_sec: float, verbose: int = 0):
         super().__init__(verbose)
@@ -134,6 +142,12 @@ class LiveMetricsCallback(BaseCallback):
         self.start_time = time.time()
         self.last_eval_time = self.start_time
 
+    def _gate(self) -> Optional[PhaseSpec]:
+        """Current curriculum phase, so sequential evals can stop once it is settled."""
+        if C.CURRICULUM_PHASE is None:
+            return None
+        return get_phase(C.CURRICULUM_PHASE)
+
     def _publish_metrics(self, metrics: Dict[str, Any], elapsed: float) -> None:
         score = metrics[score_key_for_mode(self.mode)]
         append_live_metric(
@@ -156,6 +170,24 @@ class LiveMetricsCallback(BaseCallback):
         self.eval_tick += 1
         sample_seed = self.num_timesteps + self.eval_tick * 10007
         if self._async.enabled:
+            pool = active_eval_pool()
+            if pool is not None:
+                # Weights copied on the training thread; no snapshot zip or PPO.load.
+                self._async.submit(
+                    run_eval_from_weights,
+                    pool.capture(model),
+                    self.mode,
+                    self.max_scenarios,
+                    sample_seed,
+                    None,
+                    None,
+                    None,
+                    False,
+                    True,
+                    None,
+                    gate=self._gate(),
+                )
+                return
             snap = self.run_dir / "_live_eval_snapshot"
             stem = snapshot_model_for_eval(model, snap)
             if not self._async.submit(
@@ -170,6 +202,7 @@ class LiveMetricsCallback(BaseCallback):
                 False,
                 True,
                 None,
+                gate=self._gate(),
             ):
                 checkpoint_zip_path(stem).unlink(missing_ok=True)
             return
@@ -179,6 +212,7 @@ class LiveMetricsCallback(BaseCallback):
             max_scenarios=self.max_scenarios,
             sample_seed=sample_seed,
             collect_traces=False,
+            gate=self._gate(),
         ).metrics
         self._publish_metrics(metrics, time.time() - self.start_time)
 
@@ -264,6 +298,24 @@ class CurriculumCheckpointCallback(BaseCallback):
         self._eval_was_capped = use_cap
         sample_seed = self.num_timesteps + self.tick * 10007
         if self._async.enabled:
+            pool = active_eval_pool()
+            if pool is not None:
+                # Weights copied on the training thread; no snapshot zip or PPO.load.
+                self._async.submit(
+                    run_eval_from_weights,
+                    pool.capture(model),
+                    self.mode,
+                    max_sc,
+                    sample_seed,
+                    None,
+                    None,
+                    None,
+                    False,
+                    True,
+                    None,
+                    gate=self.phase,
+                )
+                return
             snap = self.run_dir / "_curriculum_eval_snapshot"
             stem = snapshot_model_for_eval(model, snap)
             if not self._async.submit(
@@ -278,6 +330,7 @@ class CurriculumCheckpointCallback(BaseCallback):
                 False,
                 True,
                 None,
+                gate=self.phase,
             ):
                 checkpoint_zip_path(stem).unlink(missing_ok=True)
             return
@@ -287,6 +340,7 @@ class CurriculumCheckpointCallback(BaseCallback):
             max_scenarios=max_sc,
             sample_seed=sample_seed,
             collect_traces=False,
+            gate=self.phase,
         ).metrics
         self._handle_eval_metrics(metrics)
 
@@ -299,6 +353,7 @@ class CurriculumCheckpointCallback(BaseCallback):
             max_scenarios=max_sc,
             sample_seed=self.num_timesteps + self.tick * 10007,
             collect_traces=False,
+            gate=self.phase,
         ).metrics
         summary = metrics_to_summary(metrics)
         summary["eval_capped"] = use_cap
@@ -348,7 +403,8 @@ class CurriculumCheckpointCallback(BaseCallback):
         sr = summary.get("success_rate")
         print(
             f"[curriculum-eval] new best success_rate={sr} "
-            f"zone_entry={summary.get('zone_entry_rate')} timesteps={self.num_timesteps}",
+            f"zone_entry={summary.get('zone_entry_rate')} timesteps={self.num_timesteps}"
+            f"{_episodes_used(summary)}",
             flush=True,
         )
         score = summary.get("score") or 0.0
@@ -14,7 +14,7 @@ from colregs.evaluate import EncounterResult, _rollup_by_rule
 from colregs.geometry import Pose, pose_from_states
 from colregs.live import live_status_for_step
 from colregs.safety import analyze_safety
-from colregs.trace_io import contact_from_step, contact_radius_from_step, own_from_step
+from colregs.trace_io import contact_from_step, own_from_step
 
 
 @dataclass
@@ -47,19 +47,27 @@ class RollingEncounterTracker:
         self._contacts: Dict[int, _RollingContact] = {}
 
     def ingest_step(self, step_idx: int, step: Dict[str, Any]) -> None:
-        own = own_from_step(step)
         contacts = step.get("contacts") or []
-        for i in range(len(contacts)):
+        self.ingest_states(
+            step_idx,
+            own_from_step(step),
+            [contact_from_step(step, i) for i in range(len(contacts))],
+        )
+
+    def ingest_states(
+        self,
+        step_idx: int,
+        own: P.VesselState,
+        contacts: Sequence[Optional[P.ContactState]],
+    ) -> None:
+        """Same as ``ingest_step`` from live sim state (eval rollouts without a trace)."""
+        for i, contact in enumerate(contacts):
+            if contact is None:
+                continue
             rolling = self._contacts.setdefault(
                 i,
-                _RollingContact(
-                    contact_index=i,
-                    contact_radius_m=contact_radius_from_step(step, i),
-                ),
+                _RollingContact(contact_index=i, contact_radius_m=float(contact.radius_m)),
             )
-            contact = contact_from_step(step, i)
-            if contact is None:
-                continue
             if P.check_collision(own, [contact], self.own_radius_m):
                 rolling.collision = True
 
@@ -350,7 +350,7 @@ def metrics_to_summary(metrics: Dict[str, Any]) -> Dict[str, Any]:
     zone = metrics.get("episodes_with_goal_zone_steps")
     if zone is None and eval_eps:
         zone = 0
-    return {
+    summary = {
         "success_rate": metrics.get("success_rate"),
         "collision_rate": metrics.get("collision_rate"),
         "mean_speed_mps": metrics.get("mean_speed_mps"),
@@ -364,6 +364,11 @@ def metrics_to_summary(metrics: Dict[str, Any]) -> Dict[str, Any]:
         "reward_breakdown_mean": metrics.get("reward_breakdown_mean"),
         "score": metrics.get("avoid_score") if metrics.get("mode") == "avoid" else metrics.get("nav_score"),
     }
+    # Sequential evals (eval_sequential) record how far they ran.
+    for key in ("eval_episodes_planned", "sequential_decision"):
+        if metrics.get(key) is not None:
+            summary[key] = metrics[key]
+    return summary
 
 
 def summary_meets_speed_bounds(phase: PhaseSpec, summary: Dict[str, Any]) -> bool:
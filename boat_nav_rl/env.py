@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import math
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import gymnasium as gym
 import numpy as np
@@ -20,9 +20,9 @@ from rewards import (
     compute_step_reward,
     contact_step_metrics,
     energy_score_from_speeds,
-    energy_score_from_trace,
     get_reward_config,
 )
+from trace_recorder import TraceRecorder
 
 DEFAULT_TRAIN_MAX_CONTACTS = 4
 _VESSEL_CLASS_CHOICES = tuple(P.VESSEL_CLASSES.keys())
@@ -76,7 +76,7 @@ class BoatNavEnv(gym.Env):
 
         self.plant = self.nominal_plant.to_plant()
         self.own = P.VesselState()
-        self.contacts: List[P.ContactState] = []
+        self._contacts = P.ContactTable()
         self.goal_x = 0.0
         self.goal_y = 0.0
         self.leg_start_x = 0.0
@@ -97,6 +97,15 @@ class BoatNavEnv(gym.Env):
         )
         self.action_space = spaces.Box(low=-1.0, high=1.0, shape=(2,), dtype=np.float32)
 
+    @property
+    def contacts(self) -> P.ContactTable:
+        """Traffic as a struct-of-arrays table; assigning any contact sequence copies it in."""
+        return self._contacts
+
+    @contacts.setter
+    def contacts(self, value: Iterable[P.ContactState]) -> None:
+        self._contacts = P.as_contact_table(value)
+
     def _obs_noise_kwargs(self) -> Dict[str, Any]:
         return {
             "contact_noise_m": self.contact_obs_noise_m,
@@ -305,8 +314,7 @@ class BoatNavEnv(gym.Env):
         P.apply_water_current(self.own, self.water_current, P.DT_S)
 
         if advance_contacts:
-            for c in self.contacts:
-                c.step(P.DT_S)
+            self.contacts.step(P.DT_S)
 
         self.step_count += 1
         goal_changed = False
@@ -430,96 +438,151 @@ class BoatNavEnv(gym.Env):
         reset_seed: Optional[int] = None,
         scenario: Optional[P.ScenarioSeed] = None,
         collect_trace: bool = True,
+        score_colregs: bool = False,
     ) -> Dict[str, Any]:
-        if max_steps is None:
-            max_steps = self.max_steps
+        run = EpisodeRollout(
+            self,
+            max_steps=max_steps,
+            reset_seed=reset_seed,
+            scenario=scenario,
+            collect_trace=collect_trace,
+            score_colregs=score_colregs,
+        )
+        while not run.done:
+            action, _ = safe_model_predict(model, run.obs, deterministic=True)
+            run.step(action)
+        return run.result()
+
+
+class EpisodeRollout:
+    """One eval episode driven from outside (``rollout_episode`` or a lock-step batch).
+
+    The caller supplies each action for ``obs``; ``result()`` is the episode dict. With
+    ``score_colregs`` every recorded state also feeds a ``RollingEncounterTracker``, and
+    the result carries its rollup as ``colregs`` (the ``evaluate_episode`` dict), with or
+    without a trace.
+    """
+
+    def __init__(
+        self,
+        env: BoatNavEnv,
+        *,
+        max_steps: Optional[int] = None,
+        reset_seed: Optional[int] = None,
+        scenario: Optional[P.ScenarioSeed] = None,
+        collect_trace: bool = True,
+        score_colregs: bool = False,
+    ) -> None:
+        self.env = env
+        self.scenario = scenario
         seed = reset_seed
         if seed is None and scenario is not None:
             seed = scenario.seed
-        elif seed is None and self.scenario is not None:
-            seed = self.scenario.seed
+        elif seed is None and env.scenario is not None:
+            seed = env.scenario.seed
 
         reset_options = {"scenario": scenario} if scenario is not None else None
-        obs, _ = self.reset(seed=seed, options=reset_options)
-
-        steps: List[Dict[str, Any]] = []
-        speeds: List[float] = [float(self.own.speed_mps)]
-        if collect_trace:
-            steps.append(
-                P.snapshot_step(0, self.own, self.goal_x, self.goal_y, self.contacts)
+        self.obs, _ = env.reset(seed=seed, options=reset_options)
+        if max_steps is None:
+            # After reset: mission scenarios extend the step budget per episode.
+            max_steps = env.max_steps
+        self.max_steps = max_steps
+        self.t = 0
+        self.done = max_steps <= 0
+
+        self.trace = TraceRecorder(max_steps + 1, max(len(env.contacts), 1)) if collect_trace else None
+        self.speeds: List[float] = [float(env.own.speed_mps)]
+        if self.trace is not None:
+            self.trace.record(0, env.own, env.goal_x, env.goal_y, env.contacts)
+        self.colregs = None
+        if score_colregs:
+            from colregs.config import load_config
+            from colregs.frame_series import RollingEncounterTracker
+
+            scenario_ref = scenario or env.scenario
+            self.colregs = RollingEncounterTracker(
+                load_config(),
+                scenario_category=scenario_ref.category if scenario_ref else "random",
             )
-
-        collision = False
-        success = False
-        cpa_unsafe_at_end = False
-        final_goal_range_m = P.goal_range(self.own, self.goal_x, self.goal_y)
-        initial_goal_range_m = float(self.initial_goal_range)
-        min_goal_range_m = final_goal_range_m
-        entered_goal_zone = final_goal_range_m < P.GOAL_SUCCESS_RANGE_M
-        goal_zone_speeds: List[float] = []
-        en_route_cross_tracks: List[float] = []
-        max_goal_hold_steps = 0
-        goal_hold_required = self.goal_hold_steps_required
-        breakdown_sums: Dict[str, float] = {}
-        breakdown_steps = 0
-
-        for _t in range(1, max_steps + 1):
-            action, _ = safe_model_predict(model, obs, deterministic=True)
-            obs, _, terminated, truncated, info = self.step(action)
-            if self.include_reward_breakdown and info.get("reward_breakdown"):
-                for key, val in info["reward_breakdown"].items():
-                    breakdown_sums[key] = breakdown_sums.get(key, 0.0) + float(val)
-                breakdown_steps += 1
-            final_goal_range_m = info["goal_range_m"]
-            min_goal_range_m = min(min_goal_range_m, final_goal_range_m)
-            if final_goal_range_m < P.GOAL_SUCCESS_RANGE_M:
-                entered_goal_zone = True
-            speed_mps = float(self.own.speed_mps)
-            speeds.append(speed_mps)
-            if final_goal_range_m < P.GOAL_SUCCESS_RANGE_M:
-                goal_zone_speeds.append(speed_mps)
-            else:
-                en_route_cross_tracks.append(
-                    P.cross_track_m(
-                        self.leg_start_x,
-                        self.leg_start_y,
-                        self.goal_x,
-                        self.goal_y,
-                        self.own.x_m,
-                        self.own.y_m,
-                    )
-                )
-            if collect_trace:
-                steps.append(
-                    P.snapshot_step(
-                        self.step_count, self.own, self.goal_x, self.goal_y, self.contacts
-                    )
+            self.colregs.ingest_states(0, env.own, env.contacts)
+
+        self.collision = False
+        self.success = False
+        self.cpa_unsafe_at_end = False
+        self.final_goal_range_m = P.goal_range(env.own, env.goal_x, env.goal_y)
+        self.initial_goal_range_m = float(env.initial_goal_range)
+        self.min_goal_range_m = self.final_goal_range_m
+        self.entered_goal_zone = self.final_goal_range_m < P.GOAL_SUCCESS_RANGE_M
+        self.goal_zone_speeds: List[float] = []
+        self.en_route_cross_tracks: List[float] = []
+        self.max_goal_hold_steps = 0
+        self.goal_hold_required = env.goal_hold_steps_required
+        self.breakdown_sums: Dict[str, float] = {}
+        self.breakdown_steps = 0
+
+    def step(self, action: Any) -> bool:
+        """Apply ``action`` and accumulate episode stats; returns ``done``."""
+        env = self.env
+        self.t += 1
+        self.obs, _, terminated, truncated, info = env.step(action)
+        if env.include_reward_breakdown and info.get("reward_breakdown"):
+            for key, val in info["reward_breakdown"].items():
+                self.breakdown_sums[key] = self.breakdown_sums.get(key, 0.0) + float(val)
+            self.breakdown_steps += 1
+        final_goal_range_m = info["goal_range_m"]
+        self.final_goal_range_m = final_goal_range_m
+        self.min_goal_range_m = min(self.min_goal_range_m, final_goal_range_m)
+        if final_goal_range_m < P.GOAL_SUCCESS_RANGE_M:
+            self.entered_goal_zone = True
+        speed_mps = float(env.own.speed_mps)
+        self.speeds.append(speed_mps)
+        if final_goal_range_m < P.GOAL_SUCCESS_RANGE_M:
+            self.goal_zone_speeds.append(speed_mps)
+        else:
+            self.en_route_cross_tracks.append(
+                P.cross_track_m(
+                    env.leg_start_x,
+                    env.leg_start_y,
+                    env.goal_x,
+                    env.goal_y,
+                    env.own.x_m,
+                    env.own.y_m,
                 )
-            collision = collision or info["collision"]
-            success = info["success"]
-            cpa_unsafe_at_end = bool(info.get("cpa_unsafe", False))
-            max_goal_hold_steps = max(max_goal_hold_steps, int(info.get("goal_hold_steps") or 0))
-            if info.get("goal_hold_required") is not None:
-                goal_hold_required = int(info["goal_hold_required"])
-            if terminated or truncated:
-                break
-
-        scenario_ref = scenario or self.scenario
+            )
+        if self.trace is not None:
+            self.trace.record(env.step_count, env.own, env.goal_x, env.goal_y, env.contacts)
+        if self.colregs is not None:
+            self.colregs.ingest_states(self.t, env.own, env.contacts)
+        self.collision = self.collision or info["collision"]
+        self.success = info["success"]
+        self.cpa_unsafe_at_end = bool(info.get("cpa_unsafe", False))
+        self.max_goal_hold_steps = max(self.max_goal_hold_steps, int(info.get("goal_hold_steps") or 0))
+        if info.get("goal_hold_required") is not None:
+            self.goal_hold_required = int(info["goal_hold_required"])
+        self.done = bool(terminated or truncated) or self.t >= self.max_steps
+        return self.done
+
+    def result(self) -> Dict[str, Any]:
+        env = self.env
+        scenario_ref = self.scenario or env.scenario
+        speeds = self.speeds
+        goal_zone_speeds = self.goal_zone_speeds
+        en_route_cross_tracks = self.en_route_cross_tracks
         result: Dict[str, Any] = {
-            "collision": collision,
-            "success": success,
-            "cpa_unsafe_in_goal": self.episode_cpa_unsafe_in_goal,
-            "cpa_unsafe_at_end": cpa_unsafe_at_end,
-            "initial_goal_range_m": initial_goal_range_m,
-            "final_goal_range_m": final_goal_range_m,
-            "min_goal_range_m": min_goal_range_m,
-            "entered_goal_zone": entered_goal_zone,
+            "collision": self.collision,
+            "success": self.success,
+            "cpa_unsafe_in_goal": env.episode_cpa_unsafe_in_goal,
+            "cpa_unsafe_at_end": self.cpa_unsafe_at_end,
+            "initial_goal_range_m": self.initial_goal_range_m,
+            "final_goal_range_m": self.final_goal_range_m,
+            "min_goal_range_m": self.min_goal_range_m,
+            "entered_goal_zone": self.entered_goal_zone,
             "scenario_name": scenario_ref.name if scenario_ref else "random",
             "scenario_category": scenario_ref.category if scenario_ref else "random",
             "scenario_description": scenario_ref.description if scenario_ref else "",
             "scenario_seed": scenario_ref.seed if scenario_ref else None,
-            "plant": self.episode_plant.to_dict(),
-            "current": self.water_current.to_dict(),
+            "plant": env.episode_plant.to_dict(),
+            "current": env.water_current.to_dict(),
             "energy_score": energy_score_from_speeds(speeds),
             "mean_speed_mps": round(sum(speeds) / len(speeds), 3) if speeds else None,
             "mean_goal_zone_speed_mps": (
@@ -543,15 +606,16 @@ class BoatNavEnv(gym.Env):
             "max_cross_track_m": (
                 round(max(en_route_cross_tracks), 2) if en_route_cross_tracks else None
             ),
-            "goal_hold_steps": max_goal_hold_steps,
-            "goal_hold_required": goal_hold_required,
+            "goal_hold_steps": self.max_goal_hold_steps,
+            "goal_hold_required": self.goal_hold_required,
         }
-        if breakdown_steps:
+        if self.breakdown_steps:
             result["mean_reward_breakdown"] = {
-                k: round(v / breakdown_steps, 4) for k, v in breakdown_sums.items()
+                k: round(v / self.breakdown_steps, 4) for k, v in self.breakdown_sums.items()
             }
-        if collect_trace:
-            result["steps"] = steps
-            result["energy_score"] = energy_score_from_trace(steps)
+        if self.trace is not None:
+            # energy_score already covers the same per-step speeds the trace records.
+            result["steps"] = self.trace.steps()
+        if self.colregs is not None:
+            result["colregs"] = self.colregs.rollup()
         return result
-
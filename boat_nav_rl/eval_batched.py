@@ -0,0 +1,249 @@
+"""Single-batch eval: every scenario advances in lockstep on one vectorized sim.
+
+Each scenario is reset on a CPU ``BoatNavEnv`` (same seeded plant / current / mission
+draws as ``rollout_episode``) and copied into one row of a ``NumpyBatchedBoatSim`` or
+``BatchedBoatSim``. Every step runs one batched policy forward over the rows still
+running; finished rows are masked out. Output episodes carry the same fields as
+``BoatNavEnv.rollout_episode`` so ``aggregate_eval_metrics`` consumes them unchanged.
+No traces — callers that need ``steps`` keep the CPU path.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from stable_baselines3 import PPO
+
+import prepare as P
+from policy_infer import safe_model_predict
+from rewards import HOLD_AT_STOP_EPS_MPS, energy_score_from_speeds
+from sim_common import K_MAX, BatchedBoatSimConfig
+
+# numpy = host sim (fastest at eval batch sizes); torch = BatchedBoatSim on EVAL_BATCHED_DEVICE.
+EVAL_BATCHED_BACKEND = os.environ.get("EVAL_BATCHED_BACKEND", "numpy").strip().lower()
+EVAL_BATCHED_DEVICE = os.environ.get("EVAL_BATCHED_DEVICE", "cpu").strip() or "cpu"
+
+# Row order of the per-step state block pulled to host once per step.
+_STATE_FIELDS = (
+    "goal_range",
+    "speed",
+    "x",
+    "y",
+    "leg_start_x",
+    "leg_start_y",
+    "goal_x",
+    "goal_y",
+    "goal_hold_steps",
+    "cpa_unsafe",
+    "collision",
+    "success",
+)
+_S = {name: i for i, name in enumerate(_STATE_FIELDS)}
+
+
+def batched_eval_supported(scenarios: List[P.ScenarioSeed]) -> bool:
+    """Sim rows hold at most ``K_MAX`` contacts; larger scenarios stay on the CPU path."""
+    return bool(scenarios) and all(len(s.contacts) <= K_MAX for s in scenarios)
+
+
+def _make_sim(cfg: BatchedBoatSimConfig, backend: str) -> Any:
+    if backend == "numpy":
+        from sim_numpy import NumpyBatchedBoatSim
+
+        return NumpyBatchedBoatSim(cfg)
+    if backend == "torch":
+        from sim_torch import BatchedBoatSim
+
+        return BatchedBoatSim(cfg, device=EVAL_BATCHED_DEVICE)
+    raise ValueError(f"unknown batched eval backend {backend!r} (expected numpy or torch)")
+
+
+def _host_fns(
+    sim: Any,
+) -> Tuple[Callable[[Any], np.ndarray], Callable[[List[Any]], np.ndarray], Callable[[np.ndarray], Any]]:
+    """(array to host, stack rows into one float64 host block, host actions to sim)."""
+    if isinstance(sim.x, np.ndarray):
+        return (lambda a: a), (lambda rows: np.stack(rows).astype(np.float64)), (lambda a: a)
+    import torch
+
+    def to_host(t: Any) -> np.ndarray:
+        return t.cpu().numpy()
+
+    def stack(rows: List[Any]) -> np.ndarray:
+        return to_host(torch.stack([r.float() for r in rows])).astype(np.float64)
+
+    return to_host, stack, (lambda a: torch.as_tensor(a, device=sim.device))
+
+
+def _cross_track(state: np.ndarray) -> np.ndarray:
+    """Vectorized ``P.cross_track_m`` over one state block."""
+    dx = state[_S["goal_x"]] - state[_S["leg_start_x"]]
+    dy = state[_S["goal_y"]] - state[_S["leg_start_y"]]
+    rx = state[_S["x"]] - state[_S["leg_start_x"]]
+    ry = state[_S["y"]] - state[_S["leg_start_y"]]
+    seg_len_sq = dx * dx + dy * dy
+    with np.errstate(invalid="ignore", divide="ignore"):
+        perp = np.abs(rx * dy - ry * dx) / np.sqrt(seg_len_sq)
+    return np.where(seg_len_sq < 1e-6, np.hypot(rx, ry), perp)
+
+
+def rollout_episodes_batched(
+    model: PPO,
+    scenarios: List[P.ScenarioSeed],
+    *,
+    mode: str,
+    goal_hold_sec: int,
+    max_episode_steps: int,
+    current_enabled: bool,
+    plant_jitter: bool,
+    nominal_plant: P.PlantParams,
+    collect_breakdown: bool,
+    backend: Optional[str] = None,
+    plants: Optional[Sequence[P.PlantParams]] = None,
+) -> List[Dict[str, Any]]:
+    """One sim batch over ``scenarios``; ``plants`` gives each row its own nominal plant."""
+    from env import BoatNavEnv
+
+    n = len(scenarios)
+    if n == 0:
+        return []
+    cfg = BatchedBoatSimConfig(
+        mode=mode,
+        n_envs=n,
+        max_episode_steps=max_episode_steps,
+        goal_hold_sec=goal_hold_sec,
+        current_enabled=current_enabled,
+        nominal_plant=nominal_plant,
+        auto_reset=False,
+        # Sizes the waypoint table for the scenarios' missions; rows are overwritten below.
+        train_seeds=scenarios,
+        scenario_missions=True,
+        reward_breakdown=collect_breakdown,
+    )
+    sim = _make_sim(cfg, backend or EVAL_BATCHED_BACKEND)
+    to_host, stack, to_sim = _host_fns(sim)
+
+    env = BoatNavEnv(
+        mode=mode,
+        training_randomize=False,
+        nominal_plant=nominal_plant,
+        dynamics_jitter=plant_jitter,
+        goal_hold_sec=goal_hold_sec,
+        max_episode_steps=max_episode_steps,
+        current_enabled=current_enabled,
+    )
+    obs = np.zeros((n, P.OBS_DIM), dtype=np.float32)
+    initial_speed = np.zeros(n)
+    start_range = np.zeros(n)
+    starts: List[Dict[str, Any]] = []
+    max_steps = 0
+    for i, scenario in enumerate(scenarios):
+        if plants is not None:
+            env.nominal_plant = plants[i]
+        obs[i], _ = env.reset(seed=scenario.seed, options={"scenario": scenario})
+        sim.sync_from_cpu_env(env, [i])
+        initial_speed[i] = env.own.speed_mps
+        start_range[i] = P.goal_range(env.own, env.goal_x, env.goal_y)
+        starts.append(
+            {
+                "initial_goal_range_m": float(env.initial_goal_range),
+                "plant": env.episode_plant.to_dict(),
+                "current": env.water_current.to_dict(),
+                "goal_hold_required": env.goal_hold_steps_required,
+            }
+        )
+        max_steps = max(max_steps, env.max_steps)
+
+    # Per-step history [t, env]; rows past their end step are never read.
+    goal_range = np.zeros((max_steps, n))
+    speed = np.zeros((max_steps, n))
+    cross_track = np.zeros((max_steps, n))
+    hold_steps = np.zeros((max_steps, n))
+    unsafe = np.zeros((max_steps, n), dtype=bool)
+    last = np.zeros((len(_STATE_FIELDS), n))
+    end_step = np.zeros(n, dtype=np.int64)
+    alive = np.ones(n, dtype=bool)
+    actions = np.zeros((n, 2), dtype=np.float32)
+    bd_sums: Dict[str, np.ndarray] = {}
+    bd_seen: Dict[str, np.ndarray] = {}
+
+    for t in range(max_steps):
+        rows = np.flatnonzero(alive)
+        act, _ = safe_model_predict(model, obs[rows], deterministic=True)
+        actions[rows] = act
+        sim_obs, _, terminated, truncated = sim.step(to_sim(actions))
+        state = stack([getattr(sim, name) for name in _STATE_FIELDS])
+        done = stack([terminated, truncated]).any(axis=0)
+        obs[rows] = to_host(sim_obs)[rows]
+
+        goal_range[t] = state[_S["goal_range"]]
+        speed[t] = state[_S["speed"]]
+        cross_track[t] = _cross_track(state)
+        hold_steps[t] = state[_S["goal_hold_steps"]]
+        unsafe[t] = state[_S["cpa_unsafe"]] > 0.0
+        if collect_breakdown:
+            for key, (val, fired) in sim.reward_terms.items():
+                val_h, fired_h = stack([val, fired])
+                bd_sums[key] = bd_sums.get(key, 0.0) + np.where(alive, val_h, 0.0)
+                bd_seen[key] = bd_seen.get(key, False) | (alive & (fired_h > 0.0))
+
+        ended = alive & done
+        end_step[ended] = t + 1
+        last[:, ended] = state[:, ended]
+        alive &= ~done
+        if not alive.any():
+            break
+    end_step[alive] = max_steps
+    last[:, alive] = state[:, alive]
+
+    episodes: List[Dict[str, Any]] = []
+    for i, scenario in enumerate(scenarios):
+        steps = int(end_step[i])
+        ranges = goal_range[:steps, i]
+        speeds = speed[:steps, i]
+        in_zone = ranges < P.GOAL_SUCCESS_RANGE_M
+        zone_speeds = [float(s) for s in speeds[in_zone]]
+        en_route = cross_track[:steps, i][~in_zone]
+        min_range = float(min(start_range[i], ranges.min()))
+        episode: Dict[str, Any] = {
+            "collision": bool(last[_S["collision"], i]),
+            "success": bool(last[_S["success"], i]),
+            "cpa_unsafe_in_goal": bool((in_zone & unsafe[:steps, i]).any()),
+            "cpa_unsafe_at_end": bool(last[_S["cpa_unsafe"], i] > 0.0),
+            "initial_goal_range_m": starts[i]["initial_goal_range_m"],
+            "final_goal_range_m": float(ranges[-1]),
+            "min_goal_range_m": min_range,
+            "entered_goal_zone": min_range < P.GOAL_SUCCESS_RANGE_M,
+            "scenario_name": scenario.name,
+            "scenario_category": scenario.category,
+            "scenario_description": scenario.description,
+            "scenario_seed": scenario.seed,
+            "plant": starts[i]["plant"],
+            "current": starts[i]["current"],
+            "energy_score": energy_score_from_speeds([float(initial_speed[i])] + speeds.tolist()),
+            "mean_speed_mps": round((float(initial_speed[i]) + float(speeds.sum())) / (steps + 1), 3),
+            "mean_goal_zone_speed_mps": (
+                round(sum(zone_speeds) / len(zone_speeds), 3) if zone_speeds else None
+            ),
+            "pct_goal_zone_at_min_speed": (
+                round(sum(1 for s in zone_speeds if s <= HOLD_AT_STOP_EPS_MPS) / len(zone_speeds), 4)
+                if zone_speeds
+                else None
+            ),
+            "goal_zone_steps": len(zone_speeds),
+            "goal_zone_speeds": zone_speeds,
+            "mean_cross_track_m": round(float(en_route.mean()), 2) if en_route.size else None,
+            "max_cross_track_m": round(float(en_route.max()), 2) if en_route.size else None,
+            "goal_hold_steps": int(hold_steps[:steps, i].max()),
+            "goal_hold_required": starts[i]["goal_hold_required"],
+        }
+        if collect_breakdown:
+            episode["mean_reward_breakdown"] = {
+                k: round(float(bd_sums[k][i]) / steps, 4) for k in bd_sums if bd_seen[k][i]
+            }
+        episode["seed"] = scenario.seed
+        episode["mode"] = mode
+        episodes.append(episode)
+    return episodes
@@ -0,0 +1,192 @@
+"""Content-addressed on-disk cache of eval episodes (``runs/_eval_cache``).
+
+An episode is keyed by a hash of the policy parameters, the ``_worker_config_dict``
+(mode, hold, max steps, plant, current, trace/breakdown flags), the ``ScenarioSeed``, the
+rollout engine, the active reward weights, a fingerprint of the sim sources, and (for
+episodes scored with ``score_colregs``) the COLREGS config. Any change to one of those is
+a miss, so a hit always replays the episode dict the rollout would have produced.
+``rollout_episodes(use_cache=True)`` consults it per scenario and only rolls out the
+misses. Only evals of fixed weights opt in; live/curriculum evals would never hit.
+
+Entries are pickles under ``<key[:2]>/<key>.pkl``; a hit refreshes the file's mtime, and
+the oldest files are evicted once the directory passes ``EVAL_CACHE_MAX_MB``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import prepare as P
+
+EVAL_CACHE = os.environ.get("EVAL_CACHE", "1").strip().lower() not in ("0", "false", "no")
+EVAL_CACHE_DIR = Path(os.environ.get("EVAL_CACHE_DIR") or P.RUNS_DIR / "_eval_cache")
+EVAL_CACHE_MAX_MB = float(os.environ.get("EVAL_CACHE_MAX_MB", "512"))
+# Bump when episode dicts change shape in a way the source fingerprint cannot see.
+EVAL_CACHE_VERSION = 1
+_EVICT_TO = 0.9  # fraction of the bound left after an eviction pass
+
+_code_fingerprint: Optional[str] = None
+
+
+def code_fingerprint() -> str:
+    """Hash of the rollout sources (this package's ``*.py`` + ``colregs/``), once per process."""
+    global _code_fingerprint
+    if _code_fingerprint is None:
+        h = hashlib.sha256()
+        for path in sorted(P.ROOT.glob("*.py")) + sorted(P.ROOT.glob("colregs/**/*.py")):
+            h.update(path.relative_to(P.ROOT).as_posix().encode())
+            h.update(path.read_bytes())
+        _code_fingerprint = h.hexdigest()
+    return _code_fingerprint
+
+
+def colregs_config_digest() -> str:
+    """sha256 of ``colregs/default_config.json``, which rollouts with ``score_colregs`` read."""
+    from colregs.config import DEFAULT_CONFIG_PATH
+
+    try:
+        return hashlib.sha256(DEFAULT_CONFIG_PATH.read_bytes()).hexdigest()
+    except OSError:
+        return "missing"
+
+
+def policy_digest(model: Any) -> str:
+    """sha256 over the policy ``state_dict`` (names, dtypes, shapes, bytes)."""
+    h = hashlib.sha256()
+    for name, tensor in model.policy.state_dict().items():
+        arr = tensor.detach().cpu().contiguous().numpy()
+        h.update(f"{name}:{arr.dtype}:{arr.shape}".encode())
+        h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+def episode_keys(
+    model: Any,
+    scenarios: Sequence[P.ScenarioSeed],
+    cfg: Dict[str, Any],
+    *,
+    engine: str,
+) -> List[str]:
+    from rewards import get_reward_config
+
+    fields: Dict[str, Any] = {
+        "version": EVAL_CACHE_VERSION,
+        "code": code_fingerprint(),
+        "policy": policy_digest(model),
+        "cfg": {k: v for k, v in cfg.items() if k != "model_path"},
+        "engine": engine,
+        "rewards": asdict(get_reward_config()),
+    }
+    if cfg.get("score_colregs"):
+        # episode["colregs"] depends on the COLREGS config, which is JSON, not a source file.
+        fields["colregs_config"] = colregs_config_digest()
+    base = json.dumps(fields, sort_keys=True, default=str)
+    keys = []
+    for scenario in scenarios:
+        h = hashlib.sha256(base.encode())
+        h.update(json.dumps(asdict(scenario), sort_keys=True, default=str).encode())
+        keys.append(h.hexdigest())
+    return keys
+
+
+class EvalCache:
+    """Directory of pickled episode dicts with approximate size-bounded LRU eviction."""
+
+    def __init__(self, root: Path, *, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None  # scanned lazily, then tracked per write
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                episode = pickle.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            path.unlink(missing_ok=True)
+            return None
+        return episode if isinstance(episode, dict) else None
+
+    def put(self, key: str, episode: Dict[str, Any]) -> None:
+        path = self.path(key)
+        data = pickle.dumps(episode, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        with self._lock:
+            if self._size is not None:
+                self._size += len(data)
+
+    def _scan(self) -> List[Tuple[str, os.stat_result]]:
+        found: List[Tuple[str, os.stat_result]] = []
+        if not self.root.is_dir():
+            return found
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".pkl"):
+                    try:
+                        found.append((entry.path, entry.stat()))
+                    except OSError:
+                        pass
+        return found
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            if self._size is None:
+                self._size = sum(st.st_size for _, st in self._scan())
+            return self._size
+
+    def evict(self) -> int:
+        """Drop least recently used entries once over the bound; returns files removed."""
+        if self.size_bytes() <= self.max_bytes:
+            return 0
+        entries = sorted(self._scan(), key=lambda item: item[1].st_mtime_ns)
+        total = sum(st.st_size for _, st in entries)
+        target = int(self.max_bytes * _EVICT_TO)
+        removed = 0
+        for path, st in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= st.st_size
+            removed += 1
+        with self._lock:
+            self._size = total
+        return removed
+
+
+_default_cache: Optional[EvalCache] = None
+
+
+def default_eval_cache() -> Optional[EvalCache]:
+    """Process-wide cache under ``EVAL_CACHE_DIR``; None when ``EVAL_CACHE=0``."""
+    global _default_cache
+    if not EVAL_CACHE:
+        return None
+    if _default_cache is None:
+        _default_cache = EvalCache(EVAL_CACHE_DIR, max_bytes=int(EVAL_CACHE_MAX_MB * 1024 * 1024))
+    return _default_cache
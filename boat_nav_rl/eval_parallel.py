@@ -5,19 +5,29 @@ from __future__ import annotations
 import math
 import os
 import uuid
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import closing
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from stable_baselines3 import PPO
 
+import eval_cache as EC
 import prepare as P
+from policy_infer import load_eval_policy
 from rewards import HOLD_AT_STOP_EPS_MPS, aggregate_episode_breakdowns, energy_score_from_speeds
 
 EVAL_WORKERS = int(os.environ.get("EVAL_WORKERS", str(max(1, os.cpu_count() or 4))))
 EVAL_PARALLEL_MIN_SCENARIOS = int(os.environ.get("EVAL_PARALLEL_MIN_SCENARIOS", "4"))
+# auto = one vectorized sim batch for trace-free evals (live / curriculum / robust), CPU env
+# rollouts (process pool) when traces are needed; process = always the CPU env path.
+EVAL_ENGINE = os.environ.get("EVAL_ENGINE", "auto").strip().lower()
+# CPU env path: episode = one predict per env step; lockstep = a block of envs stepped
+# together with one stacked predict per tick (in-process and inside each pool worker).
+EVAL_MODE = os.environ.get("EVAL_MODE", "episode").strip().lower()
+EVAL_LOCKSTEP_BLOCK = max(1, int(os.environ.get("EVAL_LOCKSTEP_BLOCK", "16")))
 
 # Mission score v3 — adds path directness (cross-track) to favor straight legs over wide arcs.
 MISSION_SCORE_VERSION = 3
@@ -261,6 +271,7 @@ def _worker_config_dict(
     nominal_plant: P.PlantParams,
     collect_trace: bool,
     collect_breakdown: bool,
+    score_colregs: bool = False,
 ) -> Dict[str, Any]:
     return {
         "model_path": model_path,
@@ -272,56 +283,149 @@ def _worker_config_dict(
         "nominal_plant": nominal_plant.to_dict(),
         "collect_trace": collect_trace,
         "collect_breakdown": collect_breakdown,
+        "score_colregs": score_colregs,
+        # Decided in the parent so already-running pool workers follow it.
+        "lockstep": lockstep_enabled(),
     }
 
 
-_WORKER_MODEL: Optional[PPO] = None
+_WORKER_MODEL: Any = None  # PPO, or policy_infer.NumpyPolicy for plain MLP checkpoints
 _WORKER_MODEL_PATH: Optional[str] = None
 
 
 def _init_eval_worker(model_path: str) -> None:
     global _WORKER_MODEL, _WORKER_MODEL_PATH
     _WORKER_MODEL_PATH = model_path
-    _WORKER_MODEL = PPO.load(model_path, device="cpu")
+    _WORKER_MODEL = load_eval_policy(checkpoint_zip_path(model_path))
 
 
-def _eval_scenario_worker(payload: Tuple[Dict[str, Any], Dict[str, Any]]) -> Dict[str, Any]:
-    """Process-pool entry: rollout one scenario (reuses model loaded in worker init)."""
+def _eval_block_worker(payload: Tuple[List[Dict[str, Any]], Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Process-pool entry: rollout one block of scenarios (reuses model loaded in worker init)."""
     global _WORKER_MODEL, _WORKER_MODEL_PATH
-    scenario_dict, cfg = payload
-    from env import BoatNavEnv
-
-    scenario = P.ScenarioSeed(**scenario_dict)
-    plant = P.plant_from_dict(cfg["nominal_plant"])
+    scenario_dicts, cfg = payload
     model_path = cfg["model_path"]
     if _WORKER_MODEL is None or _WORKER_MODEL_PATH != model_path:
         _WORKER_MODEL_PATH = model_path
-        _WORKER_MODEL = PPO.load(model_path, device="cpu")
-    model = _WORKER_MODEL
-    env = BoatNavEnv(
+        _WORKER_MODEL = load_eval_policy(checkpoint_zip_path(model_path))
+    return rollout_scenarios(_WORKER_MODEL, scenario_dicts, cfg)
+
+
+def lockstep_enabled() -> bool:
+    if EVAL_MODE not in ("episode", "lockstep"):
+        raise ValueError(f"unknown EVAL_MODE {EVAL_MODE!r} (expected episode or lockstep)")
+    return EVAL_MODE == "lockstep"
+
+
+def _eval_env(cfg: Dict[str, Any]) -> Any:
+    from env import BoatNavEnv
+
+    return BoatNavEnv(
         mode=cfg["mode"],
         training_randomize=False,
-        nominal_plant=plant,
+        nominal_plant=P.plant_from_dict(cfg["nominal_plant"]),
         dynamics_jitter=bool(cfg["plant_jitter"]),
         goal_hold_sec=int(cfg["goal_hold_sec"]),
         max_episode_steps=int(cfg["max_episode_steps"]),
         current_enabled=bool(cfg["current_enabled"]),
         include_reward_breakdown=bool(cfg["collect_breakdown"]),
     )
-    episode = env.rollout_episode(
-        model,
-        reset_seed=scenario.seed,
-        scenario=scenario,
-        collect_trace=bool(cfg["collect_trace"]),
-    )
+
+
+def _label_episode(episode: Dict[str, Any], scenario: P.ScenarioSeed, mode: str) -> Dict[str, Any]:
     episode["seed"] = scenario.seed
-    episode["mode"] = cfg["mode"]
+    episode["mode"] = mode
     episode["scenario_name"] = scenario.name
     episode["scenario_category"] = scenario.category
     episode["scenario_description"] = scenario.description
     return episode
 
 
+def rollout_scenario(model: PPO, scenario_dict: Dict[str, Any], cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """One eval episode in a fresh env built from a ``_worker_config_dict``."""
+    scenario = P.ScenarioSeed(**scenario_dict)
+    episode = _eval_env(cfg).rollout_episode(
+        model,
+        reset_seed=scenario.seed,
+        scenario=scenario,
+        collect_trace=bool(cfg["collect_trace"]),
+        score_colregs=bool(cfg.get("score_colregs")),
+    )
+    return _label_episode(episode, scenario, cfg["mode"])
+
+
+def rollout_lockstep(
+    model: PPO,
+    scenarios: Sequence[P.ScenarioSeed],
+    cfg: Dict[str, Any],
+    *,
+    block: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Step up to ``block`` envs together: one stacked predict per tick, same episode dicts.
+
+    A slot whose episode ends is refilled with the next scenario, so the batch stays full
+    until the queue drains. Results come back in ``scenarios`` order.
+    """
+    from env import EpisodeRollout
+    from policy_infer import safe_model_predict
+
+    width = max(1, min(len(scenarios), block or EVAL_LOCKSTEP_BLOCK))
+    results: List[Optional[Dict[str, Any]]] = [None] * len(scenarios)
+    pending = iter(enumerate(scenarios))
+
+    def start(env: Any) -> Optional[Tuple[int, EpisodeRollout]]:
+        for i, scenario in pending:
+            run = EpisodeRollout(
+                env,
+                reset_seed=scenario.seed,
+                scenario=scenario,
+                collect_trace=bool(cfg["collect_trace"]),
+                score_colregs=bool(cfg.get("score_colregs")),
+            )
+            if not run.done:
+                return i, run
+            results[i] = _label_episode(run.result(), scenario, cfg["mode"])
+        return None
+
+    slots = [slot for slot in (start(_eval_env(cfg)) for _ in range(width)) if slot is not None]
+    while slots:
+        # np.stack copies: each env reuses its own observation buffer.
+        obs = np.stack([run.obs for _, run in slots])
+        actions, _ = safe_model_predict(model, obs, deterministic=True)
+        active = []
+        for (i, run), action in zip(slots, actions):
+            if not run.step(action):
+                active.append((i, run))
+                continue
+            results[i] = _label_episode(run.result(), scenarios[i], cfg["mode"])
+            nxt = start(run.env)
+            if nxt is not None:
+                active.append(nxt)
+        slots = active
+    return results  # type: ignore[return-value]
+
+
+def rollout_scenarios(
+    model: PPO, scenario_dicts: Sequence[Dict[str, Any]], cfg: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """A block of scenarios in this process (lock-step when ``cfg["lockstep"]``)."""
+    if cfg.get("lockstep"):
+        return rollout_lockstep(model, [P.ScenarioSeed(**d) for d in scenario_dicts], cfg)
+    return [rollout_scenario(model, d, cfg) for d in scenario_dicts]
+
+
+def scenario_blocks(
+    scenarios: Sequence[P.ScenarioSeed], workers: int, *, lockstep: bool = False
+) -> List[List[Dict[str, Any]]]:
+    """Split scenarios into per-task blocks: ~4 per worker, or lock-step-sized blocks."""
+    n = len(scenarios)
+    if lockstep:
+        size = max(1, min(EVAL_LOCKSTEP_BLOCK, math.ceil(n / max(1, workers))))
+    else:
+        size = max(1, n // (workers * 4))
+    dicts = [asdict(s) for s in scenarios]
+    return [dicts[i : i + size] for i in range(0, n, size)]
+
+
 def rollout_episodes_sequential(
     model: PPO,
     scenarios: List[P.ScenarioSeed],
@@ -334,6 +438,7 @@ def rollout_episodes_sequential(
     nominal_plant: P.PlantParams,
     collect_trace: bool,
     collect_breakdown: bool,
+    score_colregs: bool = False,
 ) -> List[Dict[str, Any]]:
     from env import BoatNavEnv
 
@@ -354,31 +459,40 @@ def rollout_episodes_sequential(
             reset_seed=scenario.seed,
             scenario=scenario,
             collect_trace=collect_trace,
+            score_colregs=score_colregs,
         )
-        episode["seed"] = scenario.seed
-        episode["mode"] = mode
-        episode["scenario_name"] = scenario.name
-        episode["scenario_category"] = scenario.category
-        episode["scenario_description"] = scenario.description
-        episodes.append(episode)
+        episodes.append(_label_episode(episode, scenario, mode))
     return episodes
 
 
-def rollout_episodes_parallel(
-    model_path: str,
-    scenarios: List[P.ScenarioSeed],
-    cfg: Dict[str, Any],
-    *,
-    workers: int,
-) -> List[Dict[str, Any]]:
-    payloads = [(asdict(s), cfg) for s in scenarios]
-    chunksize = max(1, len(payloads) // (workers * 4))
-    with ProcessPoolExecutor(
-        max_workers=workers,
-        initializer=_init_eval_worker,
-        initargs=(model_path,),
-    ) as pool:
-        return list(pool.map(_eval_scenario_worker, payloads, chunksize=chunksize))
+def _use_batched_engine(
+    scenarios: List[P.ScenarioSeed], *, collect_trace: bool, score_colregs: bool = False
+) -> bool:
+    """Traces and COLREGS scoring need per-step CPU state, so they take the process path."""
+    if EVAL_ENGINE == "process" or collect_trace or score_colregs:
+        return False
+    if EVAL_ENGINE != "auto":
+        raise ValueError(f"unknown EVAL_ENGINE {EVAL_ENGINE!r} (expected auto or process)")
+    from eval_batched import batched_eval_supported
+
+    return batched_eval_supported(scenarios)
+
+
+def _engine_label(batched: bool) -> str:
+    """Which rollout code produced an episode (part of the eval cache key)."""
+    from policy_infer import FAST_POLICY
+
+    if batched:
+        from eval_batched import EVAL_BATCHED_BACKEND
+
+        engine = f"batched:{EVAL_BATCHED_BACKEND}"
+    else:
+        engine = "lockstep" if lockstep_enabled() else "episode"
+    return f"{engine}|fast_policy={int(FAST_POLICY)}"
+
+
+# One rollout_episodes call: (scenarios, keyword args of rollout_episodes minus workers).
+EvalGroup = Tuple[List[P.ScenarioSeed], Dict[str, Any]]
 
 
 def rollout_episodes(
@@ -393,42 +507,198 @@ def rollout_episodes(
     nominal_plant: P.PlantParams,
     collect_trace: bool,
     collect_breakdown: bool,
+    score_colregs: bool = False,
     workers: Optional[int] = None,
     snapshot_path: Optional[Path] = None,
+    use_cache: bool = False,
 ) -> List[Dict[str, Any]]:
-    n_workers = default_eval_workers() if workers is None else max(1, int(workers))
-    if n_workers <= 1 or len(scenarios) < EVAL_PARALLEL_MIN_SCENARIOS:
-        return rollout_episodes_sequential(
-            model,
-            scenarios,
-            mode=mode,
-            goal_hold_sec=goal_hold_sec,
-            max_episode_steps=max_episode_steps,
-            current_enabled=current_enabled,
-            plant_jitter=plant_jitter,
-            nominal_plant=nominal_plant,
-            collect_trace=collect_trace,
-            collect_breakdown=collect_breakdown,
-        )
+    """Episode dicts for ``scenarios``; with ``use_cache``, cached episodes are not re-rolled.
 
-    snap = snapshot_path or alloc_eval_snapshot_stem()
-    stem = snapshot_model_for_eval(model, snap)
-    zip_path = checkpoint_zip_path(stem)
+    ``score_colregs`` scores COLREGS encounters during the rollout (``episode["colregs"]``),
+    so the parent never needs the trace for it.
+    """
+    kwargs = dict(
+        mode=mode,
+        goal_hold_sec=goal_hold_sec,
+        max_episode_steps=max_episode_steps,
+        current_enabled=current_enabled,
+        plant_jitter=plant_jitter,
+        nominal_plant=nominal_plant,
+        collect_trace=collect_trace,
+        collect_breakdown=collect_breakdown,
+        score_colregs=score_colregs,
+    )
+    return rollout_grid(
+        model, [(scenarios, kwargs)], workers=workers, snapshot_path=snapshot_path, use_cache=use_cache
+    )[0]
+
+
+def _batched_grid(groups: Sequence[EvalGroup]) -> bool:
+    """One sim batch can run every group: trace-free, supported, only the plant differs."""
+    rows = [s for scenarios, _ in groups for s in scenarios]
+    first = {k: v for k, v in groups[0][1].items() if k != "nominal_plant"}
+    return all(
+        {k: v for k, v in kw.items() if k != "nominal_plant"} == first for _, kw in groups
+    ) and _use_batched_engine(
+        rows,
+        collect_trace=bool(first["collect_trace"]),
+        score_colregs=bool(first.get("score_colregs")),
+    )
+
+
+def _rollout_local(model: PPO, scenarios: List[P.ScenarioSeed], kw: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if lockstep_enabled():
+        return rollout_lockstep(model, scenarios, _worker_config_dict(model_path="", **kw))
+    return rollout_episodes_sequential(model, scenarios, **kw)
+
+
+def iter_completed_blocks(
+    executor: Any, fn: Callable[[Any], List[Dict[str, Any]]], payloads: Sequence[Any]
+) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """(payload index, result) in completion order; closing the iterator cancels the rest."""
+    futures = {executor.submit(fn, payload): i for i, payload in enumerate(payloads)}
     try:
-        cfg = _worker_config_dict(
-            model_path=str(stem),
-            mode=mode,
-            goal_hold_sec=goal_hold_sec,
-            max_episode_steps=max_episode_steps,
-            current_enabled=current_enabled,
-            plant_jitter=plant_jitter,
-            nominal_plant=nominal_plant,
-            collect_trace=collect_trace,
-            collect_breakdown=collect_breakdown,
-        )
-        return rollout_episodes_parallel(str(stem), scenarios, cfg, workers=n_workers)
+        for future in as_completed(futures):
+            yield futures[future], future.result()
     finally:
-        zip_path.unlink(missing_ok=True)
+        for future in futures:
+            future.cancel()
+
+
+def rollout_grid(
+    model: PPO,
+    groups: Sequence[EvalGroup],
+    *,
+    workers: Optional[int] = None,
+    snapshot_path: Optional[Path] = None,
+    on_group: Optional[Callable[[int, List[Dict[str, Any]]], bool]] = None,
+    stream: bool = False,
+    use_cache: bool = False,
+) -> List[Optional[List[Dict[str, Any]]]]:
+    """Roll out several scenario groups (e.g. plant samples) as one flattened job.
+
+    With ``use_cache`` (evals that re-score fixed weights: final, robust, ``eval_run``), hits
+    from ``eval_cache`` are served first; live/curriculum evals never hit, so they skip it.
+    Misses from every group share one engine run: a single sim batch with per-row plants, or
+    one work queue of scenario blocks over one process pool (the warm ``eval_pool`` when
+    active). ``on_group(index, episodes)`` fires as each
+    group completes; returning False cancels the work not yet started and leaves the
+    unfinished groups as None (groups already simulated in the same sim batch are still
+    finished). ``stream=True`` gives the batched engine one sim batch per group instead, so
+    ``on_group`` can stop it between groups.
+    """
+    cache = EC.default_eval_cache() if use_cache and hasattr(model, "policy") else None
+    results: List[List[Optional[Dict[str, Any]]]] = []
+    keys: List[List[str]] = []
+    missing: List[List[int]] = []
+    batched = bool(groups) and _batched_grid(groups)
+    engine = _engine_label(batched)
+    for scenarios, kw in groups:
+        if cache is not None:
+            group_keys = EC.episode_keys(
+                model, scenarios, _worker_config_dict(model_path="", **kw), engine=engine
+            )
+            episodes = [cache.get(key) for key in group_keys]
+        else:
+            group_keys, episodes = [], [None] * len(scenarios)
+        keys.append(group_keys)
+        results.append(episodes)
+        missing.append([i for i, ep in enumerate(episodes) if ep is None])
+
+    done: List[bool] = [False] * len(groups)
+    stopped = False
+
+    def finish(g: int) -> bool:
+        done[g] = True
+        if cache is not None:
+            for i in missing[g]:
+                cache.put(keys[g][i], results[g][i])  # type: ignore[arg-type]
+        return on_group is None or bool(on_group(g, results[g]))  # type: ignore[arg-type]
+
+    for g in range(len(groups)):
+        if not missing[g] and not finish(g):
+            stopped = True
+            break
+    todo = [g for g in range(len(groups)) if not done[g]]
+    n_miss = sum(len(missing[g]) for g in todo)
+    n_workers = default_eval_workers() if workers is None else max(1, int(workers))
+
+    if stopped or not todo:
+        pass
+    elif batched:
+        from eval_batched import rollout_episodes_batched
+
+        kw = dict(groups[todo[0]][1])
+        kw.pop("collect_trace")
+        kw.pop("nominal_plant")
+        kw.pop("score_colregs", None)
+        for wave in [[g] for g in todo] if stream else [todo]:
+            rows = [(g, i) for g in wave for i in missing[g]]
+            episodes = rollout_episodes_batched(
+                model,
+                [groups[g][0][i] for g, i in rows],
+                nominal_plant=groups[wave[0]][1]["nominal_plant"],
+                plants=[groups[g][1]["nominal_plant"] for g, _ in rows],
+                **kw,
+            )
+            for (g, i), episode in zip(rows, episodes):
+                results[g][i] = episode
+            # Every group in the wave is already simulated: score and cache them all.
+            if not all([finish(g) for g in wave]):
+                break
+    elif n_workers <= 1 or n_miss < EVAL_PARALLEL_MIN_SCENARIOS:
+        for g in todo:
+            scenarios = [groups[g][0][i] for i in missing[g]]
+            for i, episode in zip(missing[g], _rollout_local(model, scenarios, groups[g][1])):
+                results[g][i] = episode
+            if not finish(g):
+                break
+    else:
+        from eval_pool import active_eval_pool
+
+        pool = active_eval_pool()
+        use_pool = pool is not None and pool.compatible(model)
+        stem: Optional[Path] = None
+        if not use_pool:
+            stem = snapshot_model_for_eval(model, snapshot_path or alloc_eval_snapshot_stem())
+        model_path = "eval_pool" if use_pool else str(stem)
+        payloads: List[Tuple[List[Dict[str, Any]], Dict[str, Any]]] = []
+        owners: List[Tuple[int, List[int]]] = []
+        left = {g: len(missing[g]) for g in todo}
+        for g in todo:
+            scenarios = [groups[g][0][i] for i in missing[g]]
+            cfg = _worker_config_dict(model_path=model_path, **groups[g][1])
+            pos = 0
+            for block in scenario_blocks(scenarios, n_workers, lockstep=bool(cfg["lockstep"])):
+                payloads.append((block, cfg))
+                owners.append((g, missing[g][pos : pos + len(block)]))
+                pos += len(block)
+        try:
+            if use_pool:
+                blocks = pool.iter_blocks(model, payloads)  # type: ignore[union-attr]
+                executor = None
+            else:
+                executor = ProcessPoolExecutor(
+                    max_workers=n_workers, initializer=_init_eval_worker, initargs=(model_path,)
+                )
+                blocks = iter_completed_blocks(executor, _eval_block_worker, payloads)
+            with closing(blocks):
+                for b, episodes in blocks:
+                    g, idxs = owners[b]
+                    for i, episode in zip(idxs, episodes):
+                        results[g][i] = episode
+                    left[g] -= len(idxs)
+                    if left[g] == 0 and not finish(g):
+                        break
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            if stem is not None:
+                checkpoint_zip_path(stem).unlink(missing_ok=True)
+
+    if cache is not None and any(missing[g] for g in range(len(groups)) if done[g]):
+        cache.evict()
+    return [results[g] if done[g] else None for g in range(len(groups))]  # type: ignore[misc]
 
 
 def aggregate_eval_metrics(
@@ -458,7 +728,7 @@ def aggregate_eval_metrics(
     goal_zone_speed_samples: List[float] = []
     zone_entries = 0
 
-    if colregs_enabled and collect_traces:
+    if colregs_enabled:
         from colregs.evaluate import evaluate_episode, rollup_episodes
     else:
         evaluate_episode = None  # type: ignore
@@ -469,15 +739,14 @@ def aggregate_eval_metrics(
         episode["mission_score_version"] = MISSION_SCORE_VERSION
         if collect_traces:
             traces.append(episode)
-            if (
-                colregs_enabled
-                and evaluate_episode is not None
-                and episode.get("steps")
-            ):
+        if evaluate_episode is not None:
+            # Rollouts with score_colregs already carry the rollup; score bare traces here.
+            colregs = episode.get("colregs")
+            if colregs is None and collect_traces and episode.get("steps"):
                 colregs = evaluate_episode(episode)
                 episode["colregs"] = colregs
-                if colregs.get("mean_safety_S") is not None:
-                    colregs_episode_scores.append(colregs)
+            if colregs is not None and colregs.get("mean_safety_S") is not None:
+                colregs_episode_scores.append(colregs)
         if episode.get("success"):
             successes += 1
         if episode.get("collision"):
@@ -566,6 +835,7 @@ def run_eval_from_snapshot(
     collect_traces: bool = True,
     collect_breakdown: bool = True,
     workers: Optional[int] = None,
+    gate: Any = None,
 ) -> Any:
     """Load policy from snapshot path and run eval (for async background thread)."""
     from eval_runner import run_eval
@@ -585,6 +855,7 @@ def run_eval_from_snapshot(
             collect_traces=collect_traces,
             collect_breakdown=collect_breakdown,
             workers=workers,
+            gate=gate,
         )
     finally:
         zip_path.unlink(missing_ok=True)
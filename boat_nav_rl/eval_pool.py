@@ -0,0 +1,255 @@
+"""Warm eval worker pool owned by the training process, fed weights through shared memory.
+
+``EvalWorkerPool`` saves one template checkpoint at start-up; each worker ``PPO.load``s it
+once in its initializer. After that, new weights never touch the disk: ``publish`` copies
+the policy ``state_dict`` into a shared ``RawArray`` and bumps a shared version counter, and
+every task carries the version it expects, so workers reload tensors only when it changed.
+The pool also keeps a parent-side shadow policy for evals that run in-process (batched
+engine, sequential fallback), replacing the per-eval snapshot zip + ``PPO.load``.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing, contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from stable_baselines3 import PPO
+
+import prepare as P
+from eval_parallel import (
+    alloc_eval_snapshot_stem,
+    checkpoint_zip_path,
+    default_eval_workers,
+    iter_completed_blocks,
+    rollout_scenarios,
+    scenario_blocks,
+    snapshot_model_for_eval,
+)
+
+EVAL_POOL = os.environ.get("EVAL_POOL", "1").strip().lower() not in ("0", "false", "no")
+
+# (state_dict key, shape, numpy dtype str, offset into the flat float32 buffer)
+WeightLayout = List[Tuple[str, Tuple[int, ...], str, int]]
+
+
+def weight_layout(model: PPO) -> WeightLayout:
+    layout: WeightLayout = []
+    offset = 0
+    for name, tensor in model.policy.state_dict().items():
+        shape = tuple(int(d) for d in tensor.shape)
+        layout.append((name, shape, str(tensor.dtype).replace("torch.", ""), offset))
+        offset += int(np.prod(shape, dtype=np.int64))
+    return layout
+
+
+def _layout_size(layout: WeightLayout) -> int:
+    if not layout:
+        return 0
+    _, shape, _, offset = layout[-1]
+    return offset + int(np.prod(shape, dtype=np.int64))
+
+
+def capture_weights(model: PPO, layout: WeightLayout, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Flat float32 copy of the policy weights (call from the thread that owns training)."""
+    flat = np.empty(_layout_size(layout), dtype=np.float32) if out is None else out
+    state = model.policy.state_dict()
+    for name, shape, _, offset in layout:
+        size = int(np.prod(shape, dtype=np.int64))
+        flat[offset : offset + size] = state[name].detach().cpu().numpy().reshape(-1)
+    return flat
+
+
+def load_weights(model: PPO, layout: WeightLayout, flat: np.ndarray) -> None:
+    import torch
+
+    state = {}
+    for name, shape, dtype, offset in layout:
+        size = int(np.prod(shape, dtype=np.int64))
+        arr = flat[offset : offset + size].reshape(shape).astype(dtype, copy=True)
+        state[name] = torch.from_numpy(arr)
+    model.policy.load_state_dict(state, strict=True)
+
+
+_POOL_MODEL: Optional[PPO] = None
+_POOL_WEIGHTS: Optional[np.ndarray] = None
+_POOL_VERSION: Any = None
+_POOL_LAYOUT: WeightLayout = []
+_POOL_LOADED = -1
+
+
+def _init_pool_worker(template_stem: str, weights: Any, version: Any, layout: WeightLayout) -> None:
+    global _POOL_MODEL, _POOL_WEIGHTS, _POOL_VERSION, _POOL_LAYOUT, _POOL_LOADED
+    _POOL_MODEL = PPO.load(template_stem, device="cpu")
+    _POOL_WEIGHTS = np.frombuffer(weights, dtype=np.float32)
+    _POOL_VERSION = version
+    _POOL_LAYOUT = layout
+    _POOL_LOADED = -1
+
+
+def _pool_block_worker(
+    payload: Tuple[List[Dict[str, Any]], Dict[str, Any], int]
+) -> List[Dict[str, Any]]:
+    """Pool entry: refresh weights from shared memory if the version moved, then roll out."""
+    global _POOL_LOADED
+    scenario_dicts, cfg, version = payload
+    if _POOL_LOADED != version:
+        if _POOL_VERSION.value != version:
+            raise RuntimeError(f"eval pool weights at v{_POOL_VERSION.value}, task expects v{version}")
+        load_weights(_POOL_MODEL, _POOL_LAYOUT, _POOL_WEIGHTS)
+        _POOL_LOADED = version
+    return rollout_scenarios(_POOL_MODEL, scenario_dicts, cfg)
+
+
+class EvalWorkerPool:
+    """Long-lived process pool + shadow policy; one eval at a time holds the lease."""
+
+    def __init__(self, model: PPO, *, workers: Optional[int] = None) -> None:
+        self.workers = default_eval_workers() if workers is None else max(1, int(workers))
+        self.layout = weight_layout(model)
+        self._lock = threading.RLock()
+        self._template = snapshot_model_for_eval(model, alloc_eval_snapshot_stem())
+        self.shadow = PPO.load(str(self._template), device="cpu")
+        ctx = mp.get_context()
+        self._weights = ctx.RawArray(ctypes.c_float, max(1, _layout_size(self.layout)))
+        self._version = ctx.RawValue(ctypes.c_int64, 0)
+        self._flat = np.frombuffer(self._weights, dtype=np.float32)
+        self._shadow_version = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=ctx,
+                initializer=_init_pool_worker,
+                initargs=(str(self._template), self._weights, self._version, self.layout),
+            )
+        self.publish(capture_weights(model, self.layout))
+
+    @property
+    def version(self) -> int:
+        return int(self._version.value)
+
+    def capture(self, model: PPO) -> np.ndarray:
+        return capture_weights(model, self.layout)
+
+    def compatible(self, model: PPO) -> bool:
+        return weight_layout(model) == self.layout
+
+    def publish(self, flat: np.ndarray) -> int:
+        """Copy weights into shared memory and bump the version (no tasks in flight)."""
+        with self._lock:
+            self._flat[:] = flat
+            self._version.value += 1
+            return self.version
+
+    @contextmanager
+    def lease(self, flat: Optional[np.ndarray] = None) -> Iterator[PPO]:
+        """Hold the pool for one eval; yields the shadow policy loaded with ``flat``."""
+        with self._lock:
+            if flat is not None:
+                self.publish(flat)
+            if self._shadow_version != self.version:
+                load_weights(self.shadow, self.layout, self._flat)
+                self._shadow_version = self.version
+            yield self.shadow
+
+    def iter_blocks(
+        self, model: PPO, payloads: Sequence[Tuple[List[Dict[str, Any]], Dict[str, Any]]]
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """(payload index, episodes) as blocks finish, with ``model``'s current weights.
+
+        Holds the pool until exhausted or closed (closing cancels blocks not yet started);
+        consume it on one thread, e.g. under ``contextlib.closing``.
+        """
+        with self._lock:
+            if model is not self.shadow:
+                self.publish(self.capture(model))
+            if self._executor is None:
+                with self.lease() as shadow:
+                    for i, (block, cfg) in enumerate(payloads):
+                        yield i, rollout_scenarios(shadow, block, cfg)
+                return
+            version = self.version
+            tasks = [(block, cfg, version) for block, cfg in payloads]
+            yield from iter_completed_blocks(self._executor, _pool_block_worker, tasks)
+
+    def rollout(
+        self, model: PPO, scenarios: Sequence[P.ScenarioSeed], cfg: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Run ``scenarios`` on the warm workers with ``model``'s current weights."""
+        blocks = scenario_blocks(scenarios, self.workers, lockstep=bool(cfg.get("lockstep")))
+        out: List[List[Dict[str, Any]]] = [[] for _ in blocks]
+        with closing(self.iter_blocks(model, [(block, cfg) for block in blocks])) as it:
+            for i, episodes in it:
+                out[i] = episodes
+        return [ep for block in out for ep in block]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+            checkpoint_zip_path(self._template).unlink(missing_ok=True)
+
+
+def run_eval_from_weights(
+    weights: np.ndarray,
+    mode: str,
+    max_scenarios: Optional[int] = None,
+    sample_seed: Optional[int] = None,
+    eval_plant: Optional[P.PlantParams] = None,
+    dynamics_jitter: Optional[bool] = None,
+    current_enabled: Optional[bool] = None,
+    collect_traces: bool = True,
+    collect_breakdown: bool = True,
+    workers: Optional[int] = None,
+    gate: Any = None,
+) -> Any:
+    """``run_eval_from_snapshot`` counterpart for the active pool (background eval thread)."""
+    from eval_runner import run_eval
+
+    pool = active_eval_pool()
+    if pool is None:
+        raise RuntimeError("no active eval pool")
+    with pool.lease(weights) as model:
+        return run_eval(
+            model,
+            mode,
+            max_scenarios=max_scenarios,
+            sample_seed=sample_seed,
+            eval_plant=eval_plant,
+            dynamics_jitter=dynamics_jitter,
+            current_enabled=current_enabled,
+            collect_traces=collect_traces,
+            collect_breakdown=collect_breakdown,
+            workers=workers,
+            gate=gate,
+        )
+
+
+_active_pool: Optional[EvalWorkerPool] = None
+
+
+def active_eval_pool() -> Optional[EvalWorkerPool]:
+    return _active_pool
+
+
+def start_eval_pool(model: PPO, *, workers: Optional[int] = None) -> Optional[EvalWorkerPool]:
+    """Create this process's pool (``EVAL_POOL=0`` disables); replaces any previous one."""
+    global _active_pool
+    stop_eval_pool()
+    if EVAL_POOL:
+        _active_pool = EvalWorkerPool(model, workers=workers)
+    return _active_pool
+
+
+def stop_eval_pool() -> None:
+    global _active_pool
+    pool, _active_pool = _active_pool, None
+    if pool is not None:
+        pool.close()
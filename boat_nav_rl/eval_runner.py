@@ -8,29 +8,33 @@ import numpy as np
 from stable_baselines3 import PPO
 
 import prepare as P
+import eval_sequential as SQ
 import train_config as C
+from curriculum import PhaseSpec, check_exit, metrics_to_summary
 from eval_parallel import (
+    EvalGroup,
     EvalResult,
     aggregate_eval_metrics,
     colregs_enabled_for_mode,
     rollout_episodes,
+    rollout_grid,
 )
 from runs_util import score_key_for_mode
 from scenario_seeds import eval_seeds_for_mode, train_seeds_for_mode
 
 
-def run_eval(
-    model: PPO,
+def _eval_group(
     mode: str,
-    max_scenarios: Optional[int] = None,
-    sample_seed: Optional[int] = None,
-    eval_plant: Optional[P.PlantParams] = None,
-    dynamics_jitter: Optional[bool] = None,
-    current_enabled: Optional[bool] = None,
-    collect_traces: bool = True,
-    collect_breakdown: bool = True,
-    workers: Optional[int] = None,
-) -> EvalResult:
+    max_scenarios: Optional[int],
+    sample_seed: Optional[int],
+    eval_plant: Optional[P.PlantParams],
+    dynamics_jitter: Optional[bool],
+    current_enabled: Optional[bool],
+    collect_traces: bool,
+    collect_breakdown: bool,
+    colregs: bool = False,
+) -> EvalGroup:
+    """Scenario sample + ``rollout_episodes`` settings for one ``run_eval`` call."""
     seeds = eval_seeds_for_mode(mode)
     if max_scenarios is not None and max_scenarios < len(seeds):
         rng = np.random.default_rng(sample_seed if sample_seed is not None else 0)
@@ -45,10 +49,7 @@ def run_eval(
         plant_jitter = False
     if dynamics_jitter is not None:
         plant_jitter = dynamics_jitter
-
-    episode_results = rollout_episodes(
-        model,
-        seeds,
+    return seeds, dict(
         mode=mode,
         goal_hold_sec=C.GOAL_HOLD_SEC,
         max_episode_steps=C.MAX_EPISODE_STEPS,
@@ -57,45 +58,153 @@ def run_eval(
         nominal_plant=nominal_plant,
         collect_trace=collect_traces,
         collect_breakdown=collect_breakdown,
-        workers=workers,
+        score_colregs=colregs and colregs_enabled_for_mode(mode),
     )
+
+
+def _aggregate_group(episodes: List[Dict[str, Any]], group: EvalGroup) -> EvalResult:
+    seeds, kw = group
+    mode = kw["mode"]
     return aggregate_eval_metrics(
-        episode_results,
+        episodes,
         seeds,
         mode,
         eval_seed_list_count=len(eval_seeds_for_mode(mode)),
         train_scenario_count=len(train_seeds_for_mode(mode)),
-        plant_jitter=plant_jitter,
-        current_enabled=cur_enabled,
-        nominal_plant=nominal_plant,
-        collect_traces=collect_traces,
+        plant_jitter=kw["plant_jitter"],
+        current_enabled=kw["current_enabled"],
+        nominal_plant=kw["nominal_plant"],
+        collect_traces=kw["collect_trace"],
         colregs_enabled=colregs_enabled_for_mode(mode),
     )
 
 
-def run_robust_eval(model: PPO, mode: str) -> Dict[str, Any]:
-    """Sample random plants (agile↔freighter) and score on eval scenario subsets."""
+def run_eval(
+    model: PPO,
+    mode: str,
+    max_scenarios: Optional[int] = None,
+    sample_seed: Optional[int] = None,
+    eval_plant: Optional[P.PlantParams] = None,
+    dynamics_jitter: Optional[bool] = None,
+    current_enabled: Optional[bool] = None,
+    collect_traces: bool = True,
+    collect_breakdown: bool = True,
+    workers: Optional[int] = None,
+    gate: Optional[PhaseSpec] = None,
+    colregs: Optional[bool] = None,
+    use_cache: bool = False,
+) -> EvalResult:
+    """Roll out an eval-set sample and aggregate it.
+
+    COLREGS encounters are scored inside the rollouts when ``colregs`` is set (default:
+    whenever traces are collected), so ``colregs=True, collect_traces=False`` gets the
+    ``colregs_*`` metrics without shipping traces back.
+
+    With ``gate`` (a curriculum phase) and ``EVAL_SEQUENTIAL=1``, trace-free evals stop as
+    soon as the phase exit decision is statistically settled (see ``eval_sequential``).
+    ``use_cache`` reuses ``eval_cache`` episodes; only worth it for fixed checkpoints.
+    """
+    group = _eval_group(
+        mode,
+        max_scenarios,
+        sample_seed,
+        eval_plant,
+        dynamics_jitter,
+        current_enabled,
+        collect_traces,
+        collect_breakdown,
+        collect_traces if colregs is None else colregs,
+    )
+    if gate is not None and SQ.EVAL_SEQUENTIAL and not collect_traces:
+        return _run_sequential(model, group, gate, workers)
+    episode_results = rollout_episodes(
+        model, group[0], workers=workers, use_cache=use_cache, **group[1]
+    )
+    return _aggregate_group(episode_results, group)
+
+
+def _run_sequential(
+    model: PPO, group: EvalGroup, gate: PhaseSpec, workers: Optional[int]
+) -> EvalResult:
+    """``run_eval`` in chunks, checking ``eval_sequential.gate_decision`` after each one.
+
+    Chunks are consumed in scenario order, so episodes that happen to finish first (e.g.
+    early collisions) cannot bias the decision.
+    """
+    seeds, kw = group
+    size = SQ.EVAL_SEQUENTIAL_CHUNK
+    chunks: List[EvalGroup] = [(seeds[i : i + size], kw) for i in range(0, len(seeds), size)]
+    finished: Dict[int, List[Dict[str, Any]]] = {}
+    episodes: List[Dict[str, Any]] = []
+    looks = 0
+    decision: Optional[str] = None
+
+    def on_chunk(g: int, chunk_episodes: List[Dict[str, Any]]) -> bool:
+        nonlocal looks, decision
+        finished[g] = chunk_episodes
+        while looks in finished:
+            episodes.extend(finished.pop(looks))
+            looks += 1
+            if looks == len(chunks):
+                break
+            metrics = _aggregate_group(episodes, (seeds[: len(episodes)], kw)).metrics
+            decision = SQ.gate_decision(gate, metrics_to_summary(metrics), looks)
+            if decision is not None:
+                return False
+        return True
+
+    rollout_grid(model, chunks, workers=workers, on_group=on_chunk, stream=True)
+    result = _aggregate_group(episodes, (seeds[: len(episodes)], kw))
+    result.metrics["eval_episodes_planned"] = len(seeds)
+    result.metrics["sequential_decision"] = decision
+    result.metrics["sequential_looks"] = looks
+    return result
+
+
+def run_robust_eval(model: PPO, mode: str, *, gate: Optional[PhaseSpec] = None) -> Dict[str, Any]:
+    """Sample random plants (agile↔freighter) and score on eval scenario subsets.
+
+    The (plant × scenario) grid runs as one ``rollout_grid`` job and is aggregated per
+    plant. With ``gate`` (a curriculum phase), the first plant whose metrics fail
+    ``check_exit`` already decides the worst case, so the remaining work is cancelled;
+    plants then stream one at a time so the batched engine has work left to skip.
+    """
     score_key = score_key_for_mode(mode)
-    scores: List[float] = []
-    plant_records: List[Dict[str, float]] = []
+    groups: List[EvalGroup] = []
+    plants: List[P.PlantParams] = []
     for i in range(C.ROBUST_EVAL_SAMPLES):
         rng = np.random.default_rng(9001 + i)
         plant = P.sample_plant_params(rng)
-        metrics = run_eval(
-            model,
-            mode,
-            max_scenarios=C.ROBUST_EVAL_SCENARIOS,
-            sample_seed=8000 + i,
-            eval_plant=plant,
-            collect_traces=False,
-        ).metrics
-        scores.append(float(metrics[score_key]))
-        plant_records.append(plant.to_dict())
-    arr = np.array(scores, dtype=np.float64)
-    return {
+        plants.append(plant)
+        groups.append(
+            _eval_group(mode, C.ROBUST_EVAL_SCENARIOS, 8000 + i, plant, None, None, False, True)
+        )
+    scores: Dict[int, float] = {}
+    failed: List[str] = []
+
+    def on_group(g: int, episodes: List[Dict[str, Any]]) -> bool:
+        metrics = _aggregate_group(episodes, groups[g]).metrics
+        scores[g] = float(metrics[score_key])
+        if gate is None:
+            return True
+        ok, reasons = check_exit(gate, metrics_to_summary(metrics))
+        failed.extend(r for r in reasons if r.startswith("FAIL"))
+        return ok
+
+    rollout_grid(model, groups, on_group=on_group, stream=gate is not None, use_cache=True)
+    done = sorted(scores)
+    arr = np.array([scores[g] for g in done], dtype=np.float64)
+    result: Dict[str, Any] = {
         "robust_eval_score": round(float(arr.mean()), 4),
         "robust_eval_worst": round(float(arr.min()), 4),
-        "robust_eval_samples": C.ROBUST_EVAL_SAMPLES,
+        "robust_eval_samples": len(done),
         "robust_eval_scenarios_per_sample": C.ROBUST_EVAL_SCENARIOS,
-        "robust_eval_plants": plant_records,
+        "robust_eval_plants": [plants[g].to_dict() for g in done],
     }
+    if gate is not None:
+        result["robust_eval_gate_phase"] = gate.phase_id
+        result["robust_eval_gate_passed"] = not failed
+        result["robust_eval_early_exit"] = len(done) < len(groups)
+        if failed:
+            result["robust_eval_gate_reasons"] = failed
+    return result
@@ -0,0 +1,76 @@
+"""Sequential-testing early stop for evals gated on a curriculum phase (``EVAL_SEQUENTIAL``).
+
+A gated ``run_eval`` rolls its scenario sample out in chunks of ``EVAL_SEQUENTIAL_CHUNK``
+and looks at the running totals after each chunk. Every rate gate in the phase exit
+(``success_rate_min``, ``collision_rate_max``, ``zone_entry_rate_min``) gets a Wilson
+interval. The error budget at look ``k`` is ``delta / (k (k + 1))``, split over the gates,
+and these budgets sum to ``delta``. So the chance that any look settles the wrong way
+stays below ``EVAL_SEQUENTIAL_DELTA`` however many looks the eval takes.
+
+The decision is ``fail`` once any rate interval lies wholly on the failing side of its
+threshold. It is ``pass`` once every rate interval clears its threshold and the point
+estimates also pass ``check_exit``. Speed gates have no bound, so they are judged as usual.
+"""
+
+from __future__ import annotations
+
+import os
+from statistics import NormalDist
+from typing import Any, Dict, Optional, Tuple
+
+from curriculum import PhaseSpec, check_exit
+
+EVAL_SEQUENTIAL = os.environ.get("EVAL_SEQUENTIAL", "0").strip().lower() not in ("0", "false", "no")
+EVAL_SEQUENTIAL_DELTA = float(os.environ.get("EVAL_SEQUENTIAL_DELTA", "0.05"))
+EVAL_SEQUENTIAL_CHUNK = max(1, int(os.environ.get("EVAL_SEQUENTIAL_CHUNK", "16")))
+EVAL_SEQUENTIAL_MIN_EPISODES = int(os.environ.get("EVAL_SEQUENTIAL_MIN_EPISODES", "16"))
+
+# (exit key, summary rate key, "min" | "max")
+_RATE_GATES: Tuple[Tuple[str, str, str], ...] = (
+    ("success_rate_min", "success_rate", "min"),
+    ("collision_rate_max", "collision_rate", "max"),
+    ("zone_entry_rate_min", "zone_entry_rate", "min"),
+)
+
+
+def wilson_interval(successes: int, n: int, z: float) -> Tuple[float, float]:
+    """Wilson score interval for a binomial rate (``(0, 1)`` when ``n == 0``)."""
+    if n <= 0:
+        return 0.0, 1.0
+    p = successes / n
+    z2 = z * z
+    denom = 1.0 + z2 / n
+    center = (p + z2 / (2 * n)) / denom
+    half = z * ((p * (1 - p) / n + z2 / (4 * n * n)) ** 0.5) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def gate_decision(
+    phase: PhaseSpec,
+    summary: Dict[str, Any],
+    look: int,
+    *,
+    delta: Optional[float] = None,
+    min_episodes: Optional[int] = None,
+) -> Optional[str]:
+    """``"pass"`` / ``"fail"`` once the gate is settled at this look, else None.
+
+    ``summary`` is ``metrics_to_summary`` of the episodes seen so far; ``look`` counts from 1.
+    """
+    n = int(summary.get("eval_episodes") or 0)
+    floor = EVAL_SEQUENTIAL_MIN_EPISODES if min_episodes is None else min_episodes
+    gates = [(summary.get(key), phase.exit[ex], op) for ex, key, op in _RATE_GATES if ex in phase.exit]
+    if n < max(1, floor) or not gates or any(rate is None for rate, _, _ in gates):
+        return None
+    alpha = (EVAL_SEQUENTIAL_DELTA if delta is None else delta) / (look * (look + 1) * len(gates))
+    z = NormalDist().inv_cdf(1.0 - alpha / 2.0)
+    cleared = True
+    for rate, limit, op in gates:
+        lo, hi = wilson_interval(int(round(float(rate) * n)), n, z)
+        if (op == "min" and hi < limit) or (op == "max" and lo > limit):
+            return "fail"
+        if not ((op == "min" and lo >= limit) or (op == "max" and hi <= limit)):
+            cleared = False
+    if cleared and check_exit(phase, summary)[0]:
+        return "pass"
+    return None
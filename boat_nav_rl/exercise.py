@@ -1,4 +1,4 @@
-"""Interactive exercise sandbox — three policy-controlled vessels, click-to-set goal."""
+"""Interactive exercise sandbox — policy-controlled vessels (three by default), click-to-set goal."""
 
 from __future__ import annotations
 
@@ -7,7 +7,7 @@ import math
 import os
 import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 from stable_baselines3 import PPO
@@ -37,6 +37,7 @@ DEFAULT_STARTS: List[Tuple[float, float]] = [
 ]
 
 DEFAULT_GOAL = (400.0, 0.0)
+EXERCISE_MAX_VESSELS = 16
 
 # Full protocol eval is expensive; live pose scoring runs every frame.
 COLREGS_FULL_EVAL_INTERVAL = max(
@@ -82,6 +83,21 @@ def load_policy(run_id: str) -> PPO:
         return model
 
 
+def default_starts(n_vessels: int) -> List[Tuple[float, float]]:
+    """``n_vessels`` spawn points in a column at x=-500 m (``DEFAULT_STARTS`` for three)."""
+    n = max(1, int(n_vessels))
+    x0 = DEFAULT_STARTS[0][0]
+    if n == 1:
+        return [(x0, 0.0)]
+    span = 0.8 * (WORLD_BOUNDS["max_y"] - WORLD_BOUNDS["min_y"])
+    spacing = min(250.0, span / (n - 1))
+    return [(x0, (i - (n - 1) / 2.0) * spacing) for i in range(n)]
+
+
+def vessel_label(i: int) -> str:
+    return chr(ord("A") + i) if i < 26 else f"V{i}"
+
+
 def _apply_exercise_spawn(
     env: "BoatNavEnv",
     *,
@@ -135,6 +151,7 @@ class ExerciseSession:
         *,
         goal_hold_sec: Optional[int] = None,
         current_enabled: Optional[bool] = None,
+        starts: Optional[Sequence[Tuple[float, float]]] = None,
     ) -> None:
         from env import BoatNavEnv
 
@@ -165,13 +182,16 @@ class ExerciseSession:
         self.mission = NavigationMission.single_goal(
             self.goal_x, self.goal_y, np.random.default_rng(42), dt_s=P.DT_S
         )
+        self.starts: List[Tuple[float, float]] = [
+            self._clip_xy(sx, sy) for sx, sy in (starts or DEFAULT_STARTS)
+        ]
         self.contacts: List[P.ContactState] = []
-        self.traces: List[List[Dict[str, Any]]] = [[], [], []]
+        self.traces: List[List[Dict[str, Any]]] = [[] for _ in self.starts]
         self.vessels: List[BoatNavEnv] = []
         self._colregs_frame = 0
-        self._colregs_rollup_cache: List[Optional[Dict[str, Any]]] = [None, None, None]
+        self._colregs_rollup_cache: List[Optional[Dict[str, Any]]] = [None] * len(self.starts)
 
-        for i, (sx, sy) in enumerate(DEFAULT_STARTS):
+        for i, (sx, sy) in enumerate(self.starts):
             env = BoatNavEnv(
                 mode=self.mode,
                 training_randomize=False,
@@ -197,7 +217,7 @@ class ExerciseSession:
         self._record_trace_snapshot()
 
     def _invalidate_colregs_cache(self) -> None:
-        self._colregs_rollup_cache = [None, None, None]
+        self._colregs_rollup_cache = [None] * len(self.vessels)
 
     def _record_trace_snapshot(self) -> None:
         for i, env in enumerate(self.vessels):
@@ -244,7 +264,7 @@ class ExerciseSession:
                 rollup = self._colregs_rollup_cache[i]
             if i == 0:
                 live_payload = live
-            label = chr(ord("A") + i)
+            label = vessel_label(i)
             vessel_scores.append(
                 {
                     "vessel": label,
@@ -371,20 +391,25 @@ class ExerciseSession:
         return True
 
     def step(self, n_steps: int = 1) -> None:
+        """Advance every vessel ``n_steps`` ticks with one stacked policy forward per tick."""
         n_steps = max(1, min(int(n_steps), EXERCISE_MAX_STEP_BATCH))
+        obs_batch = np.empty((len(self.vessels), P.OBS_DIM), dtype=np.float32)
         for _ in range(n_steps):
             for c in self.contacts:
                 c.step(P.DT_S)
-            for env in self.vessels:
-                env.contacts = self.contacts
-                action, _ = safe_model_predict(self.model, env._last_obs, deterministic=True)
+            table = P.as_contact_table(self.contacts)
+            for i, env in enumerate(self.vessels):
+                obs_batch[i] = env._last_obs
+            actions, _ = safe_model_predict(self.model, obs_batch, deterministic=True)
+            for env, action in zip(self.vessels, actions):
+                env.contacts = table
                 obs, _, _, _, _ = env.step(action, advance_contacts=False)
                 env._last_obs = obs
             self._record_trace_snapshot()
 
     def reset_vessels(self) -> None:
         for i, env in enumerate(self.vessels):
-            sx, sy = DEFAULT_STARTS[i]
+            sx, sy = self.starts[i]
             _apply_exercise_spawn(
                 env,
                 sx=sx,
@@ -395,7 +420,7 @@ class ExerciseSession:
                 seed=8000 + i,
                 contacts=self.contacts,
             )
-        self.traces = [[], [], []]
+        self.traces = [[] for _ in self.vessels]
         self._invalidate_colregs_cache()
         self._sync_contacts_to_envs()
         self._record_trace_snapshot()
@@ -465,6 +490,7 @@ def init_session(
     *,
     goal_hold_sec: Optional[int] = None,
     current_enabled: Optional[bool] = None,
+    n_vessels: int = len(DEFAULT_STARTS),
 ) -> Dict[str, Any]:
     global _session
     safe_id = validate_run_id(run_id)
@@ -472,6 +498,7 @@ def init_session(
         safe_id,
         goal_hold_sec=goal_hold_sec,
         current_enabled=current_enabled,
+        starts=default_starts(n_vessels),
     )
     with _session_lock:
         _session = session
@@ -0,0 +1,136 @@
+"""Content negotiation helpers for the viz server: gzip/brotli, strong ETags, byte ranges."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None  # type: ignore
+
+COMPRESS_MIN_BYTES = 1024
+_COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "image/svg+xml")
+_SUFFIX = {"br": ".br", "gzip": ".gz"}
+# On-the-fly compressed bodies (static files, small JSON) keyed by (ETag, encoding).
+_MEMO_MAX = 64
+_memo: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def supported_encodings() -> List[str]:
+    """Encodings this process can produce, preferred first."""
+    return (["br"] if brotli is not None else []) + ["gzip"]
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith("text/") or content_type.split(";")[0] in _COMPRESSIBLE_TYPES
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best supported coding allowed by an ``Accept-Encoding`` header (None = identity)."""
+    if not accept_encoding:
+        return None
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[name.strip().lower()] = q
+    wildcard = qualities.get("*", 0.0)
+    best = max(supported_encodings(), key=lambda enc: qualities.get(enc, wildcard), default=None)
+    return best if best is not None and qualities.get(best, wildcard) > 0 else None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def compress_memo(etag: str, data: bytes, encoding: str) -> bytes:
+    """``compress`` with a small in-process LRU keyed by the identity ETag."""
+    key = (etag, encoding)
+    with _memo_lock:
+        hit = _memo.get(key)
+        if hit is not None:
+            _memo.move_to_end(key)
+            return hit
+    body = compress(data, encoding)
+    with _memo_lock:
+        _memo[key] = body
+        while len(_memo) > _MEMO_MAX:
+            _memo.popitem(last=False)
+    return body
+
+
+def file_etag(st: os.stat_result) -> str:
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def body_etag(data: bytes) -> str:
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """Distinct strong validator per representation (``"abc"`` -> ``"abc-gzip"``)."""
+    return etag if not encoding else f'{etag[:-1]}-{encoding}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in tags
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Single ``bytes=`` range as inclusive (start, end); None = serve whole body.
+
+    Raises ValueError when the range is unsatisfiable (caller answers 416).
+    Multi-range and malformed headers are ignored, which RFC 9110 allows.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, sep, last = header[6:].strip().partition("-")
+    if not sep or not (first or last) or not all(v.isdigit() for v in (first, last) if v):
+        return None
+    if not first:
+        if int(last) == 0 or size == 0:
+            raise ValueError("range not satisfiable")
+        return max(0, size - int(last)), size - 1
+    start, end = int(first), int(last) if last else size - 1
+    if last and start > end:
+        return None
+    if start >= size:
+        raise ValueError("range not satisfiable")
+    return start, min(end, size - 1)
+
+
+def precompressed(path: Path, encoding: str) -> Path:
+    """``path.gz`` / ``path.br`` beside ``path``, rebuilt when its mtime no longer matches."""
+    out = path.with_name(path.name + _SUFFIX[encoding])
+    st = path.stat()
+    try:
+        if out.stat().st_mtime_ns == st.st_mtime_ns:
+            return out
+    except OSError:
+        pass
+    tmp = out.with_name(f"{out.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(compress(path.read_bytes(), encoding))
+    os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(tmp, out)
+    return out
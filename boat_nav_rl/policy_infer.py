@@ -1,26 +1,213 @@
-"""Thread-safe policy inference (training and live eval must not overlap)."""
+"""Thread-safe policy inference (training and live eval must not overlap).
+
+Deterministic predicts on an SB3 ``MlpPolicy`` take a NumPy fast path: the actor
+(``mlp_extractor.policy_net`` + ``action_net``, the layers ``scripts/export_onnx.py``
+exports) is copied into float32 matrices and run as plain matmuls, skipping
+``PPO.predict`` preprocessing, torch dispatch and the global lock. The copy is rebuilt
+whenever a parameter tensor's in-place version counter moves (optimizer step,
+``load_state_dict``), so it never serves stale weights. ``FAST_POLICY=0`` disables it.
+"""
 
 from __future__ import annotations
 
+import os
 import threading
-from typing import Any, Tuple
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 
+FAST_POLICY = os.environ.get("FAST_POLICY", "1").strip().lower() not in ("0", "false", "no")
+
 _inference_lock = threading.RLock()
+_ACTOR_PREFIXES = ("mlp_extractor.policy_net.", "action_net.")
+_ACTIVATIONS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "Tanh": np.tanh,
+    "ReLU": lambda x: np.maximum(x, 0.0, out=x),
+    "Identity": lambda x: x,
+}
 
 
 def inference_lock() -> threading.RLock:
     return _inference_lock
 
 
+class NumpyPolicy:
+    """Deterministic actor as NumPy matmuls; immutable, so concurrent ``predict`` is safe."""
+
+    def __init__(
+        self,
+        layers: List[Tuple[np.ndarray, np.ndarray, str]],
+        low: np.ndarray,
+        high: np.ndarray,
+    ) -> None:
+        # (weight^T [in, out], bias [out], activation name); the last layer is action_net.
+        # Always copies: CPU tensors' .numpy() views share memory with the live parameters.
+        self.layers = [
+            (np.array(w, dtype=np.float32, order="C", copy=True), np.array(b, dtype=np.float32, copy=True), act)
+            for w, b, act in layers
+        ]
+        self.obs_dim = int(self.layers[0][0].shape[0])
+        self.low = np.array(low, dtype=np.float32, copy=True)
+        self.high = np.array(high, dtype=np.float32, copy=True)
+        self._acts = [_ACTIVATIONS[act] for _, _, act in self.layers]
+
+    @classmethod
+    def from_state_dict(
+        cls,
+        state: Dict[str, Any],
+        activation: str,
+        low: np.ndarray,
+        high: np.ndarray,
+    ) -> "NumpyPolicy":
+        prefix = "mlp_extractor.policy_net."
+        idx = sorted({int(k[len(prefix) :].split(".")[0]) for k in state if k.startswith(prefix)})
+
+        def arr(key: str) -> np.ndarray:
+            val = state[key]
+            return val.detach().cpu().numpy() if hasattr(val, "detach") else np.asarray(val)
+
+        layers = [
+            (arr(f"{prefix}{i}.weight").T, arr(f"{prefix}{i}.bias"), activation) for i in idx
+        ]
+        layers.append((arr("action_net.weight").T, arr("action_net.bias"), "Identity"))
+        return cls(layers, low, high)
+
+    @classmethod
+    def from_model(cls, model: Any) -> Optional["NumpyPolicy"]:
+        """Actor of a loaded PPO model, or None when it is not a plain Box/MLP policy."""
+        activation = _mlp_activation(model)
+        if activation is None:
+            return None
+        state = {
+            name: param
+            for name, param in model.policy.named_parameters()
+            if name.startswith(_ACTOR_PREFIXES)
+        }
+        return cls.from_state_dict(state, activation, model.action_space.low, model.action_space.high)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "NumpyPolicy":
+        """Straight from a checkpoint zip (``policy.pth`` + saved spaces); no PPO/env build."""
+        from stable_baselines3.common.save_util import load_from_zip_file
+
+        data, params, _ = load_from_zip_file(path, device="cpu")
+        kwargs = (data or {}).get("policy_kwargs") or {}
+        activation = getattr(kwargs.get("activation_fn"), "__name__", "Tanh")
+        if activation not in _ACTIVATIONS or (data or {}).get("use_sde"):
+            raise ValueError(f"unsupported policy in {path} (activation {activation})")
+        space = data["action_space"]
+        return cls.from_state_dict(params["policy"], activation, space.low, space.high)
+
+    def predict(self, obs: np.ndarray, deterministic: bool = True) -> Tuple[np.ndarray, None]:
+        """``PPO.predict`` contract for deterministic Box actions (clipped mean action)."""
+        if not deterministic:
+            raise ValueError("NumpyPolicy only serves deterministic predicts")
+        x = np.asarray(obs, dtype=np.float32)
+        single = x.ndim == 1
+        x = x.reshape(-1, self.obs_dim)
+        for (w, b, _), act in zip(self.layers, self._acts):
+            x = act(x @ w + b)
+        actions = np.clip(x, self.low, self.high)
+        return (actions[0] if single else actions), None
+
+
+def _mlp_activation(model: Any) -> Optional[str]:
+    """Activation name when ``model`` is an SB3 MlpPolicy the fast path reproduces exactly."""
+    policy = getattr(model, "policy", None)
+    if policy is None or getattr(policy, "use_sde", True) or getattr(policy, "squash_output", True):
+        return None
+    try:
+        from gymnasium import spaces
+        from stable_baselines3.common.distributions import DiagGaussianDistribution
+        from stable_baselines3.common.torch_layers import FlattenExtractor
+    except ImportError:  # pragma: no cover - SB3 always present with a PPO model
+        return None
+    if not (
+        isinstance(model.action_space, spaces.Box)
+        and isinstance(model.observation_space, spaces.Box)
+        and len(model.observation_space.shape) == 1
+        and isinstance(policy.action_dist, DiagGaussianDistribution)
+        and isinstance(policy.pi_features_extractor, FlattenExtractor)
+    ):
+        return None
+    names = {type(m).__name__ for m in policy.mlp_extractor.policy_net if type(m).__name__ != "Linear"}
+    if len(names) > 1 or not names <= set(_ACTIVATIONS):
+        return None
+    return next(iter(names), "Identity")
+
+
+class _FastEntry:
+    __slots__ = ("policy", "params", "versions", "fast")
+
+    def __init__(self, policy: Any, fast: Optional[NumpyPolicy]) -> None:
+        self.policy = policy
+        # Only the actor tensors: walking every module per call would cost more than the forward.
+        self.params = [
+            p for name, p in policy.named_parameters() if name.startswith(_ACTOR_PREFIXES)
+        ]
+        self.versions = [p._version for p in self.params]
+        self.fast = fast
+
+    def current(self, policy: Any) -> bool:
+        return policy is self.policy and all(
+            p._version == v for p, v in zip(self.params, self.versions)
+        )
+
+
+_fast_cache: "weakref.WeakKeyDictionary[Any, _FastEntry]" = weakref.WeakKeyDictionary()
+_fast_cache_lock = threading.Lock()
+
+
+def fast_policy(model: Any) -> Optional[NumpyPolicy]:
+    """Cached ``NumpyPolicy`` for ``model``, rebuilt when its actor weights change."""
+    policy = getattr(model, "policy", None)
+    if policy is None or not hasattr(policy, "named_parameters"):
+        return None
+    with _fast_cache_lock:
+        entry = _fast_cache.get(model)
+    if entry is not None and entry.current(policy):
+        return entry.fast
+    # Versions are read before the copy, so a concurrent update forces another rebuild.
+    entry = _FastEntry(policy, None)
+    entry.fast = NumpyPolicy.from_model(model)
+    try:
+        with _fast_cache_lock:
+            _fast_cache[model] = entry
+    except TypeError:  # not weak-referenceable
+        pass
+    return entry.fast
+
+
+def load_eval_policy(path: Union[str, Path]) -> Any:
+    """Deterministic eval policy from a checkpoint: ``NumpyPolicy`` when supported, else PPO."""
+    if FAST_POLICY:
+        try:
+            return NumpyPolicy.load(path)
+        except (ValueError, KeyError):
+            pass
+    from stable_baselines3 import PPO
+
+    return PPO.load(str(path), device="cpu")
+
+
 def safe_model_predict(
     model: Any,
     obs: np.ndarray,
     *,
     deterministic: bool = True,
 ) -> Tuple[np.ndarray, Any]:
-    """Serialize all predict calls so they never overlap PPO weight updates."""
+    """Serialize all predict calls so they never overlap PPO weight updates.
+
+    Deterministic MLP policies run on the lock-free NumPy copy instead.
+    """
+    if isinstance(model, NumpyPolicy):
+        return model.predict(obs, deterministic=deterministic)
+    if deterministic and FAST_POLICY:
+        fast = fast_policy(model)
+        if fast is not None:
+            return fast.predict(obs)
     with _inference_lock:
         import torch
 
@@ -11,7 +11,7 @@ import math
 import os
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
@@ -27,6 +27,9 @@ SPLIT_RNG_SEED = 42
 DT_S = 1.0
 MAX_STEPS = 300
 N_MAX_CONTACTS = 8
+# ContactTable row count from which per-contact geometry runs as NumPy array ops; below it
+# a scalar pass over the column lists is cheaper than the ufunc call overhead.
+CONTACT_VECTORIZE_MIN = 16
 MVP_MAX_ACTIVE_CONTACTS = 4  # legacy alias; train.py uses TRAIN_MAX_CONTACTS
 
 GOAL_SUCCESS_RANGE_M = 50.0
@@ -134,6 +137,210 @@ class ContactState:
         self.y_m += vy * dt
 
 
+# Vessel class names by ``ContactTable.class_id``; unknown names are appended on first use.
+_VESSEL_CLASS_NAMES: List[str] = list(VESSEL_CLASSES)
+
+
+def vessel_class_id(vessel_class: str) -> int:
+    try:
+        return _VESSEL_CLASS_NAMES.index(vessel_class)
+    except ValueError:
+        _VESSEL_CLASS_NAMES.append(vessel_class)
+        return len(_VESSEL_CLASS_NAMES) - 1
+
+
+def vessel_class_names() -> List[str]:
+    """Snapshot of the id -> name registry (ids are per process; ship this with stored ids)."""
+    return list(_VESSEL_CLASS_NAMES)
+
+
+def _column_property(column: str, *, refresh_velocity: bool = False) -> property:
+    def fget(self: "ContactView") -> float:
+        return float(getattr(self._table, column)[self._row])
+
+    def fset(self: "ContactView", value: float) -> None:
+        getattr(self._table, column)[self._row] = value
+        if refresh_velocity:
+            self._table._refresh_velocity(self._row)
+
+    return property(fget, fset)
+
+
+class ContactView(ContactState):
+    """Live row of a ``ContactTable``; attribute reads and writes hit the table's arrays.
+
+    Equality is by value against any ``ContactState``; ``copy.copy`` / ``snapshot()`` give a
+    detached ``ContactState`` (the view itself keeps tracking the row).
+    """
+
+    def __init__(self, table: "ContactTable", row: int) -> None:  # noqa: D107 — no dataclass init
+        self._table = table
+        self._row = row
+
+    x_m = _column_property("x")
+    y_m = _column_property("y")
+    cog_rad = _column_property("cog", refresh_velocity=True)
+    sog_mps = _column_property("sog", refresh_velocity=True)
+    speed_mps = _column_property("speed")
+    radius_m = _column_property("radius")
+
+    @property
+    def vessel_class(self) -> str:
+        return _VESSEL_CLASS_NAMES[int(self._table.class_id[self._row])]
+
+    @vessel_class.setter
+    def vessel_class(self, value: str) -> None:
+        self._table.class_id[self._row] = vessel_class_id(value)
+
+    def step(self, dt: float) -> None:
+        t, i = self._table, self._row
+        t.x[i] += t.vx[i] * dt
+        t.y[i] += t.vy[i] * dt
+
+    def snapshot(self) -> ContactState:
+        """Detached ``ContactState`` with the row's current values."""
+        return ContactState(
+            x_m=self.x_m,
+            y_m=self.y_m,
+            cog_rad=self.cog_rad,
+            sog_mps=self.sog_mps,
+            speed_mps=self.speed_mps,
+            radius_m=self.radius_m,
+            vessel_class=self.vessel_class,
+        )
+
+    def __copy__(self) -> ContactState:
+        return self.snapshot()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> ContactState:
+        return self.snapshot()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ContactState):
+            return NotImplemented
+        return _contact_values(self) == _contact_values(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+# Float columns of ``ContactTable.data`` (one row each), in ``ContactTable.rows()`` tuple order.
+CONTACT_COLUMNS = ("x", "y", "vx", "vy", "cog", "sog", "speed", "radius")
+# ``ContactTable.work`` rows: OBS_CONTACT_DIM features, then range key and 2 temporaries.
+_CONTACT_WORK_ROWS = OBS_CONTACT_DIM + 3
+
+
+class ContactTable:
+    """Struct-of-arrays contact store: rows ``[0, n)`` are live, in insertion order.
+
+    ``data`` is one float64 block of ``CONTACT_COLUMNS`` (``vx`` / ``vy`` cache the ground
+    velocity) exposed as named column views, plus ``class_id``. Iteration and indexing yield
+    ``ContactView`` rows, so code written against ``List[ContactState]`` keeps working.
+    """
+
+    def __init__(self, contacts: Iterable[ContactState] = (), capacity: int = N_MAX_CONTACTS) -> None:
+        self.n = 0
+        self._alloc(max(1, int(capacity)))
+        for c in contacts:
+            self.append(c)
+
+    def _alloc(self, capacity: int) -> None:
+        data = np.zeros((len(CONTACT_COLUMNS), capacity), dtype=np.float64)
+        class_id = np.zeros(capacity, dtype=np.int16)
+        if self.n:
+            data[:, : self.n] = self.data[:, : self.n]
+            class_id[: self.n] = self.class_id[: self.n]
+        self.data = data
+        self.class_id = class_id
+        for i, name in enumerate(CONTACT_COLUMNS):
+            setattr(self, name, data[i])
+        # Scratch for pack_observation: per-row features / temporaries and noise draws.
+        self.work = np.zeros((_CONTACT_WORK_ROWS, capacity), dtype=np.float64)
+        self.noise = np.zeros(2 * capacity, dtype=np.float64)
+
+    @property
+    def capacity(self) -> int:
+        return int(self.x.shape[0])
+
+    @property
+    def active(self) -> np.ndarray:
+        """Bool mask over all ``capacity`` rows."""
+        return np.arange(self.capacity) < self.n
+
+    def _refresh_velocity(self, row: int) -> None:
+        self.vx[row], self.vy[row] = velocity_from_cog(float(self.cog[row]), float(self.sog[row]))
+
+    def append(self, contact: ContactState) -> None:
+        if self.n == self.capacity:
+            self._alloc(2 * self.capacity)
+        i = self.n
+        self.x[i] = contact.x_m
+        self.y[i] = contact.y_m
+        self.cog[i] = contact.cog_rad
+        self.sog[i] = contact.sog_mps
+        self.speed[i] = contact.speed_mps
+        self.radius[i] = contact.radius_m
+        self.class_id[i] = vessel_class_id(contact.vessel_class)
+        self.n = i + 1
+        self._refresh_velocity(i)
+
+    def extend(self, contacts: Iterable[ContactState]) -> None:
+        for c in contacts:
+            self.append(c)
+
+    def clear(self) -> None:
+        self.n = 0
+
+    def step(self, dt: float) -> None:
+        """Advance every live contact along its (constant) ground velocity."""
+        # Whole block: rows past ``n`` are rewritten by ``append`` before they are read.
+        self.data[0:2] += self.data[2:4] * dt
+
+    def ranges(self, x: float, y: float) -> np.ndarray:
+        n = self.n
+        return np.hypot(self.x[:n] - x, self.y[:n] - y)
+
+    def rows(self) -> List[Tuple[float, ...]]:
+        """Live rows as ``CONTACT_COLUMNS``-ordered float tuples (fast scalar iteration)."""
+        return list(zip(*self.data[:, : self.n].tolist()))
+
+    def to_list(self) -> List[ContactState]:
+        """Detached ``ContactState`` copies (safe to keep after the table changes)."""
+        return [c.snapshot() for c in self]
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __iter__(self) -> Iterator[ContactView]:
+        return (ContactView(self, i) for i in range(self.n))
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ContactView, List[ContactView]]:
+        if isinstance(index, slice):
+            return [ContactView(self, i) for i in range(self.n)[index]]
+        i = range(self.n)[index]
+        return ContactView(self, i)
+
+    def __eq__(self, other: object) -> bool:
+        """Compares contact values with another table or a ``ContactState`` sequence."""
+        if not isinstance(other, (ContactTable, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            _contact_values(a) == _contact_values(b) for a, b in zip(self, other)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"ContactTable({list(self)!r})"
+
+
+def _contact_values(c: ContactState) -> Tuple[Any, ...]:
+    return (c.x_m, c.y_m, c.cog_rad, c.sog_mps, c.speed_mps, c.radius_m, c.vessel_class)
+
+
+def as_contact_table(contacts: Iterable[ContactState]) -> ContactTable:
+    return contacts if isinstance(contacts, ContactTable) else ContactTable(contacts)
+
+
 def radius_for_class(vessel_class: str) -> float:
     return VESSEL_CLASSES.get(vessel_class, OWN_RADIUS_M)
 
@@ -174,6 +381,51 @@ def compute_cpa_tcpa(
     return math.hypot(cpa_x, cpa_y), tcpa
 
 
+def contact_bearings_ranges(
+    table: ContactTable, own_x: float, own_y: float
+) -> Tuple[List[float], List[float]]:
+    """Per-row ``bearing_range`` from own position over a ``ContactTable``."""
+    n = table.n
+    if n >= CONTACT_VECTORIZE_MIN:
+        dx = table.x[:n] - own_x
+        dy = table.y[:n] - own_y
+        return np.arctan2(dx, dy).tolist(), np.hypot(dx, dy).tolist()
+    bearings: List[float] = []
+    ranges: List[float] = []
+    for x, y, *_ in table.rows():
+        brg, rng = bearing_range(own_x, own_y, x, y)
+        bearings.append(brg)
+        ranges.append(rng)
+    return bearings, ranges
+
+
+def contact_cpa_tcpa(
+    table: ContactTable, own_x: float, own_y: float, own_vx: float, own_vy: float
+) -> Tuple[List[float], List[float], List[float]]:
+    """Per-row (range, CPA, TCPA) over a ``ContactTable``; same values as ``compute_cpa_tcpa``."""
+    n = table.n
+    if n >= CONTACT_VECTORIZE_MIN:
+        rx = table.x[:n] - own_x
+        ry = table.y[:n] - own_y
+        vx = table.vx[:n] - own_vx
+        vy = table.vy[:n] - own_vy
+        rng = np.hypot(rx, ry)
+        v2 = vx * vx + vy * vy
+        moving = v2 >= 1e-8
+        tcpa = -(rx * vx + ry * vy) / np.where(moving, v2, 1.0)
+        cpa = np.where(moving, np.hypot(rx + vx * tcpa, ry + vy * tcpa), rng)
+        return rng.tolist(), cpa.tolist(), np.where(moving, tcpa, np.inf).tolist()
+    ranges: List[float] = []
+    cpas: List[float] = []
+    tcpas: List[float] = []
+    for x, y, vx, vy, *_ in table.rows():
+        cpa, tcpa = compute_cpa_tcpa(own_x, own_y, own_vx, own_vy, x, y, vx, vy)
+        ranges.append(math.hypot(x - own_x, y - own_y))
+        cpas.append(cpa)
+        tcpas.append(tcpa)
+    return ranges, cpas, tcpas
+
+
 def cpa_safe_distance(
     contact_radius_m: float,
     own_radius_m: float = OWN_RADIUS_M,
@@ -418,6 +670,121 @@ def action_to_command(action: np.ndarray) -> Tuple[float, float]:
     return heading, speed
 
 
+_TWO_PI = 2.0 * math.pi
+
+
+def _wrap_angles(a: np.ndarray) -> None:
+    """In-place ``wrap_angle`` (same repeated ±2π steps, so identical values)."""
+    while True:
+        hi = a > math.pi
+        if not hi.any():
+            break
+        np.subtract(a, _TWO_PI, out=a, where=hi)
+    while True:
+        lo = a < -math.pi
+        if not lo.any():
+            break
+        np.add(a, _TWO_PI, out=a, where=lo)
+
+
+def _pack_contacts_scalar(
+    obs: np.ndarray,
+    table: ContactTable,
+    own: VesselState,
+    cur: WaterCurrent,
+    noise: Optional[np.ndarray],
+    noise_bearing_rad: float,
+    noise_m: float,
+) -> None:
+    """Contact slots + mask for small tables: one Python pass over the column lists."""
+    n = table.n
+    bearings, ranges = contact_bearings_ranges(table, own.x_m, own.y_m)
+    if noise is not None:
+        z = noise.tolist()
+        for i in range(n):
+            bearings[i] = wrap_angle(bearings[i] + noise_bearing_rad * z[2 * i])
+            ranges[i] = max(0.0, ranges[i] + noise_m * z[2 * i + 1])
+    order = sorted(range(n), key=ranges.__getitem__)[:N_MAX_CONTACTS]
+
+    own_vx, own_vy = own_velocity(own, cur)
+    rows = table.rows()
+    for slot, row in enumerate(order):
+        _, _, vx, vy, cog, _, _, radius = rows[row]
+        offset = OBS_OWN_DIM + OBS_CURRENT_DIM + slot * OBS_CONTACT_DIM
+        brg = bearings[row]
+        obs[offset + 0] = math.sin(brg)
+        obs[offset + 1] = math.cos(brg)
+        obs[offset + 2] = min(ranges[row] / RANGE_SCALE_M, 1.0)
+        # Same math as contact_relative_motion, read straight from the table columns.
+        rel_cog = wrap_angle(cog - own.heading_rad)
+        rel_fwd, rel_stbd = relative_velocity_body(own.heading_rad, own_vx, own_vy, vx, vy)
+        obs[offset + 3] = math.sin(rel_cog)
+        obs[offset + 4] = math.cos(rel_cog)
+        obs[offset + 5] = rel_fwd / REL_VEL_SCALE_MPS
+        obs[offset + 6] = rel_stbd / REL_VEL_SCALE_MPS
+        obs[offset + 7] = radius / RADIUS_SCALE_M
+        obs[OBS_MASK_OFFSET + slot] = 1.0
+
+
+def _pack_contacts_array(
+    obs: np.ndarray,
+    table: ContactTable,
+    own: VesselState,
+    cur: WaterCurrent,
+    noise: Optional[np.ndarray],
+    noise_bearing_rad: float,
+    noise_m: float,
+) -> None:
+    """Contact slots + mask as array ops in ``table.work``; nearest N_MAX_CONTACTS kept."""
+    n = table.n
+    x, y, vx, vy, cog, _, _, radius = table.data[:, :n]
+    w = table.work[:, :n]
+    feat = w[:OBS_CONTACT_DIM]
+    key, t0, t1 = w[OBS_CONTACT_DIM:]
+
+    np.subtract(x, own.x_m, out=t0)
+    np.subtract(y, own.y_m, out=t1)
+    brg = feat[0]  # raw bearing until sin/cos below
+    np.arctan2(t0, t1, out=brg)  # 0=north, cw positive
+    np.hypot(t0, t1, out=key)
+    if noise is not None:
+        np.multiply(noise[0::2], noise_bearing_rad, out=t0)
+        brg += t0
+        _wrap_angles(brg)
+        np.multiply(noise[1::2], noise_m, out=t0)
+        key += t0
+        np.maximum(key, 0.0, out=key)
+    np.cos(brg, out=feat[1])
+    np.sin(brg, out=feat[0])
+    np.divide(key, RANGE_SCALE_M, out=feat[2])
+    np.minimum(feat[2], 1.0, out=feat[2])
+
+    heading = own.heading_rad
+    np.subtract(cog, heading, out=t0)
+    _wrap_angles(t0)
+    np.sin(t0, out=feat[3])
+    np.cos(t0, out=feat[4])
+    own_vx, own_vy = own_velocity(own, cur)
+    sh, ch = math.sin(heading), math.cos(heading)
+    np.subtract(vx, own_vx, out=t0)
+    np.subtract(vy, own_vy, out=t1)
+    # relative_velocity_body: fwd = rvx*sin(h) + rvy*cos(h), stbd = rvx*cos(h) - rvy*sin(h)
+    np.multiply(t0, sh, out=feat[5])
+    np.multiply(t0, ch, out=feat[6])
+    np.multiply(t1, ch, out=t0)
+    feat[5] += t0
+    np.multiply(t1, sh, out=t0)
+    feat[6] -= t0
+    feat[5:7] /= REL_VEL_SCALE_MPS
+    np.divide(radius, RADIUS_SCALE_M, out=feat[7])
+
+    order = np.argsort(key, kind="stable")[:N_MAX_CONTACTS]
+    k = order.shape[0]
+    slots = obs[OBS_OWN_DIM + OBS_CURRENT_DIM : OBS_MASK_OFFSET]
+    slots.reshape(N_MAX_CONTACTS, OBS_CONTACT_DIM)[:k] = feat.T[order]
+    obs[OBS_MASK_OFFSET : OBS_MASK_OFFSET + k] = 1.0
+
+
 def pack_observation(
     own: VesselState,
     goal_x: float,
@@ -452,39 +819,20 @@ def pack_observation(
     obs[8] = math.cos(cur.direction_rad)
 
     # Contacts sorted by sensed range (noise applied to observations only)
-    indexed: List[Tuple[float, ContactState]] = []
-    noise_rng = rng
-    for c in contacts:
-        brg, rng_dist = bearing_range(own.x_m, own.y_m, c.x_m, c.y_m)
-        if noise_rng is not None and (contact_noise_m > 0.0 or contact_noise_bearing_rad > 0.0):
-            brg = wrap_angle(
-                brg + float(noise_rng.normal(0.0, contact_noise_bearing_rad))
-            )
-            rng_dist = max(0.0, rng_dist + float(noise_rng.normal(0.0, contact_noise_m)))
-        indexed.append((rng_dist, c, brg))
-    indexed.sort(key=lambda t: t[0])
-
-    base = 9
-    for slot in range(N_MAX_CONTACTS):
-        offset = base + slot * OBS_CONTACT_DIM
-        if slot < len(indexed):
-            rng_dist, c, brg = indexed[slot]
-            obs[offset + 0] = math.sin(brg)
-            obs[offset + 1] = math.cos(brg)
-            obs[offset + 2] = min(rng_dist / RANGE_SCALE_M, 1.0)
-            rel_cog_sin, rel_cog_cos, rel_fwd, rel_stbd = contact_relative_motion(
-                own, c, cur
-            )
-            obs[offset + 3] = rel_cog_sin
-            obs[offset + 4] = rel_cog_cos
-            obs[offset + 5] = rel_fwd / REL_VEL_SCALE_MPS
-            obs[offset + 6] = rel_stbd / REL_VEL_SCALE_MPS
-            obs[offset + 7] = c.radius_m / RADIUS_SCALE_M
-            obs[base + N_MAX_CONTACTS * OBS_CONTACT_DIM + slot] = 1.0  # mask
-        else:
-            obs[base + N_MAX_CONTACTS * OBS_CONTACT_DIM + slot] = 0.0
-
-    goal_base = base + N_MAX_CONTACTS * OBS_CONTACT_DIM + N_MAX_CONTACTS
+    table = as_contact_table(contacts)
+    n = table.n
+    noise: Optional[np.ndarray] = None
+    if rng is not None and n and (contact_noise_m > 0.0 or contact_noise_bearing_rad > 0.0):
+        # One draw for all contacts, interleaved (bearing, range) per contact: the same
+        # stream and values as per-contact normal(0, sigma) calls, so seeded replays hold.
+        noise = table.noise[: 2 * n]
+        rng.standard_normal(out=noise)
+    if n >= CONTACT_VECTORIZE_MIN:
+        _pack_contacts_array(obs, table, own, cur, noise, contact_noise_bearing_rad, contact_noise_m)
+    elif n:
+        _pack_contacts_scalar(obs, table, own, cur, noise, contact_noise_bearing_rad, contact_noise_m)
+
+    goal_base = OBS_GOAL_OFFSET
     if has_goal:
         g_brg, g_rng = bearing_range(own.x_m, own.y_m, goal_x, goal_y)
         obs[goal_base + 0] = math.sin(g_brg)
@@ -647,6 +995,8 @@ def scenario_to_contacts(scenario: ScenarioSeed) -> List[ContactState]:
 def min_contact_range(own: VesselState, contacts: Sequence[ContactState]) -> float:
     if not contacts:
         return float("inf")
+    if isinstance(contacts, ContactTable):
+        return min(contact_bearings_ranges(contacts, own.x_m, own.y_m)[1])
     return min(math.hypot(c.x_m - own.x_m, c.y_m - own.y_m) for c in contacts)
 
 
@@ -655,6 +1005,10 @@ def check_collision(
     contacts: Sequence[ContactState],
     own_radius_m: float = OWN_RADIUS_M,
 ) -> bool:
+    if isinstance(contacts, ContactTable):
+        _, ranges = contact_bearings_ranges(contacts, own.x_m, own.y_m)
+        radii = contacts.radius[: contacts.n].tolist()
+        return any(r < own_radius_m + radius for r, radius in zip(ranges, radii))
     for c in contacts:
         if math.hypot(c.x_m - own.x_m, c.y_m - own.y_m) < own_radius_m + c.radius_m:
             return True
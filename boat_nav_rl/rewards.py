@@ -410,6 +410,9 @@ def contact_step_metrics(
             cpa_unsafe=False,
         )
 
+    if isinstance(contacts, P.ContactTable):
+        return _table_step_metrics(own, contacts, water_current, own_radius_m, cfg)
+
     min_rng = P.min_contact_range(own, contacts)
     collision = P.check_collision(own, contacts, own_radius_m)
     own_vx, own_vy = P.own_velocity(own, water_current)
@@ -455,6 +458,47 @@ def contact_step_metrics(
     )
 
 
+def _table_step_metrics(
+    own: P.VesselState,
+    table: P.ContactTable,
+    water_current: P.WaterCurrent,
+    own_radius_m: float,
+    cfg: RewardConfig,
+) -> ContactStepMetrics:
+    """``contact_step_metrics`` over a ``ContactTable``: geometry per row, then penalty bands."""
+    own_vx, own_vy = P.own_velocity(own, water_current)
+    ranges, cpas, tcpas = P.contact_cpa_tcpa(table, own.x_m, own.y_m, own_vx, own_vy)
+    collision = False
+    cpa_penalty = 0.0
+    threat = 0.0
+    cpa_unsafe = False
+    for rng_m, cpa_m, tcpa, radius in zip(ranges, cpas, tcpas, table.radius[: table.n].tolist()):
+        if rng_m < own_radius_m + radius:
+            collision = True
+        if tcpa < 0.0 or tcpa > P.CPA_HORIZON_S:
+            continue
+        safe = P.cpa_safe_distance(radius, own_radius_m)
+        if cpa_m < safe:
+            cpa_unsafe = True
+            frac = (safe - cpa_m) / safe
+            cpa_penalty += cfg.w_cpa * frac
+            threat = max(threat, min(1.0, frac))
+        elif cpa_m < safe * cfg.cpa_warning_mult:
+            span = safe * (cfg.cpa_warning_mult - 1.0)
+            warn_frac = (safe * cfg.cpa_warning_mult - cpa_m) / max(span, 1e-6)
+            cpa_penalty += cfg.w_cpa_soft * warn_frac
+            threat = max(threat, min(1.0, 0.5 * warn_frac))
+
+    return ContactStepMetrics(
+        min_range_m=min(ranges),
+        min_cpa_m=min(cpas),
+        collision=collision,
+        cpa_penalty=cpa_penalty,
+        threat=threat,
+        cpa_unsafe=cpa_unsafe,
+    )
+
+
 def contact_threat_and_cpa_penalty(
     own: P.VesselState,
     contacts: List[P.ContactState],
@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Optional, Sequence
 import prepare as P
 from rewards import APPROACH_SLOW_RANGE_M, HOLD_AT_STOP_EPS_MPS, energy_score_from_speeds
 from runs_util import score_from_metrics, score_key_for_mode
+from trace_store import load_trace_episodes
 
 
 def _goal_range_m(step: Dict[str, Any]) -> float:
@@ -52,7 +53,6 @@ def episode_diagnostics(episode: Dict[str, Any]) -> Dict[str, Any]:
 
 def summarize_run(run_dir: Path) -> Dict[str, Any]:
     metrics_path = run_dir / "metrics.json"
-    traces_path = run_dir / "eval_traces.json"
     if not metrics_path.exists():
         raise FileNotFoundError(f"No metrics.json in {run_dir}")
 
@@ -60,10 +60,7 @@ def summarize_run(run_dir: Path) -> Dict[str, Any]:
     mode = str(metrics.get("mode", P.DEFAULT_MODE))
     score_key = score_key_for_mode(mode)
 
-    episodes: List[Dict[str, Any]] = []
-    if traces_path.exists():
-        raw = json.loads(traces_path.read_text(encoding="utf-8"))
-        episodes = list(raw.get("episodes") or [])
+    episodes = load_trace_episodes(run_dir)
 
     per_ep = [episode_diagnostics(ep) for ep in episodes]
     all_speeds = [
@@ -0,0 +1,203 @@
+"""Incremental run index (``runs/run_index.sqlite3``) behind ``/api/runs`` and ``/api/history``.
+
+One row per run directory with its ``metrics.json`` stamp (mtime_ns, size) and a summary
+record. ``write_run_outputs`` upserts finished runs; ``reconcile`` is a ``scandir`` + ``stat``
+pass that picks up runs added, edited, or deleted by hand without parsing unchanged metrics.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from runs_util import score_from_metrics
+from trace_store import load_trace_episodes
+
+RUN_INDEX_NAME = "run_index.sqlite3"
+RUN_INDEX_SCHEMA_VERSION = 1
+_SKIP_DIRS = ("_training",)
+
+# Summary fields kept per run (``mode`` only when metrics.json has one).
+RUN_FIELDS = (
+    "run_id",
+    "mode",
+    "nav_score",
+    "avoid_score",
+    "score",
+    "success_rate",
+    "collision_rate",
+    "avg_final_goal_range_m",
+    "mean_goal_zone_speed_mps",
+    "pct_goal_zone_at_min_speed",
+    "reward_breakdown_mean",
+    "reward_weights",
+    "gated_hold",
+    "notes",
+    "parent_run_id",
+    "train_session",
+    "cumulative_train_sec",
+    "train_elapsed_sec",
+)
+
+
+def run_index_path(runs_dir: Path) -> Path:
+    return runs_dir / RUN_INDEX_NAME
+
+
+@contextmanager
+def _connect(runs_dir: Path) -> Iterator[sqlite3.Connection]:
+    """One transaction on the index (created or rebuilt on schema change); closed on exit."""
+    conn = sqlite3.connect(str(run_index_path(runs_dir)), timeout=10.0)
+    try:
+        with conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != RUN_INDEX_SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS runs")
+                conn.execute(
+                    "CREATE TABLE runs (run_id TEXT PRIMARY KEY, stamp TEXT NOT NULL, "
+                    "ok INTEGER NOT NULL, record TEXT NOT NULL)"
+                )
+                conn.execute(f"PRAGMA user_version = {RUN_INDEX_SCHEMA_VERSION}")
+            yield conn
+    finally:
+        conn.close()
+
+
+def _metrics_stamp(run_dir: Path) -> Optional[str]:
+    try:
+        st = os.stat(run_dir / "metrics.json")
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def run_record(run_dir: Path) -> Optional[Dict[str, Any]]:
+    """Summary of one run from its metrics.json (None when missing or unreadable)."""
+    try:
+        metrics = json.loads((run_dir / "metrics.json").read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError):
+        return None
+    if not isinstance(metrics, dict):
+        return None
+    avg_rng = metrics.get("avg_final_goal_range_m")
+    if avg_rng is None:
+        # Index-only read: episode metadata without steps.
+        try:
+            episodes = load_trace_episodes(run_dir, with_steps=False)
+        except (ValueError, OSError):
+            episodes = []
+        ranges = [
+            ep.get("final_goal_range_m") for ep in episodes if ep.get("final_goal_range_m") is not None
+        ]
+        if ranges:
+            avg_rng = round(sum(ranges) / len(ranges), 2)
+    config = metrics.get("config") or {}
+    record: Dict[str, Any] = {"run_id": run_dir.name}
+    if "mode" in metrics:
+        record["mode"] = metrics["mode"]
+    record.update(
+        {
+            "nav_score": metrics.get("nav_score"),
+            "avoid_score": metrics.get("avoid_score"),
+            "score": score_from_metrics(metrics),
+            "success_rate": metrics.get("success_rate"),
+            "collision_rate": metrics.get("collision_rate"),
+            "avg_final_goal_range_m": avg_rng,
+            "mean_goal_zone_speed_mps": metrics.get("mean_goal_zone_speed_mps"),
+            "pct_goal_zone_at_min_speed": metrics.get("pct_goal_zone_at_min_speed"),
+            "reward_breakdown_mean": metrics.get("reward_breakdown_mean"),
+            "reward_weights": config.get("reward_weights"),
+            "gated_hold": config.get("gated_hold"),
+            "notes": metrics.get("notes", ""),
+            "parent_run_id": metrics.get("parent_run_id"),
+            "train_session": metrics.get("train_session", 1),
+            "cumulative_train_sec": metrics.get("cumulative_train_sec"),
+            "train_elapsed_sec": metrics.get("train_elapsed_sec"),
+        }
+    )
+    return record
+
+
+def _upsert(conn: sqlite3.Connection, run_dir: Path, stamp: str) -> None:
+    record = run_record(run_dir)
+    conn.execute(
+        "INSERT OR REPLACE INTO runs (run_id, stamp, ok, record) VALUES (?, ?, ?, ?)",
+        (
+            run_dir.name,
+            stamp,
+            int(record is not None),
+            json.dumps(record or {"run_id": run_dir.name}, separators=(",", ":")),
+        ),
+    )
+
+
+def update_run(run_dir: Path) -> None:
+    """Index (or re-index) one run; drops it when metrics.json is gone."""
+    runs_dir = run_dir.parent
+    stamp = _metrics_stamp(run_dir)
+    with _connect(runs_dir) as conn:
+        if stamp is None:
+            conn.execute("DELETE FROM runs WHERE run_id = ?", (run_dir.name,))
+        else:
+            _upsert(conn, run_dir, stamp)
+
+
+def _scan_stamps(runs_dir: Path) -> Dict[str, str]:
+    stamps: Dict[str, str] = {}
+    with os.scandir(runs_dir) as it:
+        for entry in it:
+            if entry.name in _SKIP_DIRS or not entry.is_dir():
+                continue
+            stamp = _metrics_stamp(Path(entry.path))
+            if stamp is not None:
+                stamps[entry.name] = stamp
+    return stamps
+
+
+def reconcile(runs_dir: Path) -> Dict[str, int]:
+    """Bring the index in line with ``runs_dir``; only new or changed metrics.json are parsed."""
+    on_disk = _scan_stamps(runs_dir)
+    with _connect(runs_dir) as conn:
+        indexed = dict(conn.execute("SELECT run_id, stamp FROM runs"))
+        removed = [run_id for run_id in indexed if run_id not in on_disk]
+        conn.executemany("DELETE FROM runs WHERE run_id = ?", [(run_id,) for run_id in removed])
+        changed = [run_id for run_id, stamp in on_disk.items() if indexed.get(run_id) != stamp]
+        for run_id in changed:
+            _upsert(conn, runs_dir / run_id, on_disk[run_id])
+    added = sum(1 for run_id in changed if run_id not in indexed)
+    return {"added": added, "updated": len(changed) - added, "removed": len(removed)}
+
+
+def query_runs(
+    runs_dir: Path,
+    *,
+    limit: int = 0,
+    offset: int = 0,
+    newest_first: bool = True,
+    readable_only: bool = False,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Reconcile, then page through runs by id (``limit`` 0 = all). Returns (records, total)."""
+    if not runs_dir.is_dir():
+        return [], 0
+    reconcile(runs_dir)
+    where = " WHERE ok = 1" if readable_only else ""
+    with _connect(runs_dir) as conn:
+        total = conn.execute(f"SELECT COUNT(*) FROM runs{where}").fetchone()[0]
+        rows = conn.execute(
+            f"SELECT record FROM runs{where} ORDER BY run_id DESC LIMIT ? OFFSET ?",
+            (limit or -1, offset),
+        ).fetchall()
+    records = [json.loads(row[0]) for row in rows]
+    if not newest_first:
+        records.reverse()
+    return records, total
+
+
+def project(records: Sequence[Dict[str, Any]], fields: Optional[Sequence[str]]) -> List[Dict[str, Any]]:
+    """Keep only ``fields`` (in request order) from each record; None keeps everything."""
+    if fields is None:
+        return list(records)
+    return [{name: rec.get(name) for name in fields} for rec in records]
@@ -9,8 +9,11 @@ from typing import Any, Dict, List, Optional
 
 from stable_baselines3 import PPO
 
+import run_index as RI
 import train_config as C
 from rewards import gated_hold_enabled, reward_weights_dict
+from trace_recorder import trace_json_default
+from trace_store import TRACE_JSON_NAME, write_trace_store
 from train_job_state import RUNS_DIR
 
 
@@ -83,9 +86,12 @@ def write_run_outputs(
         "viz_url": f"http://localhost:{C.VIZ_PORT}/scenarios.html?run={run_dir.name}",
     }
     (run_dir / "metrics.json").write_text(json.dumps(payload, indent=2), encoding="utf-8")
-    (run_dir / "eval_traces.json").write_text(
-        json.dumps({"episodes": traces}, separators=(",", ":")), encoding="utf-8"
-    )
+    write_trace_store(run_dir, traces)
+    if C.EVAL_TRACES_JSON:
+        (run_dir / TRACE_JSON_NAME).write_text(
+            json.dumps({"episodes": traces}, separators=(",", ":"), default=trace_json_default),
+            encoding="utf-8",
+        )
     model.save(str(run_dir / "model"))
 
     if C.MONTAGE_ENABLED and traces:
@@ -107,3 +113,8 @@ def write_run_outputs(
             )
         except Exception as exc:
             print(f"[montage] skipped: {exc}")
+
+    try:
+        RI.update_run(run_dir)
+    except Exception as exc:  # list endpoints reconcile on read anyway
+        print(f"[run_index] update skipped: {exc}")
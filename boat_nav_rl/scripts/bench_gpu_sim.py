@@ -18,16 +18,20 @@ from env_factory import make_env
 from vecenv_util import make_vec_env
 
 
-def bench_env(env, n_envs: int, steps: int = 500) -> float:
+def bench_env(env, n_envs: int, steps: int = 500) -> tuple[float, float]:
+    """Returns (env-steps/s, median per-step wall time in ms)."""
     obs = env.reset()
     actions = np.zeros((n_envs, 2), dtype=np.float32)
+    step_times = []
     t0 = time.perf_counter()
     for _ in range(steps):
+        t_step = time.perf_counter()
         env.step_async(actions)
         obs, _, _, _ = env.step_wait()
+        step_times.append(time.perf_counter() - t_step)
     elapsed = time.perf_counter() - t0
     env.close()
-    return (n_envs * steps) / elapsed
+    return (n_envs * steps) / elapsed, float(np.median(step_times)) * 1e3
 
 
 def main() -> None:
@@ -41,17 +45,17 @@ def main() -> None:
 
     factories = [make_env(mode, i) for i in range(n_envs)]
     cpu_env = make_vec_env(factories, n_envs, backend="subproc")
-    cpu_sps = bench_env(cpu_env, n_envs, steps)
-    print(f"  SubprocVecEnv: {cpu_sps:,.0f} env-steps/s")
+    cpu_sps, cpu_ms = bench_env(cpu_env, n_envs, steps)
+    print(f"  SubprocVecEnv: {cpu_sps:,.0f} env-steps/s  ({cpu_ms:.3f} ms/step)")
 
     gpu_env = make_gpu_vec_env(
         n_envs=n_envs,
         mode=mode,
-        device=os.environ.get("BENCH_DEVICE", "cuda"),
+        device=os.environ.get("BENCH_DEVICE", "auto"),
         current_enabled=False,
     )
-    gpu_sps = bench_env(gpu_env, n_envs, steps)
-    print(f"  BatchedBoatVecEnv: {gpu_sps:,.0f} env-steps/s")
+    gpu_sps, gpu_ms = bench_env(gpu_env, n_envs, steps)
+    print(f"  BatchedBoatVecEnv ({gpu_env.sim.device}): {gpu_sps:,.0f} env-steps/s  ({gpu_ms:.3f} ms/step)")
     print(f"  Speedup: {gpu_sps / max(cpu_sps, 1):.1f}x")
 
 
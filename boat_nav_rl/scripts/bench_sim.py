@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Sweep rollout throughput across VecEnv backends; writes JSON under runs/_bench/."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sim_bench import (
+    ALL_BACKENDS,
+    DEFAULT_CONTACTS,
+    DEFAULT_MODES,
+    DEFAULT_N_ENVS,
+    compare_bench,
+    run_bench_suite,
+    write_bench_report,
+)
+
+
+def _csv(cast):
+    return lambda text: [cast(part) for part in text.split(",") if part.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rollout throughput benchmark suite")
+    parser.add_argument(
+        "--backends",
+        type=_csv(str),
+        default=None,
+        help=f"Comma list from {','.join(ALL_BACKENDS)} (default: all available)",
+    )
+    parser.add_argument("--n-envs", type=_csv(int), default=list(DEFAULT_N_ENVS))
+    parser.add_argument("--modes", type=_csv(str), default=list(DEFAULT_MODES))
+    parser.add_argument(
+        "--contacts",
+        type=_csv(int),
+        default=list(DEFAULT_CONTACTS),
+        help="Max random contacts per avoid reset (ignored for navigate)",
+    )
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out-dir", type=Path, default=None, help="Default: runs/_bench")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline report to diff against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed env-steps/s drop vs baseline")
+    args = parser.parse_args()
+    # Read before writing: the default baseline (latest.json) is overwritten by this run.
+    baseline = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else None
+
+    report = run_bench_suite(
+        backends=args.backends,
+        n_envs=args.n_envs,
+        modes=args.modes,
+        contacts=args.contacts,
+        steps=args.steps,
+        warmup=args.warmup,
+        seed=args.seed,
+    )
+    path = write_bench_report(report, args.out_dir)
+    print(f"Wrote {path}")
+
+    if baseline is not None:
+        regressions = compare_bench(baseline, report, tolerance=args.tolerance)
+        for r in regressions:
+            print(
+                f"REGRESSION {r['backend']} n={r['n_envs']} {r['mode']} k={r['max_contacts']}: "
+                f"{r['baseline_env_steps_per_sec']:,.0f} -> {r['env_steps_per_sec']:,.0f} "
+                f"({r['ratio']:.2f}x)"
+            )
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} vs {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ from stable_baselines3 import PPO
 
 import prepare as P
 from eval_runner import run_eval
+from trace_recorder import trace_json_default
 
 
 def main() -> None:
@@ -26,6 +27,7 @@ def main() -> None:
     parser.add_argument("--max-scenarios", type=int, default=0, help="0 = full eval set")
     parser.add_argument("--device", default="cpu")
     parser.add_argument("--write", action="store_true", help="Overwrite eval_traces.json + metrics eval fields")
+    parser.add_argument("--no-cache", action="store_true", help="Re-roll every episode (skip runs/_eval_cache)")
     args = parser.parse_args()
 
     run_dir = ROOT / "runs" / args.run_id
@@ -42,12 +44,20 @@ def main() -> None:
     model = PPO.load(str(ckpt), device=device)
 
     limit = args.max_scenarios if args.max_scenarios > 0 else None
-    eval_result = run_eval(model, mode, max_scenarios=limit, collect_traces=True)
+    # Traces only for --write; COLREGS metrics are scored inside the rollouts either way.
+    eval_result = run_eval(
+        model,
+        mode,
+        max_scenarios=limit,
+        collect_traces=args.write,
+        colregs=True,
+        use_cache=not args.no_cache,
+    )
     eval_metrics, traces = eval_result.metrics, eval_result.traces
 
     if args.write:
         (run_dir / "eval_traces.json").write_text(
-            json.dumps({"episodes": traces}, separators=(",", ":")),
+            json.dumps({"episodes": traces}, separators=(",", ":"), default=trace_json_default),
             encoding="utf-8",
         )
         merged = {**metrics, **eval_metrics}
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Convert runs' eval_traces.json into the columnar eval_traces/ store (memory-mapped reads)."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from runs_util import safe_run_dir
+from trace_store import TRACE_JSON_NAME, has_trace_store, migrate_run_traces
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migrate eval_traces.json to eval_traces/")
+    parser.add_argument("run_ids", nargs="*", help="Run ids (default: every run with eval_traces.json)")
+    parser.add_argument("--force", action="store_true", help="Rebuild runs that already have a store")
+    parser.add_argument("--remove-json", action="store_true", help="Delete eval_traces.json afterwards")
+    args = parser.parse_args()
+
+    runs_dir = ROOT / "runs"
+    if args.run_ids:
+        run_dirs = [safe_run_dir(run_id, runs_dir) for run_id in args.run_ids]
+    else:
+        run_dirs = sorted(p.parent for p in runs_dir.glob(f"*/{TRACE_JSON_NAME}"))
+
+    failed = 0
+    for run_dir in run_dirs:
+        if has_trace_store(run_dir) and not args.force:
+            print(f"{run_dir.name}: store exists, skipped")
+            continue
+        try:
+            root = migrate_run_traces(run_dir, remove_json=args.remove_json)
+        except (KeyError, TypeError, ValueError, OSError) as exc:
+            failed += 1
+            print(f"{run_dir.name}: failed ({exc!r})", file=sys.stderr)
+            continue
+        print(f"{run_dir.name}: {'no ' + TRACE_JSON_NAME if root is None else root}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
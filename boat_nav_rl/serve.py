@@ -1,24 +1,44 @@
 #!/usr/bin/env python3
 """Serve boat nav RL visualization and run API."""
 
+import hashlib
 import json
 import mimetypes
 import os
+import queue
+import stat
 import sys
+import threading
+from collections import OrderedDict
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
 
+import http_encoding as HE
 import prepare as P
+import run_index as RI
 import training_job as TJ
+from train_stream import STREAM_KEEPALIVE_SEC, train_stream
 import exercise as EX
-from api_parse import ApiParseError, parse_device, parse_float, parse_int, parse_mode, parse_optional_int, parse_run_id
+from api_parse import (
+    ApiParseError,
+    parse_device,
+    parse_fields,
+    parse_float,
+    parse_int,
+    parse_mode,
+    parse_optional_int,
+    parse_run_id,
+)
 from exercise import EXERCISE_MAX_STEP_BATCH, ExerciseNotInitializedError, GoalRejectedError
+from colregs.config import DEFAULT_CONFIG_PATH as COLREGS_CONFIG_PATH
 from colregs.evaluate import enrich_trace_file
 from colregs.frame_series import frame_score_series
+from trace_recorder import trace_json_default
+from trace_store import load_trace_episodes, trace_source_files
 from device_util import torch_device_info
-from runs_util import InvalidRunIdError, latest_run_id, safe_run_dir, score_from_metrics, validate_run_id
+from runs_util import InvalidRunIdError, latest_run_id, safe_run_dir, validate_run_id
 from curriculum import list_ui_training_presets
 from rewards import gated_hold_enabled, reward_weights_dict
 from vecenv_util import recommended_n_envs, training_perf_defaults
@@ -32,17 +52,22 @@ DEFAULT_PORT = 8765
 API_VERSION = 1
 MAX_JSON_BODY_BYTES = int(os.environ.get("BOAT_NAV_MAX_JSON_BODY", str(1024 * 1024)))
 MAX_COLREGS_STEPS = int(os.environ.get("BOAT_NAV_MAX_COLREGS_STEPS", "2000"))
+# COLREGS-enriched traces: on disk per run (keyed by content hashes) + in-process LRU.
+ENRICHED_TRACES_NAME = "eval_traces_colregs.json"
+# Serialized /api/runs/<id> body; .gz/.br siblings are built beside it on first request.
+RUN_PAYLOAD_NAME = "run_payload.json"
+ENRICHED_CACHE_SIZE = max(0, int(os.environ.get("BOAT_NAV_ENRICHED_CACHE_SIZE", "8")))
+
+_enriched_lru: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+_enriched_lock = threading.Lock()
 
 
 def _load_run_payload(run_id: str) -> dict:
     run_dir = safe_run_dir(run_id, RUNS_DIR)
     metrics_path = run_dir / "metrics.json"
-    traces_path = run_dir / "eval_traces.json"
     if not metrics_path.exists():
         raise FileNotFoundError("run not found")
-    traces = {"episodes": []}
-    if traces_path.exists():
-        traces = enrich_trace_file(json.loads(traces_path.read_text(encoding="utf-8")))
+    traces = _enriched_traces(run_dir)
     return {
         "run_id": run_id,
         "metrics": json.loads(metrics_path.read_text(encoding="utf-8")),
@@ -50,40 +75,133 @@ def _load_run_payload(run_id: str) -> dict:
     }
 
 
-def list_runs(limit: int = 40) -> List[dict]:
-    runs = sorted(
-        [
-            p
-            for p in RUNS_DIR.iterdir()
-            if p.is_dir()
-            and p.name not in ("_training",)
-            and (p / "metrics.json").exists()
-        ],
-        key=lambda p: p.name,
-        reverse=True,
-    )[:limit]
-    out = []
-    for run_dir in runs:
-        metrics_path = run_dir / "metrics.json"
-        try:
-            metrics = json.loads(metrics_path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
-            metrics = {}
-        mode = metrics.get("mode", "?")
-        score = score_from_metrics(metrics)
-        out.append(
-            {
-                "id": run_dir.name,
-                "mode": mode,
-                "score": score,
-                "notes": metrics.get("notes", ""),
-                "success_rate": metrics.get("success_rate"),
-                "collision_rate": metrics.get("collision_rate"),
-            }
-        )
+def _run_payload_file(run_id: str) -> Optional[Path]:
+    """``run_payload.json`` for a run, rebuilt when any input's (size, mtime) changed.
+
+    The input stamps live in ``run_payload.json.key``. Returns None for aliases (e.g. the
+    ``latest`` symlink): the payload echoes the requested id, so only the run's own name
+    gets an on-disk artifact.
+    """
+    run_dir = safe_run_dir(run_id, RUNS_DIR)
+    metrics_path = run_dir / "metrics.json"
+    if not metrics_path.exists():
+        raise FileNotFoundError("run not found")
+    if run_dir.name != run_id:
+        return None
+    inputs = [metrics_path, *trace_source_files(run_dir), COLREGS_CONFIG_PATH]
+    key = json.dumps([_file_stamp(p) for p in inputs])
+    out = run_dir / RUN_PAYLOAD_NAME
+    key_path = out.with_name(out.name + ".key")
+    try:
+        if out.exists() and key_path.read_text(encoding="utf-8") == key:
+            return out
+    except OSError:
+        pass
+    body = json.dumps(_load_run_payload(run_id), default=trace_json_default).encode("utf-8")
+    for path, data in ((out, body), (key_path, key.encode("utf-8"))):
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
     return out
 
 
+def _file_stamp(path: Path) -> Tuple[str, int, int]:
+    st = path.stat()
+    return (path.name, st.st_size, st.st_mtime_ns)
+
+
+def _enriched_cache_key(sources: List[Path]) -> str:
+    """sha256 over the trace source bytes and the COLREGS default config."""
+    digest = hashlib.sha256()
+    for path in [*sources, COLREGS_CONFIG_PATH]:
+        digest.update(path.name.encode("utf-8"))
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _enriched_traces(run_dir: Path) -> Dict[str, Any]:
+    """``enrich_trace_file`` output for a run, computed once per (traces, config) content.
+
+    Hot runs come from the LRU (keyed by file stats, so no hashing); otherwise the
+    run's ``eval_traces_colregs.json`` is served when its content key still matches,
+    and rebuilt when the traces or ``colregs/default_config.json`` changed.
+    """
+    sources = trace_source_files(run_dir)
+    if not sources:
+        return {"episodes": []}
+    stamp = (str(run_dir), *(_file_stamp(p) for p in [*sources, COLREGS_CONFIG_PATH]))
+    with _enriched_lock:
+        hit = _enriched_lru.get(stamp)
+        if hit is not None:
+            _enriched_lru.move_to_end(stamp)
+            return hit
+
+    key = _enriched_cache_key(sources)
+    cache_path = run_dir / ENRICHED_TRACES_NAME
+    traces: Optional[Dict[str, Any]] = None
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cached.get("cache_key") == key:
+            traces = cached["traces"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    if traces is None:
+        enriched = enrich_trace_file({"episodes": load_trace_episodes(run_dir)})
+        text = json.dumps(
+            {"cache_key": key, "traces": enriched},
+            separators=(",", ":"),
+            default=trace_json_default,
+        )
+        tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, cache_path)
+        except OSError:
+            tmp.unlink(missing_ok=True)  # read-only runs dir: still serve, just uncached
+        traces = json.loads(text)["traces"]
+
+    if ENRICHED_CACHE_SIZE:
+        with _enriched_lock:
+            _enriched_lru[stamp] = traces
+            _enriched_lru.move_to_end(stamp)
+            while len(_enriched_lru) > ENRICHED_CACHE_SIZE:
+                _enriched_lru.popitem(last=False)
+    return traces
+
+
+LIST_RUN_FIELDS = ("id", "mode", "score", "notes", "success_rate", "collision_rate")
+
+
+def list_runs(limit: int = 40, offset: int = 0, fields: Optional[List[str]] = None) -> dict:
+    """Newest-first page of runs from the run index (``limit`` 0 = all)."""
+    records, total = RI.query_runs(RUNS_DIR, limit=limit, offset=offset)
+    out = [
+        {
+            "id": rec["run_id"],
+            "mode": rec.get("mode", "?"),
+            "score": rec.get("score"),
+            "notes": rec.get("notes", ""),
+            "success_rate": rec.get("success_rate"),
+            "collision_rate": rec.get("collision_rate"),
+        }
+        for rec in records
+    ]
+    return {"runs": RI.project(out, fields), "total": total, "offset": offset}
+
+
+def _qs_value(qs: dict, name: str) -> Optional[str]:
+    values = qs.get(name)
+    return values[-1] if values else None
+
+
+def _parse_page(qs: dict, default_limit: int) -> Tuple[int, int]:
+    limit = parse_int(_qs_value(qs, "limit"), default_limit, name="limit", minimum=0)
+    offset = parse_int(_qs_value(qs, "offset"), 0, name="offset", minimum=0)
+    return limit, offset
+
+
 def load_scenario_catalog() -> List[dict]:
     if not EVAL_SEEDS_PATH.exists():
         return []
@@ -109,30 +227,143 @@ class Handler(BaseHTTPRequestHandler):
             return
         sys.stderr.write("%s - - [%s] %s\n" % (self.address_string(), self.log_date_time_string(), fmt % args))
 
-    def _send_json(self, payload: object, status: int = 200) -> None:
-        body = json.dumps(payload).encode("utf-8")
+    def _send_json(
+        self, payload: object, status: int = 200, *, cache_control: str = "no-store"
+    ) -> None:
+        body = json.dumps(payload, default=trace_json_default).encode("utf-8")
+        headers = {"Access-Control-Allow-Origin": "*", "Cache-Control": cache_control}
+        if status != 200:
+            self._send_body(status, "application/json", body, headers)
+            return
+        etag = HE.body_etag(body)
+        encoding = self._negotiate(len(body), "application/json", headers)
+        headers["ETag"] = HE.encoded_etag(etag, encoding)
+        if self._not_modified(headers):
+            return
+        if encoding:
+            body = HE.compress_memo(etag, body, encoding)
+            headers["Content-Encoding"] = encoding
+        self._send_body(200, "application/json", body, headers)
+
+    def _send_file(
+        self,
+        path: Path,
+        *,
+        cache_control: Optional[str] = None,
+        cors: bool = False,
+        precompress: bool = False,
+    ) -> None:
+        """File with a strong mtime/size ETag, gzip/br when accepted, or one byte ``Range``.
+
+        ``precompress`` keeps the encoded bodies on disk beside ``path`` (large run JSON);
+        otherwise they are memoized in-process.
+        """
+        try:
+            f = path.open("rb")
+        except OSError:
+            self.send_error(404, "Not found")
+            return
+        with f:
+            st = os.fstat(f.fileno())
+            if not stat.S_ISREG(st.st_mode):
+                self.send_error(404, "Not found")
+                return
+            ctype, _ = mimetypes.guess_type(str(path))
+            ctype = ctype or "application/octet-stream"
+            etag = HE.file_etag(st)
+            headers = {"Accept-Ranges": "bytes"}
+            if cache_control:
+                headers["Cache-Control"] = cache_control
+            if cors:
+                headers["Access-Control-Allow-Origin"] = "*"
+            range_header = self.headers.get("Range")
+            if_range = self.headers.get("If-Range")
+            if if_range is not None and if_range.strip() != etag:
+                range_header = None
+            encoding = None if range_header else self._negotiate(st.st_size, ctype, headers)
+            headers["ETag"] = HE.encoded_etag(etag, encoding)
+            if self._not_modified(headers):
+                return
+            if encoding:
+                if precompress:
+                    body = HE.precompressed(path, encoding).read_bytes()
+                else:
+                    body = HE.compress_memo(f"{path}:{etag}", f.read(), encoding)
+                headers["Content-Encoding"] = encoding
+                self._send_body(200, ctype, body, headers)
+                return
+            try:
+                byte_range = HE.parse_range(range_header, st.st_size)
+            except ValueError:
+                headers["Content-Range"] = f"bytes */{st.st_size}"
+                self._send_body(416, ctype, b"", headers)
+                return
+            if byte_range is None:
+                self._send_body(200, ctype, f.read(), headers)
+                return
+            start, end = byte_range
+            f.seek(start)
+            headers["Content-Range"] = f"bytes {start}-{end}/{st.st_size}"
+            self._send_body(206, ctype, f.read(end - start + 1), headers)
+
+    def _negotiate(self, size: int, ctype: str, headers: dict) -> Optional[str]:
+        if size < HE.COMPRESS_MIN_BYTES or not HE.is_compressible(ctype):
+            return None
+        headers["Vary"] = "Accept-Encoding"
+        return HE.negotiate_encoding(self.headers.get("Accept-Encoding"))
+
+    def _not_modified(self, headers: dict) -> bool:
+        if not HE.etag_matches(self.headers.get("If-None-Match"), headers["ETag"]):
+            return False
+        self.send_response(304)
+        for name, value in headers.items():
+            if name != "Accept-Ranges":
+                self.send_header(name, value)
+        self.end_headers()
+        return True
+
+    def _send_body(self, status: int, ctype: str, body: bytes, headers: dict) -> None:
         self.send_response(status)
-        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Type", ctype)
         self.send_header("Content-Length", str(len(body)))
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Cache-Control", "no-store")
+        for name, value in headers.items():
+            self.send_header(name, value)
         self.end_headers()
         self.wfile.write(body)
 
-    def _send_file(self, path: Path, *, cache_control: Optional[str] = None) -> None:
-        if not path.exists() or not path.is_file():
-            self.send_error(404, "Not found")
+    def _stream_train_status(self) -> None:
+        """SSE: events come pre-encoded from the shared watcher; no per-client disk reads."""
+        stream = train_stream()
+        q = stream.subscribe()
+        self.close_connection = True
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("X-Accel-Buffering", "no")
+            self.end_headers()
+            self.wfile.write(b"retry: 2000\n\n")
+            while True:
+                try:
+                    chunk = q.get(timeout=STREAM_KEEPALIVE_SEC)
+                except queue.Empty:
+                    chunk = b": keepalive\n\n"
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            stream.unsubscribe(q)
+
+    def _send_run_payload(self, run_id: str) -> None:
+        path = _run_payload_file(run_id)
+        if path is None:
+            self._send_json(_load_run_payload(run_id), cache_control="no-cache")
             return
-        ctype, _ = mimetypes.guess_type(str(path))
-        ctype = ctype or "application/octet-stream"
-        data = path.read_bytes()
-        self.send_response(200)
-        self.send_header("Content-Type", ctype)
-        self.send_header("Content-Length", str(len(data)))
-        if cache_control:
-            self.send_header("Cache-Control", cache_control)
-        self.end_headers()
-        self.wfile.write(data)
+        self._send_file(path, cache_control="no-cache", cors=True, precompress=True)
 
     def _read_json_body(self) -> dict:
         length = int(self.headers.get("Content-Length", 0))
@@ -256,10 +487,18 @@ class Handler(BaseHTTPRequestHandler):
                 return
             try:
                 run_id = EX.resolve_exercise_run_id(body.get("run_id"))
+                n_vessels = parse_int(
+                    body.get("n_vessels"),
+                    len(EX.DEFAULT_STARTS),
+                    name="n_vessels",
+                    minimum=1,
+                    maximum=EX.EXERCISE_MAX_VESSELS,
+                )
                 payload = EX.init_session(
                     run_id,
                     goal_hold_sec=body.get("goal_hold_sec"),
                     current_enabled=body.get("current_enabled"),
+                    n_vessels=n_vessels,
                 )
                 self._send_json({"ok": True, **payload})
             except (InvalidRunIdError, ApiParseError) as exc:
@@ -374,6 +613,7 @@ class Handler(BaseHTTPRequestHandler):
                         "/api/curriculum/presets",
                         "/api/history",
                         "/api/train/status",
+                        "/api/train/stream",
                         "/api/train (POST)",
                         "/api/train/cancel (POST)",
                         "/api/colregs/frames (POST)",
@@ -412,7 +652,17 @@ class Handler(BaseHTTPRequestHandler):
             return
 
         if path == "/api/history":
-            self._send_json(TJ.training_history())
+            try:
+                limit, offset = _parse_page(qs, 200)
+                fields = parse_fields(_qs_value(qs, "fields"), RI.RUN_FIELDS)
+            except ApiParseError as exc:
+                self._send_json({"ok": False, "error": str(exc)}, status=400)
+                return
+            self._send_json(TJ.training_history(limit, offset, fields))
+            return
+
+        if path == "/api/train/stream":
+            self._stream_train_status()
             return
 
         if path == "/api/train/status":
@@ -446,7 +696,13 @@ class Handler(BaseHTTPRequestHandler):
             return
 
         if path == "/api/runs":
-            self._send_json({"runs": list_runs(), "latest": latest_run_id(RUNS_DIR)})
+            try:
+                limit, offset = _parse_page(qs, 40)
+                fields = parse_fields(_qs_value(qs, "fields"), LIST_RUN_FIELDS)
+            except ApiParseError as exc:
+                self._send_json({"ok": False, "error": str(exc)}, status=400)
+                return
+            self._send_json({**list_runs(limit, offset, fields), "latest": latest_run_id(RUNS_DIR)})
             return
 
         if path == "/api/latest":
@@ -455,7 +711,7 @@ class Handler(BaseHTTPRequestHandler):
                 self._send_json({"error": "no runs yet"}, status=404)
                 return
             try:
-                self._send_json(_load_run_payload(run_id))
+                self._send_run_payload(run_id)
             except FileNotFoundError:
                 self._send_json({"error": "run not found"}, status=404)
             return
@@ -466,7 +722,7 @@ class Handler(BaseHTTPRequestHandler):
                 run_id = parts[2]
                 try:
                     validate_run_id(run_id)
-                    self._send_json(_load_run_payload(run_id))
+                    self._send_run_payload(run_id)
                 except InvalidRunIdError:
                     self._send_json({"error": "invalid run id"}, status=400)
                 except FileNotFoundError:
@@ -483,7 +739,7 @@ class Handler(BaseHTTPRequestHandler):
                     self._send_json({"error": "invalid run id"}, status=400)
                     return
                 fname = "eval_step_montage.png" if parts[3] == "step_montage.png" else "eval_trajectory_montage.png"
-                self._send_file(run_dir / fname, cache_control="no-store")
+                self._send_file(run_dir / fname, cache_control="no-cache")
                 return
 
         # Static viz files
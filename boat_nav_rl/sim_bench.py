@@ -0,0 +1,335 @@
+"""Rollout throughput benchmark suite: backends × n_envs × modes × contact counts.
+
+Every case drives a VecEnv with random actions and records env-steps/s, p50/p99 step
+latency and resident memory (``rss_total_mb`` adds subprocess workers' PSS). Reports are
+JSON under ``runs/_bench/`` so runs from different commits can be diffed
+(``compare_bench``) and ``ENVS_PER_CORE`` picked from data.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+import prepare as P
+from vecenv_util import MAX_N_ENVS, cpu_count
+
+BENCH_DIR = P.RUNS_DIR / "_bench"
+BENCH_SCHEMA_VERSION = 1
+ALL_BACKENDS = ("dummy", "subproc", "torch-cpu", "torch-cuda", "cpu-batched")
+DEFAULT_N_ENVS = (1, 8, 64, 512)
+DEFAULT_MODES = ("navigate", "avoid")
+DEFAULT_CONTACTS = (1, 4, 8)
+# Per-process backends stop scaling (and start thrashing) well before the batched sims.
+PROCESS_BACKENDS = ("dummy", "subproc")
+_ACTION_POOL = 64
+
+
+@dataclass
+class BenchCase:
+    backend: str
+    n_envs: int
+    mode: str
+    max_contacts: Optional[int]
+
+
+def _cuda_available() -> bool:
+    try:
+        import torch
+
+        return bool(torch.cuda.is_available())
+    except ImportError:
+        return False
+
+
+def available_backends() -> List[str]:
+    return [b for b in ALL_BACKENDS if b != "torch-cuda" or _cuda_available()]
+
+
+def bench_cases(
+    backends: Sequence[str],
+    n_envs: Sequence[int],
+    modes: Sequence[str],
+    contacts: Sequence[int],
+) -> List[BenchCase]:
+    """Cartesian sweep; navigate has no traffic so it gets one case per (backend, n_envs)."""
+    cases: List[BenchCase] = []
+    for mode in modes:
+        for backend in backends:
+            for n in n_envs:
+                if backend in PROCESS_BACKENDS and n > MAX_N_ENVS:
+                    continue
+                if backend == "subproc" and n < 2:
+                    continue  # make_vec_env runs a single env in-process (dummy)
+                counts: Iterable[Optional[int]] = contacts if mode != "navigate" else (None,)
+                for k in counts:
+                    cases.append(BenchCase(backend, int(n), mode, k))
+    return cases
+
+
+def _make_case_env(case: BenchCase) -> Any:
+    from env import BoatNavEnv
+    from vecenv_util import make_vec_env
+
+    # Random-spawn resets (no curated seeds) so every backend sees the same traffic law.
+    max_contacts = case.max_contacts or 1
+    if case.backend in PROCESS_BACKENDS:
+
+        def factory(i: int):
+            def _init():
+                env = BoatNavEnv(
+                    mode=case.mode,
+                    training_randomize=True,
+                    goal_hold_sec=P.DEFAULT_GOAL_HOLD_SEC,
+                    current_enabled=True,
+                    train_max_contacts=max_contacts,
+                )
+                env.reset(seed=i)
+                return env
+
+            return _init
+
+        factories = [factory(i) for i in range(case.n_envs)]
+        return make_vec_env(factories, case.n_envs, case.backend)
+    if case.backend == "cpu-batched":
+        backend, device = "cpu-batched", None
+    else:
+        backend, device = "gpu", case.backend.split("-", 1)[1]
+    return make_vec_env(
+        [],
+        case.n_envs,
+        backend,
+        mode=case.mode,
+        device=device,
+        goal_hold_sec=P.DEFAULT_GOAL_HOLD_SEC,
+        current_enabled=True,
+        train_max_contacts=max_contacts,
+    )
+
+
+def _rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """Current resident set size from /proc; falls back to peak RSS of this process."""
+    statm = Path(f"/proc/{pid or 'self'}/statm")
+    try:
+        pages = int(statm.read_text().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if pid is not None:
+        return None
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+    except ImportError:
+        return None
+
+
+def _worker_mb(pid: int) -> Optional[float]:
+    """Proportional set size of a forked worker (shared COW pages split, not re-counted)."""
+    try:
+        for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+            if line.startswith("Pss:"):
+                return round(int(line.split()[1]) / 2**10, 1)
+    except (OSError, ValueError, IndexError):
+        pass
+    return _rss_mb(pid)
+
+
+def _worker_pids(env: Any) -> List[int]:
+    return [p.pid for p in getattr(env, "processes", []) if p.pid is not None]
+
+
+def bench_vec_env(
+    env: Any,
+    n_envs: int,
+    *,
+    steps: int,
+    warmup: int = 10,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Step ``env`` with random actions; timing excludes ``warmup`` steps."""
+    rng = np.random.default_rng(seed)
+    pool = rng.uniform(-1.0, 1.0, size=(_ACTION_POOL, n_envs, 2)).astype(np.float32)
+    env.reset()
+    for i in range(warmup):
+        env.step_async(pool[i % _ACTION_POOL])
+        env.step_wait()
+    step_times = np.empty(steps)
+    t0 = time.perf_counter()
+    for i in range(steps):
+        t_step = time.perf_counter()
+        env.step_async(pool[i % _ACTION_POOL])
+        env.step_wait()
+        step_times[i] = time.perf_counter() - t_step
+    elapsed = time.perf_counter() - t0
+    rss = _rss_mb()
+    worker_mb = [_worker_mb(pid) for pid in _worker_pids(env)]
+    step_ms = step_times * 1e3
+    return {
+        "steps": steps,
+        "env_steps_per_sec": round(n_envs * steps / max(elapsed, 1e-9), 1),
+        "step_ms_p50": round(float(np.percentile(step_ms, 50)), 4),
+        "step_ms_p99": round(float(np.percentile(step_ms, 99)), 4),
+        "step_ms_mean": round(float(step_ms.mean()), 4),
+        "rss_mb": rss,
+        "rss_total_mb": (
+            round(rss + sum(m for m in worker_mb if m is not None), 1)
+            if rss is not None
+            else None
+        ),
+    }
+
+
+def run_case(case: BenchCase, *, steps: int, warmup: int, seed: int = 0) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    env = _make_case_env(case)
+    build_sec = time.perf_counter() - t0
+    try:
+        stats = bench_vec_env(env, case.n_envs, steps=steps, warmup=warmup, seed=seed)
+    finally:
+        env.close()
+    return {
+        **asdict(case),
+        "envs_per_core": round(case.n_envs / cpu_count(), 3),
+        "build_sec": round(build_sec, 3),
+        **stats,
+    }
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=str(P.ROOT),
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _host_info() -> Dict[str, Any]:
+    info: Dict[str, Any] = {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": cpu_count(),
+        "numpy": np.__version__,
+    }
+    try:
+        import torch
+
+        info["torch"] = torch.__version__
+        info["torch_threads"] = torch.get_num_threads()
+        if torch.cuda.is_available():
+            info["cuda_device"] = torch.cuda.get_device_name(0)
+    except ImportError:
+        pass
+    return info
+
+
+def run_bench_suite(
+    *,
+    backends: Optional[Sequence[str]] = None,
+    n_envs: Sequence[int] = DEFAULT_N_ENVS,
+    modes: Sequence[str] = DEFAULT_MODES,
+    contacts: Sequence[int] = DEFAULT_CONTACTS,
+    steps: int = 200,
+    warmup: int = 10,
+    seed: int = 0,
+    log: Optional[Any] = print,
+) -> Dict[str, Any]:
+    chosen = list(backends) if backends else available_backends()
+    unknown = sorted(set(chosen) - set(ALL_BACKENDS))
+    if unknown:
+        raise ValueError(f"unknown bench backends {unknown} (expected {list(ALL_BACKENDS)})")
+    if "torch-cuda" in chosen and not _cuda_available():
+        chosen.remove("torch-cuda")
+    cases = bench_cases(chosen, n_envs, modes, contacts)
+    results: List[Dict[str, Any]] = []
+    for i, case in enumerate(cases, 1):
+        row = run_case(case, steps=steps, warmup=warmup, seed=seed)
+        results.append(row)
+        if log is not None:
+            k = "-" if case.max_contacts is None else case.max_contacts
+            log(
+                f"[{i}/{len(cases)}] {case.backend:<11} n={case.n_envs:<5} {case.mode:<8} k={k:<2} "
+                f"{row['env_steps_per_sec']:>12,.0f} env-steps/s  "
+                f"p50 {row['step_ms_p50']:.3f} ms  p99 {row['step_ms_p99']:.3f} ms  "
+                f"rss {row['rss_total_mb']} MB"
+            )
+    return {
+        "schema_version": BENCH_SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_rev": _git_rev(),
+        "host": _host_info(),
+        "config": {
+            "backends": chosen,
+            "n_envs": list(n_envs),
+            "modes": list(modes),
+            "contacts": list(contacts),
+            "steps": steps,
+            "warmup": warmup,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def write_bench_report(report: Dict[str, Any], out_dir: Optional[Path] = None) -> Path:
+    """Write ``bench_<utc stamp>_<rev>.json`` and refresh ``latest.json``."""
+    root = out_dir or BENCH_DIR
+    root.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    rev = report.get("git_rev")
+    path = root / (f"bench_{stamp}_{rev}.json" if rev else f"bench_{stamp}.json")
+    text = json.dumps(report, indent=2)
+    path.write_text(text, encoding="utf-8")
+    (root / "latest.json").write_text(text, encoding="utf-8")
+    return path
+
+
+def _case_key(row: Dict[str, Any]) -> tuple:
+    return (row["backend"], row["n_envs"], row["mode"], row.get("max_contacts"))
+
+
+def compare_bench(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    *,
+    tolerance: float = 0.1,
+) -> List[Dict[str, Any]]:
+    """Cases present in both reports whose env-steps/s fell by more than ``tolerance``."""
+    base = {_case_key(r): r for r in baseline.get("results", [])}
+    regressions: List[Dict[str, Any]] = []
+    for row in current.get("results", []):
+        ref = base.get(_case_key(row))
+        if ref is None or not ref.get("env_steps_per_sec"):
+            continue
+        ratio = row["env_steps_per_sec"] / ref["env_steps_per_sec"]
+        if ratio < 1.0 - tolerance:
+            regressions.append(
+                {
+                    "backend": row["backend"],
+                    "n_envs": row["n_envs"],
+                    "mode": row["mode"],
+                    "max_contacts": row.get("max_contacts"),
+                    "baseline_env_steps_per_sec": ref["env_steps_per_sec"],
+                    "env_steps_per_sec": row["env_steps_per_sec"],
+                    "ratio": round(ratio, 3),
+                }
+            )
+    return regressions
@@ -0,0 +1,770 @@
+"""Backend-neutral half of the batched sims (``sim_torch`` / ``sim_numpy``).
+
+Constants, ``BatchedBoatSimConfig``, the scenario table (packed once in NumPy; the torch
+sim copies it to its device) and ``BatchedSimBase``: state layout, resets (train seeds,
+stretch goals, spawned traffic, plant jitter, current), mission legs, CPU-env sync and
+obs packing, written once against the backend's array module ``xp``. Per-step physics
+and rewards stay in each backend: the NumPy sim runs them in place on preallocated arrays.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from gymnasium import spaces
+
+import prepare as P
+from mission import scenario_waypoint_events
+from rewards import RewardConfig, get_reward_config
+
+PI = math.pi
+K_MAX = P.N_MAX_CONTACTS
+TRAIN_K_MAX = 4
+VESSEL_CLASS_RADII = tuple(P.VESSEL_CLASSES.values())
+
+# WaypointEvent.trigger codes for the mission table (unknown triggers never fire, as on CPU).
+TRIGGER_START = 0
+TRIGGER_DELAY_SEC = 1
+TRIGGER_PROGRESS_FRAC = 2
+TRIGGER_HOLD_COMPLETE = 3
+TRIGGER_CODES = {
+    "start": TRIGGER_START,
+    "delay_sec": TRIGGER_DELAY_SEC,
+    "progress_frac": TRIGGER_PROGRESS_FRAC,
+    "hold_complete": TRIGGER_HOLD_COMPLETE,
+}
+
+
+class FinishedEpisodes(NamedTuple):
+    """Rows that ended on the last auto-reset ``step()``, captured before the reset.
+
+    Fields are arrays of the sim's backend (tensors for ``BatchedBoatSim``).
+    """
+
+    index: Any
+    terminal_obs: Any
+    ep_return: Any
+    ep_length: Any
+    success: Any
+    collision: Any
+    truncated: Any
+
+
+@dataclass
+class BatchedBoatSimConfig:
+    mode: str = "navigate"
+    n_envs: int = 256
+    max_episode_steps: int = P.MAX_STEPS
+    goal_hold_sec: int = P.DEFAULT_GOAL_HOLD_SEC
+    current_enabled: bool = False
+    own_radius_m: float = P.OWN_RADIUS_M
+    contact_obs_noise_m: float = 0.0
+    contact_obs_noise_bearing_rad: float = 0.0
+    nominal_plant: Optional[P.PlantParams] = None
+    dynamics_jitter: bool = False
+    reward_config: Optional[RewardConfig] = None
+    auto_reset: bool = True
+    # Wrap the per-step core in torch.compile (first steps pay compile latency).
+    compile_step: bool = False
+    # Curated train split (``scenario_seeds.train_seeds_for_mode``); None = random spawn.
+    train_seeds: Optional[Sequence[P.ScenarioSeed]] = None
+    train_max_contacts: int = TRAIN_K_MAX
+    # Replay seed waypoint_events as NavigationMission legs (eval). BoatNavEnv training
+    # resets use single-goal missions, so this stays off for training parity.
+    scenario_missions: bool = False
+    # Keep per-term (value, fired) reward arrays in ``sim.reward_terms`` (eval breakdown).
+    reward_breakdown: bool = False
+
+
+@dataclass
+class ScenarioTable:
+    """Train seeds packed into float32 / int64 / bool host arrays, one row per seed."""
+
+    own: np.ndarray  # (6, s): x, y, heading, speed, goal_x, goal_y
+    stretch_ok: np.ndarray  # (s,)
+    contacts: np.ndarray  # (5, s, K_MAX): x, y, cog, sog, radius
+    contact_active: np.ndarray  # (s, K_MAX)
+    legs: np.ndarray  # (s,)
+    event_xy: np.ndarray  # (2, s, n_legs)
+    event_kind: np.ndarray  # (s, n_legs)
+    event_lo: np.ndarray  # (s, n_legs)
+    event_hi: np.ndarray  # (s, n_legs)
+
+    @property
+    def n_legs(self) -> int:
+        return int(self.event_kind.shape[1])
+
+
+def event_trigger_bounds(ev: Any) -> Tuple[float, float]:
+    """(lo, hi) draw range of a waypoint event's trigger; same defaults as ``_build_pending``."""
+    if ev.trigger == "delay_sec":
+        lo = ev.delay_sec_min if ev.delay_sec_min is not None else 5.0
+        hi = ev.delay_sec_max if ev.delay_sec_max is not None else lo
+    elif ev.trigger == "progress_frac":
+        lo = ev.progress_frac_min if ev.progress_frac_min is not None else 0.4
+        hi = ev.progress_frac_max if ev.progress_frac_max is not None else 0.7
+    else:
+        lo = hi = 0.0
+    return min(lo, hi), max(lo, hi)
+
+
+def build_scenario_table(seeds: Sequence[P.ScenarioSeed], scenario_missions: bool) -> ScenarioTable:
+    s = len(seeds)
+    events = [scenario_waypoint_events(seed) if scenario_missions else [] for seed in seeds]
+    n_legs = max([1] + [len(ev) for ev in events])
+    table = ScenarioTable(
+        own=np.zeros((6, s), dtype=np.float32),
+        stretch_ok=np.zeros(s, dtype=bool),
+        contacts=np.zeros((5, s, K_MAX), dtype=np.float32),
+        contact_active=np.zeros((s, K_MAX), dtype=bool),
+        legs=np.ones(s, dtype=np.int64),
+        event_xy=np.zeros((2, s, n_legs), dtype=np.float32),
+        event_kind=np.zeros((s, n_legs), dtype=np.int64),
+        event_lo=np.zeros((s, n_legs), dtype=np.float32),
+        event_hi=np.zeros((s, n_legs), dtype=np.float32),
+    )
+    for i, seed in enumerate(seeds):
+        table.own[:, i] = (
+            seed.own_x_m,
+            seed.own_y_m,
+            math.radians(seed.own_heading_deg),
+            seed.own_speed_mps,
+            seed.goal_x_m,
+            seed.goal_y_m,
+        )
+        table.stretch_ok[i] = not seed.waypoint_events and seed.goal_relocate_x_m is None
+        for slot, c in enumerate(P.scenario_to_contacts(seed)[:K_MAX]):
+            table.contacts[:, i, slot] = (c.x_m, c.y_m, c.cog_rad, c.sog_mps, c.radius_m)
+            table.contact_active[i, slot] = True
+        for leg, ev in enumerate(events[i]):
+            table.legs[i] = len(events[i])
+            table.event_xy[:, i, leg] = (ev.goal_x_m, ev.goal_y_m)
+            table.event_kind[i, leg] = TRIGGER_CODES.get(ev.trigger, -1)
+            table.event_lo[i, leg], table.event_hi[i, leg] = event_trigger_bounds(ev)
+    return table
+
+
+def training_goal_distance_bounds(
+    max_episode_steps: int, goal_hold_sec: int
+) -> Tuple[float, float, float]:
+    """(near_hi, stretch_lo, stretch_hi) for random-spawn goals from the world origin."""
+    reachable = P.estimate_reachable_goal_range_m(max_episode_steps, goal_hold_sec=goal_hold_sec)
+    world_max = P.max_goal_distance_from_xy(0.0, 0.0)
+    arrival_horizon = min(reachable, world_max)
+    near_hi = min(P.TRAIN_GOAL_DIST_NEAR_MAX_M, arrival_horizon * 0.95)
+    near_hi = max(near_hi, P.TRAIN_GOAL_DIST_MIN_M + 1.0)
+    if world_max > reachable * P.STRETCH_GOAL_REACH_MULT_MIN:
+        stretch_lo = max(P.TRAIN_GOAL_DIST_NEAR_MAX_M, reachable * P.STRETCH_GOAL_REACH_MULT_MIN)
+        stretch_hi = min(reachable * P.STRETCH_GOAL_REACH_MULT_MAX, world_max)
+    else:
+        stretch_lo = max(P.TRAIN_GOAL_DIST_NEAR_MAX_M, world_max * 0.82)
+        stretch_hi = world_max
+    return near_hi, stretch_lo, stretch_hi
+
+
+def wrap_angle(xp: Any, rad: Any) -> Any:
+    """Angle wrap to ``[-pi, pi]`` for arrays of either backend (``xp`` = numpy or torch)."""
+    return xp.arctan2(xp.sin(rad), xp.cos(rad))
+
+
+def _identity(a: Any) -> Any:
+    return a
+
+
+class BatchedSimBase:
+    """State, resets, missions and obs packing shared by the NumPy and torch sims.
+
+    Subclasses set ``xp`` (``numpy`` or ``torch``) and supply allocation (``_z``,
+    ``_false``, ``_zeros_long``, ``_full``, ``_asarray``), RNG draws (``_seed``, ``_rand``,
+    ``_uniform``, ``_randint``, ``_randn``) and the few ops spelled differently per backend
+    (``_at_head``, ``_take_rows``, ``_put_rows``, ``_advance_leg``, ``_pack_contacts``).
+    """
+
+    xp: Any
+
+    def _init_config(self, cfg: BatchedBoatSimConfig) -> None:
+        self.cfg = cfg
+        self.mode = cfg.mode if cfg.mode != "all" else "avoid"
+        self.n = int(cfg.n_envs)
+        self.reward_cfg = cfg.reward_config or get_reward_config()
+        self.goal_hold_required = max(1, int(cfg.goal_hold_sec)) if cfg.goal_hold_sec > 0 else 1
+        self.goal_hold_sec = max(0, int(cfg.goal_hold_sec))
+        self.max_steps = max(1, int(cfg.max_episode_steps)) + self.goal_hold_sec
+        self.train_max_contacts = max(1, min(int(cfg.train_max_contacts), K_MAX))
+        self.nominal_plant = cfg.nominal_plant or P.plant_from_dict(P.PLANT_NOMINAL)
+        self.obs_noise_m = max(0.0, float(cfg.contact_obs_noise_m))
+        self.obs_noise_bearing_rad = max(0.0, float(cfg.contact_obs_noise_bearing_rad))
+        self.observation_space = spaces.Box(
+            low=-np.inf, high=np.inf, shape=(P.OBS_DIM,), dtype=np.float32
+        )
+        self.action_space = spaces.Box(low=-1.0, high=1.0, shape=(2,), dtype=np.float32)
+
+    # -- backend hooks ------------------------------------------------------------------
+
+    def _z(self, *shape: int) -> Any:
+        raise NotImplementedError
+
+    def _false(self, *shape: int) -> Any:
+        raise NotImplementedError
+
+    def _zeros_long(self, *shape: int) -> Any:
+        raise NotImplementedError
+
+    def _full(self, shape: Tuple[int, ...], value: float) -> Any:
+        raise NotImplementedError
+
+    def _asarray(self, values: Any) -> Any:
+        """Host array / sequence as a backend array (float32 for float input)."""
+        raise NotImplementedError
+
+    def _seed(self, seed: int) -> None:
+        raise NotImplementedError
+
+    def _rand(self, shape: Tuple[int, ...], lo: float, hi: float) -> Any:
+        """float32 uniform draws on ``[lo, hi)``."""
+        raise NotImplementedError
+
+    def _uniform(self, shape: Tuple[int, ...]) -> Any:
+        """Uniform ``[0, 1)`` draws compared against thresholds (precision is the backend's)."""
+        raise NotImplementedError
+
+    def _randint(self, lo: int, hi: int, shape: Tuple[int, ...]) -> Any:
+        raise NotImplementedError
+
+    def _randn(self, shape: Tuple[int, ...]) -> Any:
+        raise NotImplementedError
+
+    def _at_head(self, table: Any, head: Any) -> Any:
+        """``table[row, head[row]]`` for every row."""
+        raise NotImplementedError
+
+    def _take_rows(self, rows: Any) -> Callable[[Any], Any]:
+        raise NotImplementedError
+
+    def _put_rows(self, obs: Any, rows: Any, out: Any) -> None:
+        raise NotImplementedError
+
+    def _advance_leg(self, mask: Any, head: Any) -> None:
+        raise NotImplementedError
+
+    def _pack_contacts(
+        self, out: Any, feats: Sequence[Any], active: Any, dist: Any, rows: Optional[Any]
+    ) -> None:
+        """Write range-sorted contact features and the active mask into ``out``."""
+        raise NotImplementedError
+
+    # -- state --------------------------------------------------------------------------
+
+    def _init_state(self) -> None:
+        n = self.n
+        self.x = self._z(n)
+        self.y = self._z(n)
+        self.heading = self._z(n)
+        self.speed = self._z(n)
+        self.yaw_rate = self._z(n)
+        self.cmd_heading = self._z(n)
+        self.cmd_speed = self._z(n)
+        self.origin_x = self._z(n)
+        self.origin_y = self._z(n)
+        self.goal_x = self._z(n)
+        self.goal_y = self._z(n)
+        self.leg_start_x = self._z(n)
+        self.leg_start_y = self._z(n)
+        self.prev_goal_range = self._z(n)
+        self.initial_goal_range = self._z(n)
+        self.goal_hold_steps = self._z(n)
+        self.step_count = self._z(n)
+        self.max_steps_env = self._full((n,), float(self.max_steps))
+        self.prev_action = self._z(n, 2)
+        # Episode bookkeeping: running return, last-step outcome, per-env totals.
+        self.ep_return = self._z(n)
+        self.success = self._false(n)
+        self.collision = self._false(n)
+        self.episode_count = self._zeros_long(n)
+        self.success_count = self._zeros_long(n)
+        self.collision_count = self._zeros_long(n)
+        self.finished: Optional[FinishedEpisodes] = None
+        # Last step's goal range / CPA-unsafe flag and (opt-in) named reward terms.
+        self.goal_range = self._z(n)
+        self.cpa_unsafe = self._z(n)
+        self.reward_terms: Optional[Dict[str, Tuple[Any, Any]]] = None
+        self.tau_h = self._full((n,), self.nominal_plant.tau_heading_s)
+        self.tau_s = self._full((n,), self.nominal_plant.tau_speed_s)
+        self.max_yaw = self._full((n,), self.nominal_plant.max_yaw_rate_rps)
+        self.cur_speed = self._z(n)
+        self.cur_sin = self._z(n)
+        self.cur_cos = self._full((n,), 1.0)
+        self.c_x = self._z(n, K_MAX)
+        self.c_y = self._z(n, K_MAX)
+        self.c_cog = self._z(n, K_MAX)
+        self.c_sog = self._z(n, K_MAX)
+        self.c_radius = self._z(n, K_MAX)
+        self.c_vx = self._z(n, K_MAX)
+        self.c_vy = self._z(n, K_MAX)
+        self.c_active = self._false(n, K_MAX)
+        self._zeros_n = self._z(n)
+        self._false_n = self._false(n)
+        self._class_radii = self._asarray(VESSEL_CLASS_RADII)
+        self._obs_bufs = (self._z(n, P.OBS_DIM), self._z(n, P.OBS_DIM))
+        for buf in self._obs_bufs:
+            buf[:, P.OBS_HAS_GOAL_OFFSET] = 1.0
+        self._obs_slot = 0
+        # Static (per-config) switch so step() never branches on array contents.
+        self._has_contacts = self.mode in ("avoid", "all")
+        self._init_mission_state(1)
+
+    def _init_mission_state(self, n_legs: int) -> None:
+        """Per-env waypoint queue; leg 0 is the current goal at reset."""
+        n = self.n
+        self.n_legs_max = max(1, int(n_legs))
+        self.m_x = self._z(n, self.n_legs_max)
+        self.m_y = self._z(n, self.n_legs_max)
+        self.m_kind = self._zeros_long(n, self.n_legs_max)
+        self.m_fire_step = self._full((n, self.n_legs_max), math.inf)
+        self.m_progress = self._full((n, self.n_legs_max), math.inf)
+        self.m_leg = self._zeros_long(n)
+        self.m_legs = self._zeros_long(n) + 1
+        self._missions_active = False
+
+    def _load_scenario_table(self, seeds: Sequence[P.ScenarioSeed]) -> None:
+        """Pack train seeds once; resets then index rows of the backend arrays."""
+        self.n_scenarios = len(seeds)
+        if not seeds:
+            return
+        table = build_scenario_table(seeds, self.cfg.scenario_missions)
+        own = self._asarray(table.own)
+        self.sc_x, self.sc_y, self.sc_heading, self.sc_speed, self.sc_goal_x, self.sc_goal_y = own
+        self.sc_stretch_ok = self._asarray(table.stretch_ok)
+        contacts = self._asarray(table.contacts)
+        self.sc_c_x, self.sc_c_y, self.sc_c_cog, self.sc_c_sog, self.sc_c_radius = contacts
+        self.sc_c_active = self._asarray(table.contact_active)
+        self._has_contacts = self._has_contacts or bool(table.contact_active.any())
+        self.sc_legs = self._asarray(table.legs)
+        self.sc_ev_x, self.sc_ev_y = self._asarray(table.event_xy)
+        self.sc_ev_kind = self._asarray(table.event_kind)
+        self.sc_ev_lo = self._asarray(table.event_lo)
+        self.sc_ev_hi = self._asarray(table.event_hi)
+        self._init_mission_state(table.n_legs)
+        self._missions_active = table.n_legs > 1
+
+    # -- resets -------------------------------------------------------------------------
+
+    def _sample_training_goal_distances(self, m: int) -> Any:
+        near_hi, stretch_lo, stretch_hi = training_goal_distance_bounds(
+            self.cfg.max_episode_steps, self.cfg.goal_hold_sec
+        )
+        if stretch_lo >= stretch_hi:
+            stretch_dist = self._full((m,), stretch_hi)
+        else:
+            stretch_dist = self._rand((m,), stretch_lo, stretch_hi)
+        near_dist = self._rand((m,), P.TRAIN_GOAL_DIST_MIN_M, near_hi)
+        stretch = self._uniform((m,)) < P.STRETCH_GOAL_PROB
+        return self.xp.where(stretch, stretch_dist, near_dist)
+
+    def _sample_stretch_goal_xy(self, own_x: Any, own_y: Any) -> Tuple[Any, Any]:
+        """Vectorized ``P.sample_training_goal_xy(force_stretch=True)`` (single draw, clipped)."""
+        xp = self.xp
+        m = len(own_x)
+        margin = P.TRAIN_GOAL_WORLD_MARGIN_M
+        b = P.WORLD_BOUNDS
+        far_x = xp.maximum(own_x - (b["min_x"] + margin), (b["max_x"] - margin) - own_x)
+        far_y = xp.maximum(own_y - (b["min_y"] + margin), (b["max_y"] - margin) - own_y)
+        world_max = xp.hypot(far_x, far_y)
+        reachable = P.estimate_reachable_goal_range_m(
+            self.cfg.max_episode_steps,
+            goal_hold_sec=self.cfg.goal_hold_sec,
+        )
+        beyond = world_max > reachable * P.STRETCH_GOAL_REACH_MULT_MIN
+        lo = xp.clip(
+            xp.where(beyond, reachable * P.STRETCH_GOAL_REACH_MULT_MIN, world_max * 0.82),
+            P.TRAIN_GOAL_DIST_NEAR_MAX_M,
+            None,
+        )
+        hi = xp.where(
+            beyond,
+            xp.clip(world_max, None, reachable * P.STRETCH_GOAL_REACH_MULT_MAX),
+            world_max,
+        )
+        u = self._rand((m,), 0.0, 1.0)
+        dist = xp.where(lo >= hi, hi, lo + u * (hi - lo))
+        ang = self._rand((m,), -PI, PI)
+        gx = xp.clip(own_x + dist * xp.sin(ang), b["min_x"] + margin, b["max_x"] - margin)
+        gy = xp.clip(own_y + dist * xp.cos(ang), b["min_y"] + margin, b["max_y"] - margin)
+        return gx, gy
+
+    def _spawn_random_contacts(self, own_x: Any, own_y: Any) -> Tuple[Any, ...]:
+        """One candidate contact per slot, mirroring ``BoatNavEnv._spawn_random_contact``."""
+        xp = self.xp
+        shape = (len(own_x), K_MAX)
+        brg = xp.deg2rad(self._rand(shape, -90.0, 90.0))
+        rng_m = self._rand(shape, 350.0, 900.0)
+        cog = xp.deg2rad(self._rand(shape, 0.0, 360.0))
+        sog = self._rand(shape, 0.0, 5.5)
+        radius = self._class_radii[self._randint(0, len(VESSEL_CLASS_RADII), shape)]
+        cx = own_x[:, None] + rng_m * xp.sin(brg)
+        cy = own_y[:, None] + rng_m * xp.cos(brg)
+        return cx, cy, cog, sog, radius
+
+    def _apply_train_contact_count(
+        self, own_x: Any, own_y: Any, contacts: Tuple[Any, ...], active: Any
+    ) -> Tuple[Tuple[Any, ...], Any]:
+        """Keep a random subset / top up with spawned traffic to Uniform{1..train_max_contacts}."""
+        xp = self.xp
+        m = len(own_x)
+        target = self._randint(1, self.train_max_contacts + 1, (m, 1))
+        keys = xp.where(active, self._uniform((m, K_MAX)), 2.0)
+        rank = xp.argsort(xp.argsort(keys, axis=1), axis=1)
+        keep = active & (rank < target)
+        need = target - keep.sum(axis=1, keepdims=True)
+        free = ~keep
+        free_rank = xp.cumsum(free, axis=1) - 1
+        spawn = free & (free_rank < need)
+        spawned = self._spawn_random_contacts(own_x, own_y)
+        merged = tuple(xp.where(spawn, new, old) for new, old in zip(spawned, contacts))
+        return merged, keep | spawn
+
+    def _reset_missions(self, idx: Any, row: Optional[Any], goal_x: Any, goal_y: Any) -> None:
+        """Load waypoint queues and sample delay / progress triggers per reset."""
+        xp = self.xp
+        self.m_leg[idx] = 0
+        if row is None or not self._missions_active:
+            self.m_legs[idx] = 1
+            self.m_x[idx, 0] = goal_x
+            self.m_y[idx, 0] = goal_y
+            self.max_steps_env[idx] = float(self.max_steps)
+            return
+        legs = self.sc_legs[row]
+        kind = self.sc_ev_kind[row]
+        lo = self.sc_ev_lo[row]
+        hi = self.sc_ev_hi[row]
+        draw = lo + self._rand((len(idx), self.n_legs_max), 0.0, 1.0) * (hi - lo)
+        fire = xp.clip(xp.round(draw / P.DT_S), 1.0, None)
+        self.m_legs[idx] = legs
+        self.m_x[idx] = self.sc_ev_x[row]
+        self.m_y[idx] = self.sc_ev_y[row]
+        self.m_x[idx, 0] = goal_x
+        self.m_y[idx, 0] = goal_y
+        self.m_kind[idx] = kind
+        self.m_fire_step[idx] = xp.where(kind == TRIGGER_DELAY_SEC, fire, math.inf)
+        self.m_progress[idx] = xp.where(kind == TRIGGER_PROGRESS_FRAC, draw, math.inf)
+        # NavigationMission.extra_max_steps
+        extra = xp.clip(legs - 1, 0, None) * float(self.goal_hold_sec + 120)
+        self.max_steps_env[idx] = float(self.max_steps) + extra
+
+    def _reset_indices(self, idx: Any) -> None:
+        m = len(idx)
+        if m == 0:
+            return
+        xp = self.xp
+        zeros_k = self._z(m, K_MAX)
+        row: Optional[Any] = None
+        if self.n_scenarios > 0:
+            # Same distribution as BoatNavEnv._sample_training_scenario with train_seeds.
+            row = self._randint(0, self.n_scenarios, (m,))
+            own_x = self.sc_x[row]
+            own_y = self.sc_y[row]
+            heading = self.sc_heading[row]
+            speed = self.sc_speed[row]
+            goal_x = self.sc_goal_x[row]
+            goal_y = self.sc_goal_y[row]
+            stretch = self.sc_stretch_ok[row] & (self._uniform((m,)) < P.STRETCH_GOAL_PROB)
+            if stretch.any():
+                sx, sy = self._sample_stretch_goal_xy(own_x, own_y)
+                goal_x = xp.where(stretch, sx, goal_x)
+                goal_y = xp.where(stretch, sy, goal_y)
+            contacts: Tuple[Any, ...] = (
+                self.sc_c_x[row],
+                self.sc_c_y[row],
+                self.sc_c_cog[row],
+                self.sc_c_sog[row],
+                self.sc_c_radius[row],
+            )
+            active = self.sc_c_active[row]
+        else:
+            own_x = self._z(m)
+            own_y = self._z(m)
+            heading = self._rand((m,), -PI, PI)
+            speed = self._rand((m,), 2.5, 5.5)
+            ang = self._rand((m,), -PI, PI)
+            dist = self._sample_training_goal_distances(m)
+            goal_x = dist * xp.sin(ang)
+            goal_y = dist * xp.cos(ang)
+            contacts = (zeros_k, zeros_k, zeros_k, zeros_k, zeros_k)
+            active = self._false(m, K_MAX)
+
+        if self.mode in ("avoid", "all"):
+            contacts, active = self._apply_train_contact_count(own_x, own_y, contacts, active)
+
+        self.heading[idx] = heading
+        self.speed[idx] = speed
+        self.yaw_rate[idx] = 0.0
+        self.cmd_heading[idx] = heading
+        self.cmd_speed[idx] = speed
+        self.x[idx] = own_x
+        self.y[idx] = own_y
+        self.origin_x[idx] = own_x
+        self.origin_y[idx] = own_y
+        self.goal_x[idx] = goal_x
+        self.goal_y[idx] = goal_y
+        self.leg_start_x[idx] = own_x
+        self.leg_start_y[idx] = own_y
+        gr = xp.hypot(goal_x - own_x, goal_y - own_y)
+        self.initial_goal_range[idx] = gr
+        self.prev_goal_range[idx] = gr
+        self.goal_hold_steps[idx] = 0.0
+        self.step_count[idx] = 0.0
+        self.ep_return[idx] = 0.0
+        self.prev_action[idx] = 0.0
+        self._reset_missions(idx, row, goal_x, goal_y)
+
+        if self.cfg.dynamics_jitter:
+            # P.sample_plant_params: agile ↔ freighter envelope, LTI for the episode.
+            self.tau_h[idx] = self._rand(
+                (m,), P.PLANT_AGILE["tau_heading_s"], P.PLANT_FREIGHTER["tau_heading_s"]
+            )
+            self.tau_s[idx] = self._rand(
+                (m,), P.PLANT_AGILE["tau_speed_s"], P.PLANT_FREIGHTER["tau_speed_s"]
+            )
+            self.max_yaw[idx] = xp.deg2rad(
+                self._rand(
+                    (m,),
+                    P.PLANT_FREIGHTER["max_yaw_rate_deg_s"],
+                    P.PLANT_AGILE["max_yaw_rate_deg_s"],
+                )
+            )
+        else:
+            self.tau_h[idx] = self.nominal_plant.tau_heading_s
+            self.tau_s[idx] = self.nominal_plant.tau_speed_s
+            self.max_yaw[idx] = self.nominal_plant.max_yaw_rate_rps
+
+        if self.cfg.current_enabled:
+            cs = self._rand((m,), 0.0, P.CURRENT_MAX_MPS)
+            cd = self._rand((m,), -PI, PI)
+            self.cur_speed[idx] = cs
+            self.cur_sin[idx] = xp.sin(cd)
+            self.cur_cos[idx] = xp.cos(cd)
+        else:
+            self.cur_speed[idx] = 0.0
+            self.cur_sin[idx] = 0.0
+            self.cur_cos[idx] = 1.0
+
+        c_x, c_y, c_cog, c_sog, c_radius = contacts
+        self.c_x[idx] = xp.where(active, c_x, zeros_k)
+        self.c_y[idx] = xp.where(active, c_y, zeros_k)
+        self.c_cog[idx] = xp.where(active, c_cog, zeros_k)
+        self.c_sog[idx] = xp.where(active, c_sog, zeros_k)
+        self.c_radius[idx] = xp.where(active, c_radius, zeros_k)
+        self.c_active[idx] = active
+        # COG/SOG are constant per episode; cache ground velocity (zero when inactive).
+        self.c_vx[idx] = xp.where(active, c_sog * xp.sin(c_cog), zeros_k)
+        self.c_vy[idx] = xp.where(active, c_sog * xp.cos(c_cog), zeros_k)
+
+    def reset(self, *, seed: Optional[int] = None) -> Any:
+        if seed is not None:
+            self._seed(int(seed))
+        self._reset_indices(self._rows)
+        return self._pack_obs()
+
+    def _goal_range(self) -> Any:
+        return self.xp.hypot(self.goal_x - self.x, self.goal_y - self.y)
+
+    # -- observations -------------------------------------------------------------------
+
+    def _next_obs_buffer(self) -> Any:
+        """Alternate between two obs buffers so the previous obs survives one more step."""
+        self._obs_slot ^= 1
+        return self._obs_bufs[self._obs_slot]
+
+    def _pack_obs(self, obs: Optional[Any] = None) -> Any:
+        if obs is None:
+            obs = self._next_obs_buffer()
+        self._write_obs(obs)
+        return obs
+
+    def _write_obs(self, obs: Any, rows: Optional[Any] = None) -> None:
+        """Fill every non-constant obs field in place (slot 5 / has_goal set at init).
+
+        ``rows`` packs only those envs (e.g. just-reset rows) and scatters them into ``obs``.
+        """
+        xp = self.xp
+        if rows is None:
+            out = obs
+            take = _identity
+        else:
+            out = self._z(len(rows), P.OBS_DIM)
+            out[:, P.OBS_HAS_GOAL_OFFSET] = 1.0
+            take = self._take_rows(rows)
+        n = out.shape[0]
+        h = take(self.heading)
+        x = take(self.x)
+        y = take(self.y)
+        speed = take(self.speed)
+        cur_speed = take(self.cur_speed)
+        cur_sin = take(self.cur_sin)
+        cur_cos = take(self.cur_cos)
+        out[:, 0] = h / PI
+        out[:, 1] = speed / P.SPEED_SCALE_MPS
+        out[:, 2] = take(self.yaw_rate) / P.YAW_RATE_SCALE_RPS
+        out[:, 3] = (x - take(self.origin_x)) / P.POS_SCALE_M
+        out[:, 4] = (y - take(self.origin_y)) / P.POS_SCALE_M
+        out[:, 6] = cur_speed / max(P.CURRENT_MAX_MPS, 1e-6)
+        out[:, 7] = cur_sin
+        out[:, 8] = cur_cos
+
+        if self._has_contacts:
+            active = take(self.c_active)
+            dx = take(self.c_x) - x[:, None]
+            dy = take(self.c_y) - y[:, None]
+            dist = xp.hypot(dx, dy)
+            brg = xp.arctan2(dx, dy)
+            if self.obs_noise_m > 0.0 or self.obs_noise_bearing_rad > 0.0:
+                # Sensed range/bearing only (sorting uses the noisy range, as on CPU).
+                noise = self._randn((2, n, K_MAX))
+                brg = wrap_angle(xp, brg + noise[0] * self.obs_noise_bearing_rad)
+                dist = xp.clip(dist + noise[1] * self.obs_noise_m, 0.0, None)
+            own_vx = speed * xp.sin(h) + cur_speed * cur_sin
+            own_vy = speed * xp.cos(h) + cur_speed * cur_cos
+            rvx = take(self.c_vx) - own_vx[:, None]
+            rvy = take(self.c_vy) - own_vy[:, None]
+            sh = xp.sin(h)[:, None]
+            ch = xp.cos(h)[:, None]
+            rel_cog = take(self.c_cog) - h[:, None]
+            feats = (
+                xp.sin(brg),
+                xp.cos(brg),
+                xp.clip(dist / P.RANGE_SCALE_M, None, 1.0),
+                xp.sin(rel_cog),
+                xp.cos(rel_cog),
+                (rvx * sh + rvy * ch) / P.REL_VEL_SCALE_MPS,
+                (rvx * ch - rvy * sh) / P.REL_VEL_SCALE_MPS,
+                take(self.c_radius) / P.RADIUS_SCALE_M,
+            )
+            self._pack_contacts(out, feats, active, dist, rows)
+
+        gdx = take(self.goal_x) - x
+        gdy = take(self.goal_y) - y
+        gbrg = xp.arctan2(gdx, gdy)
+        gb = P.OBS_GOAL_OFFSET
+        out[:, gb + 0] = xp.sin(gbrg)
+        out[:, gb + 1] = xp.cos(gbrg)
+        out[:, gb + 2] = xp.clip(xp.hypot(gdx, gdy) / P.RANGE_SCALE_M, None, 1.0)
+        if rows is not None:
+            self._put_rows(obs, rows, out)
+
+    @staticmethod
+    def _obs_contacts(obs: Any) -> Any:
+        return obs[:, 9 : P.OBS_MASK_OFFSET].reshape(obs.shape[0], K_MAX, P.OBS_CONTACT_DIM)
+
+    # -- missions -----------------------------------------------------------------------
+
+    def _mission_head(self) -> Tuple[Any, Any]:
+        """(pending, head index) — head is the next queued leg per env."""
+        nxt = self.m_leg + 1
+        head = self.xp.where(nxt < self.n_legs_max, nxt, self.n_legs_max - 1)
+        return nxt < self.m_legs, head
+
+    def _check_scheduled(self) -> Any:
+        """Delay / progress waypoint changes before the reward (``check_scheduled``)."""
+        pending, head = self._mission_head()
+        kind = self._at_head(self.m_kind, head)
+        fire_at = self._at_head(self.m_fire_step, head)
+        threshold = self._at_head(self.m_progress, head)
+        init = self.initial_goal_range
+        progress = 1.0 - self._goal_range() / self.xp.clip(init, 1.0, None)
+        fired = pending & (
+            ((kind == TRIGGER_DELAY_SEC) & (self.step_count >= fire_at))
+            | ((kind == TRIGGER_PROGRESS_FRAC) & (init > 1.0) & (progress >= threshold))
+        )
+        self._advance_leg(fired, head)
+        return fired
+
+    def _check_hold_advance(self, in_goal: Any, skip: Any) -> Any:
+        """Advance after the hold completes on a ``hold_complete`` leg (``check_hold_advance``)."""
+        pending, head = self._mission_head()
+        fired = (
+            pending
+            & ~skip
+            & (self._at_head(self.m_kind, head) == TRIGGER_HOLD_COMPLETE)
+            & in_goal
+            & (self.goal_hold_steps >= float(self.goal_hold_required))
+        )
+        self._advance_leg(fired, head)
+        return fired
+
+    # -- CPU env hand-off ---------------------------------------------------------------
+
+    def sync_from_cpu_env(self, env: Any, indices: Optional[Sequence[int]] = None) -> None:
+        """Copy state from a CPU BoatNavEnv into batch rows (parity tests, batched eval)."""
+        rows: List[int] = list(range(self.n)) if indices is None else [int(i) for i in indices]
+        prev_action = self._asarray(np.asarray(env.prev_action, dtype=np.float32))
+        for i in rows:
+            self.x[i] = env.own.x_m
+            self.y[i] = env.own.y_m
+            self.heading[i] = env.own.heading_rad
+            self.speed[i] = env.own.speed_mps
+            self.yaw_rate[i] = env.own.yaw_rate_rps
+            self.cmd_heading[i] = env.own.cmd_heading_rad
+            self.cmd_speed[i] = env.own.cmd_speed_mps
+            self.origin_x[i] = env.origin_x
+            self.origin_y[i] = env.origin_y
+            self.goal_x[i] = env.goal_x
+            self.goal_y[i] = env.goal_y
+            self.leg_start_x[i] = env.leg_start_x
+            self.leg_start_y[i] = env.leg_start_y
+            self.prev_goal_range[i] = env.prev_goal_range
+            self.initial_goal_range[i] = env.initial_goal_range
+            self.goal_hold_steps[i] = float(env.goal_hold_steps)
+            self.step_count[i] = float(env.step_count)
+            self.ep_return[i] = 0.0
+            self.max_steps_env[i] = float(env.max_steps)
+            self.prev_action[i] = prev_action
+            self.tau_h[i] = env.plant.tau_heading_s
+            self.tau_s[i] = env.plant.tau_speed_s
+            self.max_yaw[i] = env.plant.max_yaw_rate_rps
+            cur = env.water_current
+            self.cur_speed[i] = cur.speed_mps
+            self.cur_sin[i] = math.sin(cur.direction_rad)
+            self.cur_cos[i] = math.cos(cur.direction_rad)
+            self._sync_mission_from_cpu(i, env)
+            self.c_active[i] = False
+            self.c_vx[i] = 0.0
+            self.c_vy[i] = 0.0
+            for slot, c in enumerate(env.contacts[:K_MAX]):
+                self.c_x[i, slot] = c.x_m
+                self.c_y[i, slot] = c.y_m
+                self.c_cog[i, slot] = c.cog_rad
+                self.c_sog[i, slot] = c.sog_mps
+                self.c_radius[i, slot] = c.radius_m
+                self.c_vx[i, slot] = c.sog_mps * math.sin(c.cog_rad)
+                self.c_vy[i, slot] = c.sog_mps * math.cos(c.cog_rad)
+                self.c_active[i, slot] = True
+                self._has_contacts = True
+
+    def _sync_mission_from_cpu(self, i: int, env: Any) -> None:
+        mission = env.mission
+        self.m_leg[i] = 0
+        self.m_legs[i] = 1
+        self.m_x[i, 0] = env.goal_x
+        self.m_y[i, 0] = env.goal_y
+        if mission is None or mission.is_on_final_leg():
+            return
+        legs = mission.leg_index + 1 + len(mission.pending)
+        if legs > self.n_legs_max:
+            raise ValueError(f"mission has {legs} legs; sim table holds {self.n_legs_max}")
+        self.m_leg[i] = mission.leg_index
+        self.m_legs[i] = legs
+        self._missions_active = True
+        for j, trig in enumerate(mission.pending):
+            leg = mission.leg_index + 1 + j
+            self.m_x[i, leg] = trig.goal_x
+            self.m_y[i, leg] = trig.goal_y
+            self.m_kind[i, leg] = TRIGGER_CODES.get(trig.kind, -1)
+            self.m_fire_step[i, leg] = (
+                float(trig.fire_at_step) if trig.fire_at_step is not None else math.inf
+            )
+            self.m_progress[i, leg] = (
+                float(trig.progress_threshold) if trig.progress_threshold is not None else math.inf
+            )
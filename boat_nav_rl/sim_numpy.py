@@ -0,0 +1,384 @@
+"""NumPy-batched boat navigation simulation for GPU-less hosts.
+
+Same state layout, reset distribution and step semantics as ``sim_torch.BatchedBoatSim``
+(float32 arrays instead of tensors; both share ``sim_common.BatchedSimBase``), stepped
+with in-place ufuncs on preallocated arrays so one process can advance thousands of envs
+per call without torch's per-op dispatch overhead.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+import numpy as np
+
+import prepare as P
+from sim_common import K_MAX, PI, BatchedBoatSimConfig, BatchedSimBase, FinishedEpisodes
+
+F32 = np.float32
+
+
+def wrap_angle_np(rad: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    return np.arctan2(np.sin(rad), np.cos(rad), out=out)
+
+
+class NumpyBatchedBoatSim(BatchedSimBase):
+    """Vectorized env core on host memory; mirrors ``BatchedBoatSim`` field for field."""
+
+    xp = np
+
+    def __init__(self, cfg: BatchedBoatSimConfig) -> None:
+        self.device = "cpu"
+        self._init_config(cfg)
+        self._rng = np.random.default_rng()
+        self._rows = np.arange(self.n)
+        self._init_state()
+        # Step scratch: plant temporaries and the per-contact feature block.
+        n = self.n
+        self._tmp_a = self._z(n)
+        self._tmp_b = self._z(n)
+        self._feats = self._z(n, K_MAX, P.OBS_CONTACT_DIM)
+        self._sorted_feats = self._z(n, K_MAX, P.OBS_CONTACT_DIM)
+        self._slot_base = (self._rows * K_MAX)[:, None]
+        self._load_scenario_table(cfg.train_seeds or [])
+
+    def _z(self, *shape: int) -> np.ndarray:
+        return np.zeros(shape, dtype=np.float32)
+
+    def _false(self, *shape: int) -> np.ndarray:
+        return np.zeros(shape, dtype=bool)
+
+    def _zeros_long(self, *shape: int) -> np.ndarray:
+        return np.zeros(shape, dtype=np.int64)
+
+    def _full(self, shape: Tuple[int, ...], value: float) -> np.ndarray:
+        return np.full(shape, value, dtype=np.float32)
+
+    def _asarray(self, values: Any) -> np.ndarray:
+        a = np.asarray(values)
+        return a.astype(np.float32, copy=False) if a.dtype.kind == "f" else a
+
+    def _seed(self, seed: int) -> None:
+        self._rng = np.random.default_rng(seed)
+
+    def _rand(self, shape: Tuple[int, ...], lo: float, hi: float) -> np.ndarray:
+        return self._rng.random(shape, dtype=np.float32) * F32(hi - lo) + F32(lo)
+
+    def _uniform(self, shape: Tuple[int, ...]) -> np.ndarray:
+        return self._rng.random(shape)
+
+    def _randint(self, lo: int, hi: int, shape: Tuple[int, ...]) -> np.ndarray:
+        return self._rng.integers(lo, hi, shape)
+
+    def _randn(self, shape: Tuple[int, ...]) -> np.ndarray:
+        return self._rng.standard_normal(shape, dtype=np.float32)
+
+    def _at_head(self, table: np.ndarray, head: np.ndarray) -> np.ndarray:
+        return table[self._rows, head]
+
+    def _take_rows(self, rows: np.ndarray) -> Callable[[np.ndarray], np.ndarray]:
+        return lambda a: a[rows]
+
+    def _put_rows(self, obs: np.ndarray, rows: np.ndarray, out: np.ndarray) -> None:
+        obs[rows] = out
+
+    def _apply_action(self, actions: np.ndarray) -> None:
+        np.multiply(actions[:, 0], F32(PI), out=self.cmd_heading)
+        wrap_angle_np(self.cmd_heading, out=self.cmd_heading)
+        span = F32(0.5 * (P.V_MAX_MPS - P.V_MIN_MPS))
+        np.add(actions[:, 1], F32(1.0), out=self.cmd_speed)
+        self.cmd_speed *= span
+        self.cmd_speed += F32(P.V_MIN_MPS)
+
+    def _step_plant(self) -> None:
+        dt = F32(P.DT_S)
+        a, b = self._tmp_a, self._tmp_b
+        np.subtract(self.cmd_heading, self.heading, out=a)
+        wrap_angle_np(a, out=a)
+        np.maximum(self.tau_h, F32(1e-3), out=b)
+        np.divide(a, b, out=self.yaw_rate)
+        np.clip(self.yaw_rate, -self.max_yaw, self.max_yaw, out=self.yaw_rate)
+        np.multiply(self.yaw_rate, dt, out=a)
+        self.heading += a
+        wrap_angle_np(self.heading, out=self.heading)
+        np.subtract(self.cmd_speed, self.speed, out=a)
+        np.maximum(self.tau_s, F32(1e-3), out=b)
+        a /= b
+        a *= dt
+        self.speed += a
+        np.clip(self.speed, P.V_MIN_MPS, P.V_MAX_MPS, out=self.speed)
+        # x += (speed·sin(h) + cur_speed·cur_sin)·dt, likewise y with cos.
+        np.sin(self.heading, out=a)
+        a *= self.speed
+        np.multiply(self.cur_speed, self.cur_sin, out=b)
+        a += b
+        a *= dt
+        self.x += a
+        np.cos(self.heading, out=a)
+        a *= self.speed
+        np.multiply(self.cur_speed, self.cur_cos, out=b)
+        a += b
+        a *= dt
+        self.y += a
+
+    def _step_contacts(self) -> None:
+        # Inactive slots carry zero velocity, so no mask is needed.
+        dt = F32(P.DT_S)
+        self.c_x += self.c_vx * dt
+        self.c_y += self.c_vy * dt
+
+    def _own_ground_velocity(self) -> Tuple[np.ndarray, np.ndarray]:
+        own_vx = self.speed * np.sin(self.heading) + self.cur_speed * self.cur_sin
+        own_vy = self.speed * np.cos(self.heading) + self.cur_speed * self.cur_cos
+        return own_vx, own_vy
+
+    def _contact_metrics(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Returns cpa_penalty, threat, collision, cpa_unsafe per env."""
+        cfg = self.reward_cfg
+        if not self._has_contacts:
+            z = self._zeros_n
+            return z, z, self._false_n, z
+        active = self.c_active
+        own_vx, own_vy = self._own_ground_velocity()
+
+        rx = self.c_x - self.x[:, None]
+        ry = self.c_y - self.y[:, None]
+        vx = self.c_vx - own_vx[:, None]
+        vy = self.c_vy - own_vy[:, None]
+        v2 = np.maximum(vx * vx + vy * vy, F32(1e-8))
+        tcpa = -(rx * vx + ry * vy) / v2
+        cpa_m = np.hypot(rx + vx * tcpa, ry + vy * tcpa)
+
+        hull = self.c_radius + F32(self.cfg.own_radius_m)
+        safe = hull + F32(P.CPA_MARGIN_M)
+        collision = active & (np.hypot(rx, ry) < hull)
+
+        in_horizon = active & (tcpa >= 0.0) & (tcpa <= P.CPA_HORIZON_S)
+        hard = in_horizon & (cpa_m < safe)
+        warn_edge = safe * F32(cfg.cpa_warning_mult)
+        warn = in_horizon & ~hard & (cpa_m < warn_edge)
+
+        frac_hard = np.where(hard, (safe - cpa_m) / np.maximum(safe, F32(1e-6)), F32(0.0))
+        span = safe * F32(cfg.cpa_warning_mult - 1.0)
+        frac_warn = np.where(warn, (warn_edge - cpa_m) / np.maximum(span, F32(1e-6)), F32(0.0))
+        cpa_penalty = (F32(cfg.w_cpa) * frac_hard + F32(cfg.w_cpa_soft) * frac_warn).sum(axis=1)
+        # frac_* are zero outside hard / warn, so max over slots needs no extra mask.
+        threat = np.maximum(
+            np.clip(frac_hard, 0.0, 1.0).max(axis=1),
+            np.clip(F32(0.5) * frac_warn, 0.0, 1.0).max(axis=1),
+        )
+        return cpa_penalty, threat, collision.any(axis=1), hard.any(axis=1).astype(np.float32)
+
+    def _compute_rewards(
+        self,
+        actions: np.ndarray,
+        curr_goal_range: np.ndarray,
+        in_goal: np.ndarray,
+        cpa_penalty: np.ndarray,
+        threat: np.ndarray,
+        collision: np.ndarray,
+        cpa_unsafe: np.ndarray,
+    ) -> np.ndarray:
+        cfg = self.reward_cfg
+        ghs = self.goal_hold_steps
+        unsafe = cpa_unsafe > 0.0
+        terms = {} if self.cfg.reward_breakdown else None
+
+        progress_scale = 1.0 + np.minimum(
+            curr_goal_range / np.maximum(self.initial_goal_range, F32(1.0)), F32(1.0)
+        )
+        retreat = np.maximum(curr_goal_range - self.prev_goal_range, F32(0.0))
+        approach = np.maximum(self.prev_goal_range - curr_goal_range, F32(0.0))
+        threat_thresh = threat >= cfg.threat_progress_thresh
+        threatened = in_goal & (unsafe | threat_thresh)
+        threat_level = np.maximum(threat, cpa_unsafe)
+
+        w_prog = F32(cfg.w_goal_progress / 100.0)
+        reward = np.where(
+            threatened,
+            w_prog * retreat * progress_scale * (1.0 + threat_level),
+            w_prog * (approach - retreat) * progress_scale,
+        )
+        if terms is not None:
+            terms["progress"] = (reward.copy(), np.ones_like(in_goal))
+
+        if cfg.w_cross_track > 0.0:
+            leg_dx = self.goal_x - self.leg_start_x
+            leg_dy = self.goal_y - self.leg_start_y
+            leg_len2 = np.maximum(leg_dx * leg_dx + leg_dy * leg_dy, F32(1e-6))
+            rel_x = self.x - self.leg_start_x
+            rel_y = self.y - self.leg_start_y
+            ct = np.abs(rel_x * leg_dy - rel_y * leg_dx) / np.sqrt(leg_len2)
+            norm = ct / F32(max(cfg.cross_track_scale_m, 1e-6))
+            cross = ~in_goal * (F32(-cfg.w_cross_track) * norm * norm)
+            reward += cross
+        else:
+            cross = np.zeros_like(reward)
+        if terms is not None:
+            terms["cross_track"] = (cross, ~in_goal)
+
+        speed_norm = (self.speed - F32(P.V_MIN_MPS)) / F32(max(P.V_MAX_MPS - P.V_MIN_MPS, 1e-6))
+        slow_bonus = np.maximum(1.0 - speed_norm, F32(0.0)) ** 2
+        # No hold credit while CPA-unsafe (matches ``compute_step_reward``'s hold_allowed).
+        hold_allowed = in_goal & ~unsafe
+        if cfg.gated_hold:
+            stationary = self.speed <= cfg.hold_stationary_speed_mps
+            holding = hold_allowed & stationary
+            over = np.maximum(self.speed - F32(cfg.hold_stationary_speed_mps), F32(0.0))
+            overspeed_mask = hold_allowed & ~stationary
+            overspeed = overspeed_mask * (F32(-cfg.w_hold_overspeed / max(P.V_MAX_MPS, 1e-6)) * over)
+            reward += overspeed
+            if terms is not None:
+                terms["hold_overspeed"] = (overspeed, overspeed_mask)
+        else:
+            holding = hold_allowed
+
+        first_hold = holding & (ghs == 0.0)
+        early = np.maximum(1.0 - self.step_count / np.maximum(self.max_steps_env, F32(1.0)), F32(0.0))
+        arrival = first_hold * (
+            F32(cfg.w_goal_arrival)
+            + (self.max_steps_env > 0.0) * (F32(cfg.w_goal_arrival_early) * early)
+        )
+        hold_speed = holding * (F32(cfg.w_hold_base) + F32(cfg.w_hold_speed) * slow_bonus)
+        hold_center = holding * (F32(-cfg.w_hold_center / P.GOAL_SUCCESS_RANGE_M) * curr_goal_range)
+        stay = threatened * (F32(-cfg.w_goal_threat_stay) * threat_level)
+        reward += arrival
+        reward += hold_speed
+        reward += hold_center
+        reward += stay
+
+        # Hold counter: +1 while holding (already excludes CPA-unsafe), kept in zone, else reset.
+        ghs += holding
+        ghs *= in_goal
+
+        approach_mask = ~in_goal & (curr_goal_range < cfg.approach_slow_range_m)
+        approach_prox = np.maximum(1.0 - curr_goal_range / F32(cfg.approach_slow_range_m), F32(0.0))
+        approach_slow = approach_mask * (F32(cfg.w_approach_slow) * approach_prox * slow_bonus)
+        reward += approach_slow
+
+        smooth = F32(-cfg.w_smooth) * np.linalg.norm(actions - self.prev_action, axis=1)
+        collide = collision * F32(-cfg.w_collision)
+        reward += smooth
+        reward -= cpa_penalty
+        reward += collide
+        if terms is not None:
+            always = np.ones_like(in_goal)
+            terms["goal_arrival"] = (arrival, first_hold)
+            terms["hold_speed"] = (hold_speed, holding)
+            terms["hold_center"] = (hold_center, holding)
+            terms["goal_threat_stay"] = (stay, threatened)
+            terms["approach_slow"] = (approach_slow, approach_mask)
+            terms["smooth"] = (smooth, always)
+            terms["cpa"] = (-cpa_penalty, always)
+            terms["collision"] = (collide, collision.copy())
+        self.reward_terms = terms
+        np.clip(reward, -cfg.reward_clip, cfg.reward_clip, out=reward)
+        return np.nan_to_num(reward, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+
+    def _pack_contacts(
+        self,
+        out: np.ndarray,
+        feats: Sequence[np.ndarray],
+        active: np.ndarray,
+        dist: np.ndarray,
+        rows: Optional[np.ndarray],
+    ) -> None:
+        if rows is None:
+            block, sorted_feats, slot_base = self._feats, self._sorted_feats, self._slot_base
+        else:
+            block = self._z(rows.size, K_MAX, P.OBS_CONTACT_DIM)
+            sorted_feats = np.empty_like(block)
+            slot_base = self._slot_base[: rows.size]
+        for k, feat in enumerate(feats):
+            block[:, :, k] = feat
+        block *= active[:, :, None]
+        # Single flat gather over the range order fills all K_MAX slots at once.
+        order = np.argsort(np.where(active, dist, F32(1e9)), axis=1, kind="stable")
+        order += slot_base
+        np.take(block.reshape(-1, P.OBS_CONTACT_DIM), order, axis=0, out=sorted_feats)
+        self._obs_contacts(out)[...] = sorted_feats
+        out[:, P.OBS_MASK_OFFSET : P.OBS_GOAL_OFFSET] = active.reshape(-1)[order]
+
+    def _advance_leg(self, mask: np.ndarray, head: np.ndarray) -> None:
+        """Vectorized ``NavigationMission._pop_and_advance`` + ``_apply_mission_transition``."""
+        if not mask.any():
+            return
+        np.copyto(self.goal_x, self._at_head(self.m_x, head), where=mask)
+        np.copyto(self.goal_y, self._at_head(self.m_y, head), where=mask)
+        np.copyto(self.leg_start_x, self.x, where=mask)
+        np.copyto(self.leg_start_y, self.y, where=mask)
+        gr = self._goal_range()
+        np.copyto(self.initial_goal_range, gr, where=mask)
+        np.copyto(self.prev_goal_range, gr, where=mask)
+        self.goal_hold_steps[mask] = 0.0
+        self.m_leg += mask
+
+    def _step_core(
+        self, actions: np.ndarray, obs: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        self._apply_action(actions)
+        self._step_plant()
+        self._step_contacts()
+        self.step_count += 1.0
+        scheduled = self._check_scheduled() if self._missions_active else self._false_n
+
+        curr_goal_range = self._goal_range()
+        in_goal = curr_goal_range < P.GOAL_SUCCESS_RANGE_M
+        cpa_penalty, threat, collision, cpa_unsafe = self._contact_metrics()
+
+        reward = self._compute_rewards(
+            actions, curr_goal_range, in_goal, cpa_penalty, threat, collision, cpa_unsafe
+        )
+
+        hold_complete = self.goal_hold_steps >= float(self.goal_hold_required)
+        self.prev_goal_range[:] = curr_goal_range
+        if self._missions_active:
+            hold_advanced = self._check_hold_advance(in_goal, scheduled)
+            goal_changed = scheduled | hold_advanced
+            hold_complete &= ~hold_advanced
+            final_leg = (self.m_leg + 1) >= self.m_legs
+            hold_done = hold_complete & in_goal & final_leg & ~goal_changed
+        else:
+            hold_done = hold_complete & in_goal
+        terminated = collision | hold_done
+        truncated = self.step_count >= self.max_steps_env
+
+        self.success = hold_done & ~collision & (cpa_unsafe == 0.0)
+        self.collision = collision
+        self.goal_range = curr_goal_range
+        self.cpa_unsafe = cpa_unsafe
+        self.ep_return += reward
+        self.episode_count += terminated | truncated
+        self.success_count += self.success
+        self.collision_count += collision
+
+        self._write_obs(obs)
+        self.prev_action[:] = actions
+        return reward, terminated, truncated
+
+    def step(
+        self, actions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Returns obs, reward, terminated, truncated (same contract as ``BatchedBoatSim.step``)."""
+        actions = np.asarray(actions, dtype=np.float32)
+        obs = self._next_obs_buffer()
+        reward, terminated, truncated = self._step_core(actions, obs)
+
+        self.finished = None
+        if self.cfg.auto_reset:
+            done = terminated | truncated
+            if done.any():
+                idx = np.flatnonzero(done)
+                self.finished = FinishedEpisodes(
+                    index=idx,
+                    terminal_obs=obs[idx],
+                    ep_return=self.ep_return[idx],
+                    ep_length=self.step_count[idx],
+                    success=self.success[idx],
+                    collision=self.collision[idx],
+                    truncated=(truncated & ~terminated)[idx],
+                )
+                self._reset_indices(idx)
+                self._write_obs(obs, idx)
+
+        return obs, reward, terminated, truncated
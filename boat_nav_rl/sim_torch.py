@@ -1,25 +1,20 @@
 """GPU-batched boat navigation simulation (Torch).
 
 Prototype: vectorized plant, contacts, observation packing, and rewards for
-navigate / avoid training without SubprocVecEnv.
+navigate / avoid training without SubprocVecEnv. With ``train_seeds`` set,
+resets replay the curated train split like ``BoatNavEnv._sample_training_scenario``.
+Resets, missions and obs packing live in ``sim_common.BatchedSimBase``.
 """
 
 from __future__ import annotations
 
-import math
-from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Optional, Sequence, Tuple
 
 import numpy as np
 import torch
-from gymnasium import spaces
 
 import prepare as P
-from rewards import RewardConfig, get_reward_config
-
-PI = math.pi
-K_MAX = P.N_MAX_CONTACTS
-TRAIN_K_MAX = 4
+from sim_common import K_MAX, PI, BatchedBoatSimConfig, BatchedSimBase, FinishedEpisodes, wrap_angle
 
 
 def _device_or_cpu(device: Optional[str]) -> torch.device:
@@ -29,180 +24,66 @@ def _device_or_cpu(device: Optional[str]) -> torch.device:
 
 
 def wrap_angle_torch(rad: torch.Tensor) -> torch.Tensor:
-    return torch.atan2(torch.sin(rad), torch.cos(rad))
-
+    return wrap_angle(torch, rad)
 
-@dataclass
-class BatchedBoatSimConfig:
-    mode: str = "navigate"
-    n_envs: int = 256
-    max_episode_steps: int = P.MAX_STEPS
-    goal_hold_sec: int = P.DEFAULT_GOAL_HOLD_SEC
-    current_enabled: bool = False
-    own_radius_m: float = P.OWN_RADIUS_M
-    contact_obs_noise_m: float = 0.0
-    reward_config: Optional[RewardConfig] = None
-    auto_reset: bool = True
 
-
-class BatchedBoatSim:
+class BatchedBoatSim(BatchedSimBase):
     """Vectorized env core — all state lives on `self.device`."""
 
+    xp = torch
+
     def __init__(self, cfg: BatchedBoatSimConfig, device: Optional[str] = None) -> None:
-        self.cfg = cfg
         self.device = _device_or_cpu(device)
-        self.mode = cfg.mode if cfg.mode != "all" else "avoid"
-        self.n = int(cfg.n_envs)
-        self.reward_cfg = cfg.reward_config or get_reward_config()
-        self.goal_hold_required = max(1, int(cfg.goal_hold_sec)) if cfg.goal_hold_sec > 0 else 1
-        self.max_steps = max(1, int(cfg.max_episode_steps)) + max(0, int(cfg.goal_hold_sec))
-
-        self.observation_space = spaces.Box(
-            low=-np.inf, high=np.inf, shape=(P.OBS_DIM,), dtype=np.float32
-        )
-        self.action_space = spaces.Box(low=-1.0, high=1.0, shape=(2,), dtype=np.float32)
-
-        self._init_tensors()
+        self._init_config(cfg)
+        self._rng = torch.Generator(device=self.device)
+        self._rows = torch.arange(self.n, device=self.device)
+        self._init_state()
+        self._load_scenario_table(cfg.train_seeds or [])
+        self._step_fn = torch.compile(self._step_core) if cfg.compile_step else self._step_core
 
     def _z(self, *shape: int) -> torch.Tensor:
         return torch.zeros(*shape, device=self.device, dtype=torch.float32)
 
-    def _init_tensors(self) -> None:
-        n = self.n
-        self.x = self._z(n)
-        self.y = self._z(n)
-        self.heading = self._z(n)
-        self.speed = self._z(n)
-        self.yaw_rate = self._z(n)
-        self.cmd_heading = self._z(n)
-        self.cmd_speed = self._z(n)
-        self.origin_x = self._z(n)
-        self.origin_y = self._z(n)
-        self.goal_x = self._z(n)
-        self.goal_y = self._z(n)
-        self.leg_start_x = self._z(n)
-        self.leg_start_y = self._z(n)
-        self.prev_goal_range = self._z(n)
-        self.initial_goal_range = self._z(n)
-        self.goal_hold_steps = torch.zeros(n, device=self.device, dtype=torch.float32)
-        self.step_count = torch.zeros(n, device=self.device, dtype=torch.float32)
-        self.prev_action = self._z(n, 2)
-        self.tau_h = torch.full((n,), P.TAU_HEADING_S, device=self.device)
-        self.tau_s = torch.full((n,), P.TAU_SPEED_S, device=self.device)
-        self.max_yaw = torch.full((n,), P.MAX_YAW_RATE_RPS, device=self.device)
-        self.cur_speed = self._z(n)
-        self.cur_sin = self._z(n)
-        self.cur_cos = torch.ones(n, device=self.device)
-        self.c_x = self._z(n, K_MAX)
-        self.c_y = self._z(n, K_MAX)
-        self.c_cog = self._z(n, K_MAX)
-        self.c_sog = self._z(n, K_MAX)
-        self.c_radius = self._z(n, K_MAX)
-        self.c_active = torch.zeros(n, K_MAX, device=self.device, dtype=torch.bool)
-        self._obs = self._z(n, P.OBS_DIM)
-        self._rng = torch.Generator(device=self.device)
+    def _false(self, *shape: int) -> torch.Tensor:
+        return torch.zeros(*shape, device=self.device, dtype=torch.bool)
+
+    def _zeros_long(self, *shape: int) -> torch.Tensor:
+        return torch.zeros(*shape, device=self.device, dtype=torch.long)
+
+    def _full(self, shape: Tuple[int, ...], value: float) -> torch.Tensor:
+        return torch.full(shape, value, device=self.device, dtype=torch.float32)
+
+    def _asarray(self, values: Any) -> torch.Tensor:
+        t = torch.as_tensor(values, device=self.device)
+        return t.float() if t.is_floating_point() else t
+
+    def _seed(self, seed: int) -> None:
+        self._rng.manual_seed(seed)
 
     def _rand(self, shape: Tuple[int, ...], lo: float, hi: float) -> torch.Tensor:
         return torch.rand(shape, device=self.device, generator=self._rng) * (hi - lo) + lo
 
-    def _sample_training_goal_distances(self, m: int) -> torch.Tensor:
-        reachable = P.estimate_reachable_goal_range_m(
-            self.cfg.max_episode_steps,
-            goal_hold_sec=self.cfg.goal_hold_sec,
-        )
-        world_max = P.max_goal_distance_from_xy(0.0, 0.0)
-        arrival_horizon = min(reachable, world_max)
-        near_hi = min(P.TRAIN_GOAL_DIST_NEAR_MAX_M, arrival_horizon * 0.95)
-        near_hi = max(near_hi, P.TRAIN_GOAL_DIST_MIN_M + 1.0)
-        if world_max > reachable * P.STRETCH_GOAL_REACH_MULT_MIN:
-            stretch_lo = max(
-                P.TRAIN_GOAL_DIST_NEAR_MAX_M, reachable * P.STRETCH_GOAL_REACH_MULT_MIN
-            )
-            stretch_hi = min(reachable * P.STRETCH_GOAL_REACH_MULT_MAX, world_max)
-        else:
-            stretch_lo = max(P.TRAIN_GOAL_DIST_NEAR_MAX_M, world_max * 0.82)
-            stretch_hi = world_max
-        if stretch_lo >= stretch_hi:
-            stretch_dist = torch.full((m,), stretch_hi, device=self.device)
-        else:
-            stretch_dist = self._rand((m,), stretch_lo, stretch_hi)
-        near_dist = self._rand((m,), P.TRAIN_GOAL_DIST_MIN_M, near_hi)
-        stretch = (
-            torch.rand((m,), device=self.device, generator=self._rng) < P.STRETCH_GOAL_PROB
-        )
-        return torch.where(stretch, stretch_dist, near_dist)
-
-    def _reset_indices(self, idx: torch.Tensor) -> None:
-        if idx.numel() == 0:
-            return
-        m = idx.numel()
-        self.heading[idx] = self._rand((m,), -PI, PI)
-        self.speed[idx] = self._rand((m,), 2.5, 5.5)
-        self.yaw_rate[idx] = 0.0
-        self.cmd_heading[idx] = self.heading[idx]
-        self.cmd_speed[idx] = self.speed[idx]
-        self.x[idx] = 0.0
-        self.y[idx] = 0.0
-        self.origin_x[idx] = 0.0
-        self.origin_y[idx] = 0.0
-        ang = self._rand((m,), -PI, PI)
-        dist = self._sample_training_goal_distances(m)
-        self.goal_x[idx] = self.x[idx] + dist * torch.sin(ang)
-        self.goal_y[idx] = self.y[idx] + dist * torch.cos(ang)
-        self.leg_start_x[idx] = self.x[idx]
-        self.leg_start_y[idx] = self.y[idx]
-        gr = torch.hypot(self.goal_x[idx] - self.x[idx], self.goal_y[idx] - self.y[idx])
-        self.initial_goal_range[idx] = gr
-        self.prev_goal_range[idx] = gr
-        self.goal_hold_steps[idx] = 0.0
-        self.step_count[idx] = 0.0
-        self.prev_action[idx] = 0.0
-        self.c_active[idx] = False
-
-        if self.cfg.current_enabled:
-            cs = self._rand((m,), 0.0, P.CURRENT_MAX_MPS)
-            cd = self._rand((m,), -PI, PI)
-            self.cur_speed[idx] = cs
-            self.cur_sin[idx] = torch.sin(cd)
-            self.cur_cos[idx] = torch.cos(cd)
-        else:
-            self.cur_speed[idx] = 0.0
-            self.cur_sin[idx] = 0.0
-            self.cur_cos[idx] = 1.0
-
-        if self.mode in ("avoid", "all"):
-            self.c_active[idx] = False
-            n_contacts = torch.randint(
-                1, TRAIN_K_MAX + 1, (m,), device=self.device, generator=self._rng
-            )
-            slots = torch.arange(TRAIN_K_MAX, device=self.device).unsqueeze(0)
-            on = slots < n_contacts.unsqueeze(1)
-            for slot in range(TRAIN_K_MAX):
-                mask = on[:, slot]
-                if not mask.any():
-                    continue
-                env_i = idx[mask]
-                self.c_x[env_i, slot] = self._rand((env_i.numel(),), -400.0, 400.0)
-                self.c_y[env_i, slot] = self._rand((env_i.numel(),), -400.0, 400.0)
-                self.c_cog[env_i, slot] = self._rand((env_i.numel(),), 0.0, 2 * PI)
-                self.c_sog[env_i, slot] = self._rand((env_i.numel(),), 0.0, 5.5)
-                self.c_radius[env_i, slot] = P.OWN_RADIUS_M
-                self.c_active[env_i, slot] = True
-
-    def reset(self, *, seed: Optional[int] = None) -> torch.Tensor:
-        if seed is not None:
-            self._rng.manual_seed(int(seed))
-        idx = torch.arange(self.n, device=self.device)
-        self._reset_indices(idx)
-        return self._pack_obs()
-
-    def _goal_range(self) -> torch.Tensor:
-        return torch.hypot(self.goal_x - self.x, self.goal_y - self.y)
+    def _uniform(self, shape: Tuple[int, ...]) -> torch.Tensor:
+        return torch.rand(shape, device=self.device, generator=self._rng)
+
+    def _randint(self, lo: int, hi: int, shape: Tuple[int, ...]) -> torch.Tensor:
+        return torch.randint(lo, hi, shape, device=self.device, generator=self._rng)
+
+    def _randn(self, shape: Tuple[int, ...]) -> torch.Tensor:
+        return torch.randn(shape, device=self.device, generator=self._rng)
+
+    def _at_head(self, table: torch.Tensor, head: torch.Tensor) -> torch.Tensor:
+        return table.gather(1, head.unsqueeze(1)).squeeze(1)
+
+    def _take_rows(self, rows: torch.Tensor) -> Callable[[torch.Tensor], torch.Tensor]:
+        return lambda t: t.index_select(0, rows)
+
+    def _put_rows(self, obs: torch.Tensor, rows: torch.Tensor, out: torch.Tensor) -> None:
+        obs.index_copy_(0, rows, out)
 
     def _apply_action(self, actions: torch.Tensor) -> None:
-        a = actions.to(self.device, dtype=torch.float32)
-        self.cmd_heading = wrap_angle_torch(a[:, 0] * PI)
-        self.cmd_speed = P.V_MIN_MPS + (a[:, 1] + 1.0) * 0.5 * (P.V_MAX_MPS - P.V_MIN_MPS)
+        self.cmd_heading = wrap_angle_torch(actions[:, 0] * PI)
+        self.cmd_speed = P.V_MIN_MPS + (actions[:, 1] + 1.0) * 0.5 * (P.V_MAX_MPS - P.V_MIN_MPS)
 
     def _step_plant(self) -> None:
         dt = P.DT_S
@@ -225,41 +106,31 @@ class BatchedBoatSim:
         self.y = self.y + (vy + cur_vy) * dt
 
     def _step_contacts(self) -> None:
-        dt = P.DT_S
-        active = self.c_active
-        self.c_x = torch.where(
-            active,
-            self.c_x + self.c_sog * torch.sin(self.c_cog) * dt,
-            self.c_x,
-        )
-        self.c_y = torch.where(
-            active,
-            self.c_y + self.c_sog * torch.cos(self.c_cog) * dt,
-            self.c_y,
-        )
+        # Inactive slots carry zero velocity, so no mask is needed.
+        self.c_x = self.c_x + self.c_vx * P.DT_S
+        self.c_y = self.c_y + self.c_vy * P.DT_S
+
+    def _own_ground_velocity(self) -> Tuple[torch.Tensor, torch.Tensor]:
+        own_vx = self.speed * torch.sin(self.heading) + self.cur_speed * self.cur_sin
+        own_vy = self.speed * torch.cos(self.heading) + self.cur_speed * self.cur_cos
+        return own_vx, own_vy
 
     def _contact_metrics(self) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
         """Returns cpa_penalty, threat, collision, cpa_unsafe per env."""
         cfg = self.reward_cfg
+        if not self._has_contacts:
+            z = self._zeros_n
+            return z, z, self._false_n, z
         active = self.c_active
-        if not active.any():
-            z = torch.zeros(self.n, device=self.device)
-            return z, z, torch.zeros(self.n, device=self.device, dtype=torch.bool), z
-
-        own_vx = self.speed * torch.sin(self.heading) + self.cur_speed * self.cur_sin
-        own_vy = self.speed * torch.cos(self.heading) + self.cur_speed * self.cur_cos
-        c_vx = self.c_sog * torch.sin(self.c_cog)
-        c_vy = self.c_sog * torch.cos(self.c_cog)
+        own_vx, own_vy = self._own_ground_velocity()
 
         rx = self.c_x - self.x.unsqueeze(1)
         ry = self.c_y - self.y.unsqueeze(1)
-        vx = c_vx - own_vx.unsqueeze(1)
-        vy = c_vy - own_vy.unsqueeze(1)
+        vx = self.c_vx - own_vx.unsqueeze(1)
+        vy = self.c_vy - own_vy.unsqueeze(1)
         v2 = (vx * vx + vy * vy).clamp(min=1e-8)
         tcpa = -(rx * vx + ry * vy) / v2
-        cpa_x = rx + vx * tcpa
-        cpa_y = ry + vy * tcpa
-        cpa_m = torch.hypot(cpa_x, cpa_y)
+        cpa_m = torch.hypot(rx + vx * tcpa, ry + vy * tcpa)
 
         safe = self.cfg.own_radius_m + self.c_radius + P.CPA_MARGIN_M
         dist = torch.hypot(rx, ry)
@@ -269,24 +140,18 @@ class BatchedBoatSim:
         hard = in_horizon & (cpa_m < safe)
         warn = in_horizon & ~hard & (cpa_m < safe * cfg.cpa_warning_mult)
 
-        frac_hard = torch.where(hard, (safe - cpa_m) / safe.clamp(min=1e-6), torch.zeros_like(cpa_m))
+        frac_hard = torch.where(hard, (safe - cpa_m) / safe.clamp(min=1e-6), 0.0)
         span = safe * (cfg.cpa_warning_mult - 1.0)
         frac_warn = torch.where(
-            warn,
-            (safe * cfg.cpa_warning_mult - cpa_m) / span.clamp(min=1e-6),
-            torch.zeros_like(cpa_m),
+            warn, (safe * cfg.cpa_warning_mult - cpa_m) / span.clamp(min=1e-6), 0.0
         )
-        cpa_penalty = (cfg.w_cpa * frac_hard + cfg.w_cpa_soft * frac_warn) * active.float()
-        cpa_penalty = cpa_penalty.sum(dim=1)
-        threat_hard = torch.where(hard, frac_hard.clamp(0, 1), torch.zeros_like(frac_hard))
-        threat_warn = torch.where(warn, (0.5 * frac_warn).clamp(0, 1), torch.zeros_like(frac_warn))
+        cpa_penalty = (cfg.w_cpa * frac_hard + cfg.w_cpa_soft * frac_warn).sum(dim=1)
+        # frac_* are zero outside hard / warn, so max over slots needs no extra mask.
         threat = torch.maximum(
-            threat_hard.max(dim=1).values,
-            threat_warn.max(dim=1).values,
+            frac_hard.clamp(0, 1).amax(dim=1),
+            (0.5 * frac_warn).clamp(0, 1).amax(dim=1),
         )
-        cpa_unsafe = hard.any(dim=1)
-        collision_any = collision.any(dim=1)
-        return cpa_penalty, threat, collision_any, cpa_unsafe.float()
+        return cpa_penalty, threat, collision.any(dim=1), hard.any(dim=1).float()
 
     def _compute_rewards(
         self,
@@ -299,25 +164,27 @@ class BatchedBoatSim:
         cpa_unsafe: torch.Tensor,
     ) -> Tuple[torch.Tensor, torch.Tensor]:
         cfg = self.reward_cfg
-        n = self.n
-        reward = torch.zeros(n, device=self.device)
-        ghs = self.goal_hold_steps.clone()
+        ghs = self.goal_hold_steps
+        unsafe = cpa_unsafe.bool()
+        zero = torch.zeros_like(curr_goal_range)
 
-        progress_scale = 1.0 + torch.minimum(
-            curr_goal_range / self.initial_goal_range.clamp(min=1.0), torch.ones_like(curr_goal_range)
+        progress_scale = 1.0 + (curr_goal_range / self.initial_goal_range.clamp(min=1.0)).clamp(
+            max=1.0
         )
         retreat = (curr_goal_range - self.prev_goal_range).clamp(min=0.0)
         approach = (self.prev_goal_range - curr_goal_range).clamp(min=0.0)
         threat_thresh = threat >= cfg.threat_progress_thresh
-        threatened = in_goal & (cpa_unsafe.bool() | threat_thresh)
+        threatened = in_goal & (unsafe | threat_thresh)
+        threat_level = torch.maximum(threat, cpa_unsafe)
 
-        prog = torch.where(
+        progress = torch.where(
             threatened,
-            cfg.w_goal_progress * retreat * progress_scale * (1.0 + threat.clamp(min=0)) / 100.0,
+            cfg.w_goal_progress * retreat * progress_scale * (1.0 + threat_level) / 100.0,
             cfg.w_goal_progress * (approach - retreat) * progress_scale / 100.0,
         )
-        reward = reward + prog
+        reward = progress
 
+        cross = zero
         if cfg.w_cross_track > 0.0:
             leg_dx = self.goal_x - self.leg_start_x
             leg_dy = self.goal_y - self.leg_start_y
@@ -326,159 +193,112 @@ class BatchedBoatSim:
             rel_y = self.y - self.leg_start_y
             ct = (rel_x * leg_dy - rel_y * leg_dx).abs() / torch.sqrt(leg_len2)
             norm = ct / max(cfg.cross_track_scale_m, 1e-6)
-            cross = torch.where(
-                in_goal,
-                torch.zeros_like(norm),
-                -cfg.w_cross_track * norm * norm,
-            )
+            cross = torch.where(in_goal, 0.0, -cfg.w_cross_track * norm * norm)
             reward = reward + cross
 
         speed_norm = (self.speed - P.V_MIN_MPS) / max(P.V_MAX_MPS - P.V_MIN_MPS, 1e-6)
         slow_bonus = (1.0 - speed_norm).clamp(min=0.0) ** 2
-        stationary = torch.ones(n, dtype=torch.bool, device=self.device)
+        # No hold credit while CPA-unsafe (matches ``compute_step_reward``'s hold_allowed).
+        hold_allowed = in_goal & ~unsafe
+        overspeed_mask = torch.zeros_like(in_goal)
+        overspeed = zero
         if cfg.gated_hold:
             stationary = self.speed <= cfg.hold_stationary_speed_mps
+            holding = hold_allowed & stationary
+            overspeed_mask = hold_allowed & ~stationary
+            overspeed = torch.where(
+                overspeed_mask,
+                -cfg.w_hold_overspeed
+                * (self.speed - cfg.hold_stationary_speed_mps).clamp(min=0.0)
+                / max(P.V_MAX_MPS, 1e-6),
+                0.0,
+            )
+            reward = reward + overspeed
+        else:
+            holding = hold_allowed
 
-        first_hold = in_goal & stationary & (ghs == 0)
-        arrival = torch.where(
-            first_hold,
-            torch.full((n,), cfg.w_goal_arrival, device=self.device),
-            torch.zeros(n, device=self.device),
-        )
-        early = torch.where(
-            first_hold & (self.max_steps > 0),
-            cfg.w_goal_arrival_early
-            * (1.0 - self.step_count / float(self.max_steps)).clamp(min=0.0),
-            torch.zeros(n, device=self.device),
-        )
-        hold_speed = torch.where(
-            in_goal & stationary,
-            cfg.w_hold_base + cfg.w_hold_speed * slow_bonus,
-            torch.zeros(n, device=self.device),
+        first_hold = holding & (ghs == 0)
+        arrival = torch.where(first_hold, cfg.w_goal_arrival, 0.0) + torch.where(
+            first_hold & (self.max_steps_env > 0),
+            cfg.w_goal_arrival_early * (1.0 - self.step_count / self.max_steps_env).clamp(min=0.0),
+            0.0,
         )
+        hold_speed = torch.where(holding, cfg.w_hold_base + cfg.w_hold_speed * slow_bonus, 0.0)
         hold_center = torch.where(
-            in_goal & stationary,
-            -cfg.w_hold_center * (curr_goal_range / P.GOAL_SUCCESS_RANGE_M),
-            torch.zeros(n, device=self.device),
+            holding, -cfg.w_hold_center * (curr_goal_range / P.GOAL_SUCCESS_RANGE_M), 0.0
         )
-        overspeed = torch.where(
-            in_goal & cfg.gated_hold & ~stationary & ~cpa_unsafe.bool(),
-            -cfg.w_hold_overspeed
-            * (self.speed - cfg.hold_stationary_speed_mps).clamp(min=0.0)
-            / max(P.V_MAX_MPS, 1e-6),
-            torch.zeros(n, device=self.device),
-        )
-        stay_threat = torch.where(
-            in_goal & (cpa_unsafe.bool() | threat_thresh),
-            -cfg.w_goal_threat_stay * torch.maximum(threat, cpa_unsafe),
-            torch.zeros(n, device=self.device),
-        )
-        reward = reward + arrival + early + hold_speed + hold_center + overspeed + stay_threat
+        stay = torch.where(threatened, -cfg.w_goal_threat_stay * threat_level, 0.0)
+        reward = reward + arrival + hold_speed + hold_center + stay
 
-        ghs = torch.where(
-            in_goal & stationary & ~cpa_unsafe.bool(),
-            ghs + 1.0,
-            torch.where(in_goal, ghs, torch.zeros_like(ghs)),
-        )
+        ghs = torch.where(holding, ghs + 1.0, torch.where(in_goal, ghs, 0.0))
 
+        approach_mask = ~in_goal & (curr_goal_range < cfg.approach_slow_range_m)
         approach_prox = (1.0 - curr_goal_range / cfg.approach_slow_range_m).clamp(min=0.0)
-        approach_r = torch.where(
-            ~in_goal & (curr_goal_range < cfg.approach_slow_range_m),
-            cfg.w_approach_slow * approach_prox * slow_bonus,
-            torch.zeros(n, device=self.device),
-        )
-        reward = reward + approach_r
+        approach_slow = torch.where(approach_mask, cfg.w_approach_slow * approach_prox * slow_bonus, 0.0)
+        reward = reward + approach_slow
 
         smooth = -cfg.w_smooth * torch.linalg.vector_norm(actions - self.prev_action, dim=1)
-        reward = reward + smooth - cpa_penalty
-        reward = torch.where(collision, reward - cfg.w_collision, reward)
+        collide = torch.where(collision, -cfg.w_collision, 0.0)
+        reward = reward + smooth - cpa_penalty + collide
+        if self.cfg.reward_breakdown:
+            always = torch.ones_like(in_goal)
+            self.reward_terms = {
+                "progress": (progress, always),
+                "cross_track": (cross, ~in_goal),
+                "hold_overspeed": (overspeed, overspeed_mask),
+                "goal_arrival": (arrival, first_hold),
+                "hold_speed": (hold_speed, holding),
+                "hold_center": (hold_center, holding),
+                "goal_threat_stay": (stay, threatened),
+                "approach_slow": (approach_slow, approach_mask),
+                "smooth": (smooth, always),
+                "cpa": (-cpa_penalty, always),
+                "collision": (collide, collision),
+            }
         reward = torch.clamp(reward, -cfg.reward_clip, cfg.reward_clip)
-        reward = torch.where(torch.isfinite(reward), reward, torch.zeros_like(reward))
+        reward = torch.nan_to_num(reward, nan=0.0, posinf=0.0, neginf=0.0)
         self.goal_hold_steps = ghs
         return reward, ghs
 
-    def _pack_obs(self) -> torch.Tensor:
-        obs = self._obs
-        obs.zero_()
-        n = self.n
-        obs[:, 0] = self.heading / PI
-        obs[:, 1] = self.speed / P.SPEED_SCALE_MPS
-        obs[:, 2] = self.yaw_rate / P.YAW_RATE_SCALE_RPS
-        obs[:, 3] = (self.x - self.origin_x) / P.POS_SCALE_M
-        obs[:, 4] = (self.y - self.origin_y) / P.POS_SCALE_M
-        obs[:, 6] = self.cur_speed / max(P.CURRENT_MAX_MPS, 1e-6)
-        obs[:, 7] = self.cur_sin
-        obs[:, 8] = self.cur_cos
-
-        active = self.c_active
-        if active.any():
-            dx = self.c_x - self.x.unsqueeze(1)
-            dy = self.c_y - self.y.unsqueeze(1)
-            dist = torch.hypot(dx, dy)
-            brg = torch.atan2(dx, dy)
-            # argsort contacts by range per env
-            dist_masked = torch.where(active, dist, torch.full_like(dist, 1e9))
-            order = torch.argsort(dist_masked, dim=1)
-            own_vx_n = self.speed * torch.sin(self.heading) + self.cur_speed * self.cur_sin
-            own_vy_n = self.speed * torch.cos(self.heading) + self.cur_speed * self.cur_cos
-            base = 9
-            contact_dim = P.OBS_CONTACT_DIM
-            batch_idx = torch.arange(n, device=self.device)
-            for slot in range(K_MAX):
-                idx = order[:, slot]
-                d = dist[batch_idx, idx]
-                b = brg[batch_idx, idx]
-                cog = self.c_cog[batch_idx, idx]
-                sog = self.c_sog[batch_idx, idx]
-                rad = self.c_radius[batch_idx, idx]
-                is_on = active[batch_idx, idx]
-                h = self.heading
-                cvx = sog * torch.sin(cog)
-                cvy = sog * torch.cos(cog)
-                rvx = cvx - own_vx_n
-                rvy = cvy - own_vy_n
-                sh = torch.sin(h)
-                ch = torch.cos(h)
-                rel_fwd = rvx * sh + rvy * ch
-                rel_stbd = rvx * ch - rvy * sh
-                rel_cog = torch.atan2(torch.sin(cog - h), torch.cos(cog - h))
-                off = base + slot * contact_dim
-                obs[:, off + 0] = torch.where(is_on, torch.sin(b), torch.zeros_like(b))
-                obs[:, off + 1] = torch.where(is_on, torch.cos(b), torch.zeros_like(b))
-                obs[:, off + 2] = torch.where(is_on, (d / P.RANGE_SCALE_M).clamp(max=1.0), torch.zeros_like(d))
-                obs[:, off + 3] = torch.where(is_on, torch.sin(rel_cog), torch.zeros_like(rel_cog))
-                obs[:, off + 4] = torch.where(is_on, torch.cos(rel_cog), torch.zeros_like(rel_cog))
-                obs[:, off + 5] = torch.where(
-                    is_on, rel_fwd / P.REL_VEL_SCALE_MPS, torch.zeros_like(rel_fwd)
-                )
-                obs[:, off + 6] = torch.where(
-                    is_on, rel_stbd / P.REL_VEL_SCALE_MPS, torch.zeros_like(rel_stbd)
-                )
-                obs[:, off + 7] = torch.where(is_on, rad / P.RADIUS_SCALE_M, torch.zeros_like(rad))
-                mask_i = base + K_MAX * contact_dim + slot
-                obs[:, mask_i] = is_on.float()
-
-        gdx = self.goal_x - self.x
-        gdy = self.goal_y - self.y
-        gdist = torch.hypot(gdx, gdy)
-        gbrg = torch.atan2(gdx, gdy)
-        gb = P.OBS_GOAL_OFFSET
-        obs[:, gb + 0] = torch.sin(gbrg)
-        obs[:, gb + 1] = torch.cos(gbrg)
-        obs[:, gb + 2] = (gdist / P.RANGE_SCALE_M).clamp(max=1.0)
-        obs[:, gb + 3] = 1.0
-        obs[:, P.OBS_HAS_GOAL_OFFSET] = 1.0
-        return obs
+    def _pack_contacts(
+        self,
+        out: torch.Tensor,
+        feats: Sequence[torch.Tensor],
+        active: torch.Tensor,
+        dist: torch.Tensor,
+        rows: Optional[torch.Tensor],
+    ) -> None:
+        n = out.shape[0]
+        block = torch.where(active.unsqueeze(2), torch.stack(tuple(feats), dim=2), 0.0)
+        # Single gather over the range order fills all K_MAX slots at once.
+        order = torch.argsort(torch.where(active, dist, 1e9), dim=1, stable=True)
+        sorted_feats = block.gather(1, order.unsqueeze(2).expand(n, K_MAX, P.OBS_CONTACT_DIM))
+        self._obs_contacts(out).copy_(sorted_feats)
+        out[:, P.OBS_MASK_OFFSET : P.OBS_GOAL_OFFSET] = active.gather(1, order).float()
+
+    def _advance_leg(self, mask: torch.Tensor, head: torch.Tensor) -> None:
+        """Vectorized ``NavigationMission._pop_and_advance`` + ``_apply_mission_transition``."""
+        self.goal_x = torch.where(mask, self._at_head(self.m_x, head), self.goal_x)
+        self.goal_y = torch.where(mask, self._at_head(self.m_y, head), self.goal_y)
+        self.leg_start_x = torch.where(mask, self.x, self.leg_start_x)
+        self.leg_start_y = torch.where(mask, self.y, self.leg_start_y)
+        gr = self._goal_range()
+        self.initial_goal_range = torch.where(mask, gr, self.initial_goal_range)
+        self.prev_goal_range = torch.where(mask, gr, self.prev_goal_range)
+        self.goal_hold_steps = torch.where(
+            mask, torch.zeros_like(self.goal_hold_steps), self.goal_hold_steps
+        )
+        self.m_leg = self.m_leg + mask.long()
 
-    def step(
-        self, actions: torch.Tensor
-    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
-        """Returns obs, reward, done, truncated."""
-        actions = actions.to(self.device, dtype=torch.float32)
+    def _step_core(
+        self, actions: torch.Tensor, obs: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Branch-free (on tensor data) physics + reward + obs; the torch.compile target."""
         self._apply_action(actions)
         self._step_plant()
         self._step_contacts()
         self.step_count = self.step_count + 1.0
+        scheduled = self._check_scheduled() if self._missions_active else self._false_n
 
         curr_goal_range = self._goal_range()
         in_goal = curr_goal_range < P.GOAL_SUCCESS_RANGE_M
@@ -489,59 +309,65 @@ class BatchedBoatSim:
         )
 
         hold_complete = self.goal_hold_steps >= float(self.goal_hold_required)
-        terminated = collision | (hold_complete & in_goal)
-        truncated = self.step_count >= float(self.max_steps)
-        done = terminated | truncated
-
-        obs = self._pack_obs()
         self.prev_goal_range = curr_goal_range
-        self.prev_action = actions.clone()
+        if self._missions_active:
+            hold_advanced = self._check_hold_advance(in_goal, scheduled)
+            goal_changed = scheduled | hold_advanced
+            hold_complete = hold_complete & ~hold_advanced
+            final_leg = (self.m_leg + 1) >= self.m_legs
+            hold_done = hold_complete & in_goal & final_leg & ~goal_changed
+        else:
+            hold_done = hold_complete & in_goal
+        terminated = collision | hold_done
+        truncated = self.step_count >= self.max_steps_env
+
+        self.success = hold_done & ~collision & (cpa_unsafe == 0.0)
+        self.collision = collision
+        self.goal_range = curr_goal_range
+        self.cpa_unsafe = cpa_unsafe
+        self.ep_return = self.ep_return + reward
+        self.episode_count = self.episode_count + (terminated | truncated).long()
+        self.success_count = self.success_count + self.success.long()
+        self.collision_count = self.collision_count + collision.long()
+
+        self._write_obs(obs)
+        self.prev_action.copy_(actions)
+        return reward, terminated, truncated
 
-        if self.cfg.auto_reset and done.any():
-            self._reset_indices(torch.nonzero(done, as_tuple=False).squeeze(1))
+    def step(
+        self, actions: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Returns obs, reward, terminated, truncated.
+
+        ``obs`` is one of two preallocated buffers: it stays valid through the next
+        ``step()`` call and is overwritten by the one after. With ``auto_reset``, rows
+        that finished hold their first post-reset obs (SB3 convention) and
+        ``self.finished`` carries their terminal obs and episode stats (``None`` when
+        nothing finished this step).
+        """
+        actions = actions.to(self.device, dtype=torch.float32)
+        obs = self._next_obs_buffer()
+        reward, terminated, truncated = self._step_fn(actions, obs)
+
+        self.finished = None
+        if self.cfg.auto_reset:
+            done = terminated | truncated
+            if done.any():
+                idx = torch.nonzero(done, as_tuple=False).squeeze(1)
+                self.finished = FinishedEpisodes(
+                    index=idx,
+                    terminal_obs=obs.index_select(0, idx),
+                    ep_return=self.ep_return.index_select(0, idx),
+                    ep_length=self.step_count.index_select(0, idx),
+                    success=self.success.index_select(0, idx),
+                    collision=self.collision.index_select(0, idx),
+                    truncated=(truncated & ~terminated).index_select(0, idx),
+                )
+                self._reset_indices(idx)
+                self._write_obs(obs, idx)
 
         return obs, reward, terminated, truncated
 
-    def sync_from_cpu_env(self, env: Any, indices: Optional[torch.Tensor] = None) -> None:
-        """Copy state from a CPU BoatNavEnv into batch rows (for parity tests)."""
-        if indices is None:
-            indices = torch.arange(self.n, device=self.device)
-        for j, i in enumerate(indices.tolist()):
-            self.x[i] = env.own.x_m
-            self.y[i] = env.own.y_m
-            self.heading[i] = env.own.heading_rad
-            self.speed[i] = env.own.speed_mps
-            self.yaw_rate[i] = env.own.yaw_rate_rps
-            self.cmd_heading[i] = env.own.cmd_heading_rad
-            self.cmd_speed[i] = env.own.cmd_speed_mps
-            self.origin_x[i] = env.origin_x
-            self.origin_y[i] = env.origin_y
-            self.goal_x[i] = env.goal_x
-            self.goal_y[i] = env.goal_y
-            self.leg_start_x[i] = env.leg_start_x
-            self.leg_start_y[i] = env.leg_start_y
-            self.prev_goal_range[i] = env.prev_goal_range
-            self.initial_goal_range[i] = env.initial_goal_range
-            self.goal_hold_steps[i] = float(env.goal_hold_steps)
-            self.step_count[i] = float(env.step_count)
-            self.prev_action[i] = torch.as_tensor(env.prev_action, device=self.device)
-            self.tau_h[i] = env.plant.tau_heading_s
-            self.tau_s[i] = env.plant.tau_speed_s
-            self.max_yaw[i] = env.plant.max_yaw_rate_rps
-            cur = env.water_current
-            dr = cur.direction_rad
-            self.cur_speed[i] = cur.speed_mps
-            self.cur_sin[i] = math.sin(dr)
-            self.cur_cos[i] = math.cos(dr)
-            self.c_active[i] = False
-            for slot, c in enumerate(env.contacts[:K_MAX]):
-                self.c_x[i, slot] = c.x_m
-                self.c_y[i, slot] = c.y_m
-                self.c_cog[i, slot] = c.cog_rad
-                self.c_sog[i, slot] = c.sog_mps
-                self.c_radius[i, slot] = c.radius_m
-                self.c_active[i, slot] = True
-
     def step_numpy(
         self, actions: np.ndarray
     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
@@ -1,18 +1,25 @@
 """HTTP API integration tests — starts serve.py handler on ephemeral port."""
 
+import gzip
+import http.client
 import json
+import os
 import socket
 import sys
+import tempfile
 import threading
 import unittest
 import urllib.error
 import urllib.request
 from http.server import ThreadingHTTPServer
 from pathlib import Path
+from unittest import mock
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
+import serve  # noqa: E402
+from http_encoding import negotiate_encoding, parse_range  # noqa: E402
 from serve import API_VERSION, Handler, VIZ_DIR  # noqa: E402
 
 
@@ -102,6 +109,29 @@ class TestHttpApi(unittest.TestCase):
         data = get_json(self.base, "/api/runs")
         self.assertIn("runs", data)
 
+    def test_runs_paging_and_fields(self):
+        data = get_json(self.base, "/api/runs?limit=1&fields=id,score")
+        self.assertLessEqual(len(data["runs"]), 1)
+        self.assertIn("total", data)
+        for run in data["runs"]:
+            self.assertEqual(set(run), {"id", "score"})
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            get_json(self.base, "/api/history?fields=nope")
+        self.assertEqual(ctx.exception.code, 400)
+
+    def test_train_stream_sends_status_event(self):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+        try:
+            conn.request("GET", "/api/train/stream")
+            resp = conn.getresponse()
+            self.assertEqual(resp.getheader("Content-Type"), "text/event-stream")
+            lines = [resp.fp.readline().decode("utf-8").strip() for _ in range(4)]
+        finally:
+            conn.close()
+        self.assertIn("event: status", lines)
+        status = json.loads(lines[lines.index("event: status") + 1][len("data: "):])
+        self.assertIn("state", status)
+
     def test_scenarios_is_json(self):
         data = get_json(self.base, "/api/scenarios")
         self.assertIn("count", data)
@@ -355,5 +385,103 @@ class TestHttpApi(unittest.TestCase):
         self.assertIn("live", frame0)
 
 
+class TestHttpEncoding(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.port = free_port()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", cls.port), Handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        runs = Path(self._tmp.name)
+        self.run_dir = runs / "20260101_000001"
+        self.run_dir.mkdir()
+        (self.run_dir / "metrics.json").write_text(json.dumps({"mode": "navigate", "notes": "x" * 4000}))
+        (self.run_dir / "eval_traces.json").write_text(json.dumps({"episodes": [{"scenario_name": "a"}]}))
+        (self.run_dir / "eval_step_montage.png").write_bytes(bytes(range(256)) * 20)
+        patcher = mock.patch.object(serve, "RUNS_DIR", runs)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def request(self, path, **headers):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            return resp.status, dict(resp.getheaders()), resp.read()
+        finally:
+            conn.close()
+
+    def test_negotiation_and_range_parsing(self):
+        self.assertEqual(negotiate_encoding("gzip, deflate"), "gzip")
+        self.assertIsNone(negotiate_encoding("gzip;q=0, identity"))
+        self.assertIsNone(negotiate_encoding(None))
+        self.assertEqual(parse_range("bytes=10-19", 100), (10, 19))
+        self.assertEqual(parse_range("bytes=-10", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=90-", 100), (90, 99))
+        self.assertIsNone(parse_range("bytes=0-1,5-6", 100))
+        with self.assertRaises(ValueError):
+            parse_range("bytes=100-", 100)
+
+    def test_run_payload_gzip_etag_and_precompressed_file(self):
+        path = "/api/runs/20260101_000001"
+        status, headers, plain = self.request(path)
+        self.assertEqual(status, 200)
+        self.assertNotIn("Content-Encoding", headers)
+        payload = json.loads(plain)
+        self.assertEqual(payload["run_id"], "20260101_000001")
+        self.assertEqual(payload["traces"]["episodes"][0]["scenario_name"], "a")
+
+        status, gz_headers, body = self.request(path, **{"Accept-Encoding": "gzip"})
+        self.assertEqual(gz_headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(body), plain)
+        self.assertTrue((self.run_dir / "run_payload.json.gz").exists())
+        self.assertNotEqual(gz_headers["ETag"], headers["ETag"])
+
+        status, _, body = self.request(path, **{"If-None-Match": headers["ETag"]})
+        self.assertEqual((status, body), (304, b""))
+
+        (self.run_dir / "metrics.json").write_text(json.dumps({"mode": "avoid", "notes": "y" * 4000}))
+        os.utime(self.run_dir / "metrics.json", ns=(1, 10**18))
+        status, fresh, body = self.request(path, **{"If-None-Match": headers["ETag"]})
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["metrics"]["mode"], "avoid")
+        self.assertNotEqual(fresh["ETag"], headers["ETag"])
+
+    def test_json_api_etag(self):
+        status, headers, _ = self.request("/api/runs")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Cache-Control"], "no-store")
+        status, _, _ = self.request("/api/runs", **{"If-None-Match": headers["ETag"]})
+        self.assertEqual(status, 304)
+
+    def test_montage_range_requests(self):
+        path = "/api/runs/20260101_000001/step_montage.png"
+        status, headers, body = self.request(path, Range="bytes=10-19")
+        self.assertEqual(status, 206)
+        self.assertEqual(body, bytes(range(10, 20)))
+        self.assertEqual(headers["Content-Range"], "bytes 10-19/5120")
+        status, _, body = self.request(path, Range="bytes=0-1", **{"If-Range": '"stale"'})
+        self.assertEqual((status, len(body)), (200, 5120))
+        status, headers, _ = self.request(path, Range="bytes=6000-")
+        self.assertEqual(status, 416)
+        self.assertEqual(headers["Content-Range"], "bytes */5120")
+
+    def test_static_js_gzip(self):
+        status, headers, body = self.request("/train.js", **{"Accept-Encoding": "gzip"})
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(body), (VIZ_DIR / "train.js").read_bytes())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,6 @@
 """Core sim, scenarios, and metrics tests (no server required)."""
 
+import copy
 import json
 import math
 import sys
@@ -50,6 +51,69 @@ class TestObservationLayout(unittest.TestCase):
             self.assertGreaterEqual(cur.speed_mps, 0.0)
 
 
+class TestContactTable(unittest.TestCase):
+    def _contacts(self, n):
+        return [
+            P.ContactState(
+                x_m=100.0 * i,
+                y_m=-50.0 * i,
+                cog_rad=0.3 * i,
+                sog_mps=1.0 + i,
+                speed_mps=1.0 + i,
+                radius_m=10.0 + i,
+                vessel_class="ferry" if i % 2 else "workboat",
+            )
+            for i in range(n)
+        ]
+
+    def test_views_read_and_write_columns(self):
+        contacts = self._contacts(3)
+        table = P.ContactTable(contacts, capacity=1)
+        self.assertEqual(table, contacts)
+        self.assertEqual(table.to_list(), contacts)
+        self.assertGreaterEqual(table.capacity, 3)
+        view = table[1]
+        view.cog_rad = 1.0
+        view.vessel_class = "tug"
+        self.assertEqual(table.cog[1], 1.0)
+        self.assertEqual(table[1].vessel_class, "tug")
+        self.assertEqual((table.vx[1], table.vy[1]), P.velocity_from_cog(1.0, view.sog_mps))
+
+    def test_views_compare_and_copy_by_value(self):
+        contacts = self._contacts(2)
+        table = P.ContactTable(contacts)
+        self.assertEqual(table[0], contacts[0])
+        self.assertEqual(contacts[0], table[0])
+        self.assertNotEqual(table[0], contacts[1])
+        shallow, deep = copy.copy(table[0]), copy.deepcopy(table[0])
+        self.assertIs(type(shallow), P.ContactState)
+        table.x[0] = 99.0
+        # Copies are detached; the view tracks the row.
+        self.assertEqual(shallow, contacts[0])
+        self.assertEqual(deep, contacts[0])
+        self.assertEqual(table[0].x_m, 99.0)
+        self.assertNotEqual(table[0], contacts[0])
+
+    def test_step_and_geometry_match_list(self):
+        own = P.VesselState(x_m=20.0, y_m=-40.0, heading_rad=0.2, speed_mps=3.0)
+        for n in (4, P.CONTACT_VECTORIZE_MIN + 2):
+            contacts = self._contacts(n)
+            table = P.ContactTable(contacts)
+            for c in contacts:
+                c.step(P.DT_S)
+            table.step(P.DT_S)
+            with self.subTest(n=n):
+                self.assertEqual(table, contacts)
+                self.assertEqual(P.min_contact_range(own, table), P.min_contact_range(own, contacts))
+                self.assertEqual(
+                    P.check_collision(own, table, 200.0), P.check_collision(own, contacts, 200.0)
+                )
+                np.testing.assert_array_equal(
+                    P.pack_observation(own, 0.0, 500.0, True, table, 0.0, 0.0),
+                    P.pack_observation(own, 0.0, 500.0, True, contacts, 0.0, 0.0),
+                )
+
+
 class TestScenarioLibrary(unittest.TestCase):
     def test_generate_nonempty(self):
         seeds = SC.generate_all_scenarios()
@@ -0,0 +1,129 @@
+"""Content-addressed eval episode cache."""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import eval_cache as EC
+import eval_parallel as EP
+import prepare as P
+
+
+class TestEvalCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from stable_baselines3 import PPO
+
+        from env import BoatNavEnv
+        from scenario_seeds import eval_seeds_for_mode
+
+        if not P.EVAL_SEEDS_PATH.exists():
+            P.write_scenario_splits()
+        cls.model = PPO("MlpPolicy", BoatNavEnv(mode="avoid"), seed=0, device="cpu")
+        cls.seeds = eval_seeds_for_mode("avoid")[:4]
+        cls.kwargs = dict(
+            mode="avoid",
+            goal_hold_sec=5,
+            max_episode_steps=40,
+            current_enabled=True,
+            plant_jitter=False,
+            nominal_plant=P.plant_from_dict(P.PLANT_NOMINAL),
+            collect_trace=False,
+            collect_breakdown=True,
+        )
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = EC.EvalCache(Path(self._tmp.name), max_bytes=1 << 30)
+        patcher = mock.patch.object(EC, "default_eval_cache", return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._tmp.cleanup)
+
+    def _rollout(self, seeds, **overrides):
+        with mock.patch.object(self.cache, "put", wraps=self.cache.put) as put:
+            episodes = EP.rollout_episodes(
+                self.model, seeds, workers=1, use_cache=True, **{**self.kwargs, **overrides}
+            )
+        return episodes, put.call_count
+
+    def test_hits_skip_rollouts_and_return_same_episodes(self):
+        first, rolled = self._rollout(self.seeds[:2])
+        self.assertEqual(rolled, 2)
+        again, rolled = self._rollout(self.seeds)
+        self.assertEqual(rolled, 2)  # only the two new scenarios
+        self.assertEqual(again[:2], first)
+        self.assertEqual([ep["seed"] for ep in again], [s.seed for s in self.seeds])
+        _, rolled = self._rollout(self.seeds)
+        self.assertEqual(rolled, 0)
+
+    def test_key_covers_weights_config_and_scenario(self):
+        import torch
+
+        cfg = EP._worker_config_dict(model_path="a", **self.kwargs)
+        base = EC.episode_keys(self.model, self.seeds[:2], cfg, engine="episode")
+        self.assertNotEqual(base[0], base[1])
+        other_path = EP._worker_config_dict(model_path="b", **self.kwargs)
+        self.assertEqual(EC.episode_keys(self.model, self.seeds[:2], other_path, engine="episode"), base)
+        longer = EP._worker_config_dict(model_path="a", **{**self.kwargs, "max_episode_steps": 41})
+        self.assertNotEqual(EC.episode_keys(self.model, self.seeds[:1], longer, engine="episode")[0], base[0])
+        self.assertNotEqual(EC.episode_keys(self.model, self.seeds[:1], cfg, engine="lockstep")[0], base[0])
+        bias = self.model.policy.action_net.bias
+        with torch.no_grad():
+            bias.add_(0.1)
+        try:
+            self.assertNotEqual(EC.episode_keys(self.model, self.seeds[:1], cfg, engine="episode")[0], base[0])
+        finally:
+            with torch.no_grad():
+                bias.sub_(0.1)
+        self.assertEqual(EC.episode_keys(self.model, self.seeds[:1], cfg, engine="episode")[0], base[0])
+
+    def test_colregs_config_change_is_a_miss(self):
+        import colregs.config
+
+        _, rolled = self._rollout(self.seeds[:2], score_colregs=True)
+        self.assertEqual(rolled, 2)
+        _, rolled = self._rollout(self.seeds[:2], score_colregs=True)
+        self.assertEqual(rolled, 0)
+        edited = Path(self._tmp.name) / "colregs_config.json"
+        edited.write_text('{"R_detect_m": 1234.0}', encoding="utf-8")
+        with mock.patch.object(colregs.config, "DEFAULT_CONFIG_PATH", edited):
+            episodes, rolled = self._rollout(self.seeds[:2], score_colregs=True)
+        self.assertEqual(rolled, 2)
+        self.assertTrue(all("colregs" in ep for ep in episodes))
+        # Unscored episodes do not depend on the COLREGS config.
+        self._rollout(self.seeds[:2])
+        with mock.patch.object(colregs.config, "DEFAULT_CONFIG_PATH", edited):
+            _, rolled = self._rollout(self.seeds[:2])
+        self.assertEqual(rolled, 0)
+
+    def test_lru_eviction_keeps_recent_entries(self):
+        import os
+        import time
+
+        for i in range(6):
+            self.cache.put(f"{i:02d}" + "0" * 62, {"i": i, "pad": "x" * 1000})
+            path = self.cache.path(f"{i:02d}" + "0" * 62)
+            os.utime(path, ns=(time.time_ns(), 1_000_000_000 * (i + 1)))
+        self.cache.get("00" + "0" * 62)  # touch the oldest: now most recent
+        self.cache.max_bytes = self.cache.size_bytes() // 2
+        self.assertGreater(self.cache.evict(), 0)
+        self.assertLessEqual(self.cache.size_bytes(), self.cache.max_bytes)
+        self.assertEqual(self.cache.get("00" + "0" * 62)["i"], 0)
+        self.assertIsNone(self.cache.get("01" + "0" * 62))
+
+    def test_corrupt_entry_is_a_miss(self):
+        key = "ab" + "0" * 62
+        self.cache.path(key).parent.mkdir(parents=True)
+        self.cache.path(key).write_bytes(b"not a pickle")
+        self.assertIsNone(self.cache.get(key))
+        self.assertFalse(self.cache.path(key).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -375,5 +375,311 @@ class TestAsyncEvalRunner(unittest.TestCase):
         runner.shutdown()
 
 
+class _HomingPolicy:
+    """Steers at the goal and slows inside it: reaches goals (and hits traffic) untrained."""
+
+    def predict(self, obs, deterministic=True):
+        import numpy as np
+
+        o = np.asarray(obs, dtype=np.float32).reshape(-1, P.OBS_DIM)
+        g = P.OBS_GOAL_OFFSET
+        heading = np.arctan2(o[:, g], o[:, g + 1]) / np.pi
+        speed = np.clip(o[:, g + 2] * P.RANGE_SCALE_M / 40.0 - 1.0, -1.0, 1.0)
+        action = np.stack([heading, speed], axis=1).astype(np.float32)
+        return (action if np.ndim(obs) == 2 else action[0]), None
+
+
+class TestBatchedEvalEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not P.EVAL_SEEDS_PATH.exists():
+            P.write_scenario_splits()
+
+    def test_full_length_outcomes_match_per_category(self):
+        from eval_batched import rollout_episodes_batched
+        from scenario_seeds import eval_seeds_for_mode
+
+        outcomes = {"success": 0, "collision": 0}
+        for mode in ("navigate", "avoid"):
+            per_category = {}
+            for seed in eval_seeds_for_mode(mode):
+                per_category.setdefault(seed.category, []).append(seed)
+            seeds = [s for group in per_category.values() for s in group[:3]]
+            kwargs = dict(
+                mode=mode,
+                goal_hold_sec=P.DEFAULT_GOAL_HOLD_SEC,
+                max_episode_steps=P.MAX_STEPS,
+                current_enabled=True,
+                plant_jitter=True,
+                nominal_plant=P.plant_from_dict(P.PLANT_NOMINAL),
+                collect_breakdown=False,
+            )
+            ref = rollout_episodes_sequential(_HomingPolicy(), seeds, collect_trace=False, **kwargs)
+            got = rollout_episodes_batched(_HomingPolicy(), seeds, **kwargs)
+            for seed, a, b in zip(seeds, ref, got):
+                for key in ("collision", "success", "entered_goal_zone", "goal_zone_steps"):
+                    self.assertEqual(a[key], b[key], f"{seed.category} {seed.name} {key}")
+            for key in outcomes:
+                outcomes[key] += sum(bool(ep[key]) for ep in ref)
+        # The sample exercises both outcomes, so equal rates are not vacuous.
+        self.assertGreater(outcomes["success"], 0)
+        self.assertGreater(outcomes["collision"], 0)
+
+    def test_matches_sequential_rollouts(self):
+        from stable_baselines3 import PPO
+
+        from env import BoatNavEnv
+        from eval_batched import rollout_episodes_batched
+        from scenario_seeds import eval_seeds_for_mode
+
+        model = PPO("MlpPolicy", BoatNavEnv(mode="avoid"), seed=0, device="cpu")
+        seeds = eval_seeds_for_mode("avoid")[:12]
+        kwargs = dict(
+            mode="avoid",
+            goal_hold_sec=5,
+            max_episode_steps=60,
+            current_enabled=True,
+            plant_jitter=True,
+            nominal_plant=P.plant_from_dict(P.PLANT_NOMINAL),
+            collect_breakdown=True,
+        )
+        ref = rollout_episodes_sequential(model, seeds, collect_trace=False, **kwargs)
+        got = rollout_episodes_batched(model, seeds, **kwargs)
+        self.assertEqual(len(got), len(ref))
+        for a, b in zip(ref, got):
+            self.assertEqual(set(a), set(b))
+            for key in ("collision", "success", "entered_goal_zone", "goal_zone_steps", "plant", "seed"):
+                self.assertEqual(a[key], b[key], key)
+            for key in ("final_goal_range_m", "min_goal_range_m", "mean_speed_mps", "energy_score"):
+                self.assertAlmostEqual(a[key], b[key], delta=0.05 * max(1.0, abs(a[key])))
+            self.assertEqual(set(a["mean_reward_breakdown"]), set(b["mean_reward_breakdown"]))
+            for key, val in a["mean_reward_breakdown"].items():
+                self.assertAlmostEqual(val, b["mean_reward_breakdown"][key], delta=0.02 * max(1.0, abs(val)))
+
+    def test_traces_stay_on_cpu_path(self):
+        import eval_parallel
+
+        seeds = [
+            P.ScenarioSeed(
+                name="t",
+                mode="navigate",
+                seed=1,
+                own_heading_deg=0,
+                own_speed_mps=3,
+                own_x_m=0,
+                own_y_m=0,
+                goal_x_m=0,
+                goal_y_m=100,
+            )
+        ]
+        self.assertTrue(eval_parallel._use_batched_engine(seeds, collect_trace=False))
+        self.assertFalse(eval_parallel._use_batched_engine(seeds, collect_trace=True))
+        with mock.patch.object(eval_parallel, "EVAL_ENGINE", "process"):
+            self.assertFalse(eval_parallel._use_batched_engine(seeds, collect_trace=False))
+
+
+class TestLockstepEval(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from stable_baselines3 import PPO
+
+        from env import BoatNavEnv
+        from scenario_seeds import eval_seeds_for_mode
+
+        if not P.EVAL_SEEDS_PATH.exists():
+            P.write_scenario_splits()
+        cls.model = PPO("MlpPolicy", BoatNavEnv(mode="avoid"), seed=0, device="cpu")
+        cls.seeds = eval_seeds_for_mode("avoid")[:7]
+        cls.kwargs = dict(
+            mode="avoid",
+            goal_hold_sec=5,
+            max_episode_steps=60,
+            current_enabled=True,
+            plant_jitter=True,
+            nominal_plant=P.plant_from_dict(P.PLANT_NOMINAL),
+            collect_trace=True,
+            collect_breakdown=True,
+        )
+
+    def test_matches_sequential_rollouts(self):
+        from eval_parallel import _worker_config_dict, rollout_lockstep
+
+        cfg = _worker_config_dict(model_path="", **self.kwargs)
+        ref = rollout_episodes_sequential(self.model, self.seeds, **self.kwargs)
+        # Width 1 runs the same single-row forwards, so episodes are identical.
+        one = rollout_lockstep(self.model, self.seeds, cfg, block=1)
+        for a, b in zip(ref, one):
+            a.pop("steps"), b.pop("steps")
+            self.assertEqual(a, b)
+        # Wider blocks refill freed slots; stacked forwards differ only in float rounding.
+        ref = rollout_episodes_sequential(self.model, self.seeds, **self.kwargs)
+        got = rollout_lockstep(self.model, self.seeds, cfg, block=3)
+        self.assertEqual([ep["seed"] for ep in got], [s.seed for s in self.seeds])
+        for a, b in zip(ref, got):
+            self.assertEqual(set(a), set(b))
+            self.assertEqual(len(a["steps"]), len(b["steps"]))
+            for key in ("collision", "success", "entered_goal_zone", "goal_zone_steps", "plant", "goal_hold_steps"):
+                self.assertEqual(a[key], b[key], key)
+            for key in ("final_goal_range_m", "min_goal_range_m", "energy_score"):
+                self.assertAlmostEqual(a[key], b[key], delta=1e-5 * max(1.0, abs(a[key])))
+            self.assertEqual(set(a["mean_reward_breakdown"]), set(b["mean_reward_breakdown"]))
+
+    def test_eval_mode_selects_lockstep(self):
+        import eval_parallel
+
+        blocks = eval_parallel.scenario_blocks(self.seeds, 2, lockstep=True)
+        self.assertEqual([len(b) for b in blocks], [4, 3])
+        with mock.patch.object(eval_parallel, "EVAL_MODE", "lockstep"):
+            self.assertTrue(eval_parallel._worker_config_dict(model_path="", **self.kwargs)["lockstep"])
+            with mock.patch.object(eval_parallel, "rollout_lockstep", wraps=eval_parallel.rollout_lockstep) as spy:
+                eval_parallel.rollout_episodes(self.model, self.seeds[:2], workers=1, **self.kwargs)
+            spy.assert_called_once()
+        with mock.patch.object(eval_parallel, "EVAL_MODE", "bogus"):
+            with self.assertRaises(ValueError):
+                eval_parallel.lockstep_enabled()
+
+
+class TestRolloutGrid(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import numpy as np
+        from stable_baselines3 import PPO
+
+        from env import BoatNavEnv
+        from scenario_seeds import eval_seeds_for_mode
+
+        if not P.EVAL_SEEDS_PATH.exists():
+            P.write_scenario_splits()
+        cls.model = PPO("MlpPolicy", BoatNavEnv(mode="avoid"), seed=0, device="cpu")
+        seeds = eval_seeds_for_mode("avoid")[:6]
+        base = dict(
+            mode="avoid",
+            goal_hold_sec=5,
+            max_episode_steps=40,
+            current_enabled=True,
+            plant_jitter=False,
+            collect_trace=False,
+            collect_breakdown=True,
+        )
+        cls.groups = [
+            (seeds[:3], {**base, "nominal_plant": P.plant_from_dict(P.PLANT_NOMINAL)}),
+            (seeds[3:], {**base, "nominal_plant": P.sample_plant_params(np.random.default_rng(1))}),
+        ]
+
+    def setUp(self):
+        import eval_cache
+
+        patcher = mock.patch.object(eval_cache, "EVAL_CACHE", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_groups_match_separate_rollouts(self):
+        import eval_parallel
+
+        for engine in ("auto", "process"):
+            with mock.patch.object(eval_parallel, "EVAL_ENGINE", engine):
+                grid = eval_parallel.rollout_grid(self.model, self.groups, workers=1)
+                for (seeds, kw), got in zip(self.groups, grid):
+                    ref = eval_parallel.rollout_episodes(self.model, seeds, workers=1, **kw)
+                    self.assertEqual([ep["plant"] for ep in got], [ep["plant"] for ep in ref])
+                    for a, b in zip(ref, got):
+                        self.assertAlmostEqual(a["final_goal_range_m"], b["final_goal_range_m"], places=6)
+
+    def test_on_group_false_stops_remaining_groups(self):
+        import eval_parallel
+
+        for engine, stream in (("process", False), ("auto", True)):
+            seen = []
+            with mock.patch.object(eval_parallel, "EVAL_ENGINE", engine):
+                grid = eval_parallel.rollout_grid(
+                    self.model,
+                    self.groups,
+                    workers=1,
+                    on_group=lambda g, eps: seen.append(g) and False,
+                    stream=stream,
+                )
+            self.assertEqual(seen, [0], engine)
+            self.assertIsNotNone(grid[0])
+            self.assertIsNone(grid[1])
+
+    def test_on_group_false_still_finishes_simulated_batch(self):
+        import eval_parallel
+
+        seen = []
+        grid = eval_parallel.rollout_grid(
+            self.model, self.groups, workers=1, on_group=lambda g, eps: seen.append(g) and False
+        )
+        self.assertEqual(seen, [0, 1])
+        self.assertTrue(all(episodes is not None for episodes in grid))
+
+    def test_robust_eval_early_exit_below_gate(self):
+        import eval_batched
+        import train_config as C
+        from curriculum import get_phase
+        from eval_runner import run_robust_eval
+
+        rows = []
+        real = eval_batched.rollout_episodes_batched
+
+        def counting(model, scenarios, **kw):
+            rows.append(len(scenarios))
+            return real(model, scenarios, **kw)
+
+        with mock.patch.object(eval_batched, "rollout_episodes_batched", counting):
+            result = run_robust_eval(self.model, "avoid", gate=get_phase(1))
+        self.assertTrue(result["robust_eval_early_exit"])
+        self.assertFalse(result["robust_eval_gate_passed"])
+        self.assertEqual(result["robust_eval_samples"], 1)
+        self.assertTrue(all(r.startswith("FAIL") for r in result["robust_eval_gate_reasons"]))
+        # The first plant fails the gate, so only its scenarios are simulated.
+        self.assertEqual(rows, [C.ROBUST_EVAL_SCENARIOS])
+
+
+class TestWorkerColregs(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from stable_baselines3 import PPO
+
+        from env import BoatNavEnv
+        from scenario_seeds import eval_seeds_for_mode
+
+        if not P.EVAL_SEEDS_PATH.exists():
+            P.write_scenario_splits()
+        cls.model = PPO("MlpPolicy", BoatNavEnv(mode="avoid"), seed=0, device="cpu")
+        cls.seeds = eval_seeds_for_mode("avoid")[:8]
+
+    def test_rolling_rollup_matches_trace_scoring(self):
+        from colregs.evaluate import evaluate_episode
+        from env import BoatNavEnv
+
+        env = BoatNavEnv(mode="avoid", training_randomize=False)
+        scored = 0
+        for seed in self.seeds:
+            episode = env.rollout_episode(
+                self.model, reset_seed=seed.seed, scenario=seed, collect_trace=True, score_colregs=True
+            )
+            ref = evaluate_episode(episode)
+            got = dict(episode["colregs"])
+            if not ref["encounters"]:
+                self.assertEqual(got.pop("by_rule"), {})
+            self.assertEqual(got, ref)
+            scored += bool(ref["encounters"])
+        self.assertGreater(scored, 0)
+
+    def test_trace_free_eval_reports_colregs(self):
+        from eval_runner import run_eval
+
+        kwargs = dict(max_scenarios=8, sample_seed=5)
+        traced = run_eval(self.model, "avoid", collect_traces=True, **kwargs)
+        bare = run_eval(self.model, "avoid", collect_traces=False, colregs=True, **kwargs)
+        unscored = run_eval(self.model, "avoid", collect_traces=False, **kwargs)
+        self.assertEqual(bare.traces, [])
+        self.assertIsNotNone(bare.metrics["colregs_mean_safety"])
+        for key in ("colregs_mean_safety", "colregs_mean_protocol", "colregs_by_rule", "colregs_episodes_scored"):
+            self.assertEqual(bare.metrics[key], traced.metrics[key], key)
+        self.assertTrue(all("colregs" in ep for ep in traced.traces))
+        self.assertNotIn("colregs_mean_safety", unscored.metrics)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,100 @@
+"""Warm eval pool: shared-memory weight broadcast and worker reuse."""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import prepare as P
+from eval_parallel import _worker_config_dict, rollout_episodes_sequential
+from eval_pool import EvalWorkerPool, capture_weights, load_weights, weight_layout
+
+_KEYS = ("collision", "success", "goal_zone_steps", "final_goal_range_m", "min_goal_range_m", "seed")
+
+
+class TestEvalWorkerPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from stable_baselines3 import PPO
+
+        from env import BoatNavEnv
+        from scenario_seeds import eval_seeds_for_mode
+
+        if not P.EVAL_SEEDS_PATH.exists():
+            P.write_scenario_splits()
+        cls.model = PPO("MlpPolicy", BoatNavEnv(mode="avoid"), seed=0, device="cpu")
+        cls.seeds = eval_seeds_for_mode("avoid")[:6]
+        cls.kwargs = dict(
+            mode="avoid",
+            goal_hold_sec=5,
+            max_episode_steps=60,
+            current_enabled=True,
+            plant_jitter=True,
+            nominal_plant=P.plant_from_dict(P.PLANT_NOMINAL),
+            collect_trace=False,
+            collect_breakdown=False,
+        )
+        cls.cfg = _worker_config_dict(model_path="eval_pool", **cls.kwargs)
+        cls.pool = EvalWorkerPool(cls.model, workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def _assert_same(self, ref, got):
+        self.assertEqual(len(ref), len(got))
+        for a, b in zip(ref, got):
+            for key in _KEYS:
+                self.assertEqual(a[key], b[key], key)
+
+    def test_weights_round_trip(self):
+        layout = weight_layout(self.model)
+        flat = capture_weights(self.model, layout)
+        self.assertEqual(flat.dtype, np.float32)
+        with self.pool.lease(flat) as shadow:
+            np.testing.assert_array_equal(capture_weights(shadow, layout), flat)
+        self.assertTrue(self.pool.compatible(self.model))
+
+    def test_rollout_matches_sequential_and_tracks_new_weights(self):
+        import torch
+
+        executor = self.pool._executor
+        self.assertIsNotNone(executor)
+        ref = rollout_episodes_sequential(self.model, self.seeds, **self.kwargs)
+        self._assert_same(ref, self.pool.rollout(self.model, self.seeds, self.cfg))
+
+        layout = weight_layout(self.model)
+        original = capture_weights(self.model, layout)
+        try:
+            with torch.no_grad():
+                for param in self.model.policy.parameters():
+                    param.add_(torch.randn_like(param) * 0.5)
+            version = self.pool.version
+            ref2 = rollout_episodes_sequential(self.model, self.seeds, **self.kwargs)
+            self._assert_same(ref2, self.pool.rollout(self.model, self.seeds, self.cfg))
+            self.assertGreater(self.pool.version, version)
+            self.assertIs(self.pool._executor, executor)
+        finally:
+            load_weights(self.model, layout, original)
+
+    def test_lockstep_blocks_in_workers(self):
+        import eval_parallel
+
+        with mock.patch.object(eval_parallel, "EVAL_MODE", "lockstep"):
+            cfg = _worker_config_dict(model_path="eval_pool", **self.kwargs)
+        ref = self.pool.rollout(self.model, self.seeds, self.cfg)
+        got = self.pool.rollout(self.model, self.seeds, cfg)
+        self.assertEqual([ep["seed"] for ep in got], [ep["seed"] for ep in ref])
+        for a, b in zip(ref, got):
+            self.assertEqual(set(a), set(b))
+            self.assertEqual(a["success"], b["success"])
+            self.assertAlmostEqual(a["final_goal_range_m"], b["final_goal_range_m"], delta=1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Sequential-testing early stop for gated evals."""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import eval_sequential as SQ
+import prepare as P
+from curriculum import get_phase
+
+
+def _summary(n, *, success, collision=0.0, zone=None, speed=5.5):
+    zone = success if zone is None else zone
+    return {
+        "eval_episodes": n,
+        "success_rate": success,
+        "collision_rate": collision,
+        "zone_entry_rate": zone,
+        "episodes_with_goal_zone_steps": int(round(zone * n)),
+        "mean_speed_mps": speed,
+    }
+
+
+class TestGateDecision(unittest.TestCase):
+    def test_wilson_interval(self):
+        lo, hi = SQ.wilson_interval(0, 20, 1.96)
+        self.assertEqual(lo, 0.0)
+        self.assertLess(hi, 0.2)
+        lo, hi = SQ.wilson_interval(10, 20, 1.96)
+        self.assertLess(lo, 0.5)
+        self.assertGreater(hi, 0.5)
+        self.assertEqual(SQ.wilson_interval(0, 0, 1.96), (0.0, 1.0))
+
+    def test_clear_failure_settles_early(self):
+        phase = get_phase(1)
+        self.assertEqual(SQ.gate_decision(phase, _summary(16, success=0.0), 2, min_episodes=8), "fail")
+
+    def test_clear_pass_needs_every_rate_bound(self):
+        phase = get_phase(1)
+        self.assertEqual(SQ.gate_decision(phase, _summary(160, success=1.0), 5, min_episodes=8), "pass")
+        # Rates settled, but a point-estimate speed gate fails: keep going.
+        self.assertIsNone(SQ.gate_decision(phase, _summary(160, success=1.0, speed=4.0), 5, min_episodes=8))
+        # A 0.1 collision cap cannot be cleared from a few dozen clean episodes.
+        self.assertIsNone(SQ.gate_decision(phase, _summary(48, success=1.0), 3, min_episodes=8))
+
+    def test_borderline_and_small_samples_stay_open(self):
+        phase = get_phase(1)
+        self.assertIsNone(SQ.gate_decision(phase, _summary(48, success=0.5), 3, min_episodes=8))
+        self.assertIsNone(SQ.gate_decision(phase, _summary(4, success=0.0), 1, min_episodes=8))
+
+    def test_later_looks_are_stricter(self):
+        phase = get_phase(1)
+        summary = _summary(12, success=0.5, zone=0.0)
+        self.assertEqual(SQ.gate_decision(phase, summary, 1, min_episodes=8), "fail")
+        self.assertIsNone(SQ.gate_decision(phase, summary, 40, min_episodes=8))
+
+
+class TestSequentialRunEval(unittest.TestCase):
+    def test_stops_once_gate_is_settled(self):
+        from stable_baselines3 import PPO
+
+        from env import BoatNavEnv
+        from eval_runner import run_eval
+
+        if not P.EVAL_SEEDS_PATH.exists():
+            P.write_scenario_splits()
+        model = PPO("MlpPolicy", BoatNavEnv(mode="avoid"), seed=0, device="cpu")
+        kwargs = dict(max_scenarios=160, sample_seed=3, collect_traces=False)
+        with mock.patch.object(SQ, "EVAL_SEQUENTIAL", True), mock.patch.object(
+            SQ, "EVAL_SEQUENTIAL_CHUNK", 16
+        ):
+            # An untrained policy never reaches the goal, so success_rate_min settles it.
+            metrics = run_eval(model, "avoid", gate=get_phase(1), **kwargs).metrics
+            full = run_eval(model, "avoid", **kwargs).metrics
+        self.assertEqual(metrics["sequential_decision"], "fail")
+        self.assertEqual(metrics["eval_episodes_planned"], 160)
+        self.assertLess(metrics["eval_episodes"], 160)
+        self.assertEqual(metrics["eval_episodes"], 16 * metrics["sequential_looks"])
+        self.assertNotIn("sequential_decision", full)
+        self.assertEqual(full["eval_episodes"], 160)
+
+
+if __name__ == "__main__":
+    unittest.main()
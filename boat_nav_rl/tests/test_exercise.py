@@ -0,0 +1,68 @@
+"""Exercise session: one stacked policy forward per tick for any fleet size."""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import exercise as EX  # noqa: E402
+import prepare as P  # noqa: E402
+
+
+class _LinearPolicy:
+    """Deterministic stand-in for PPO.predict that records batch shapes."""
+
+    def __init__(self):
+        rng = np.random.default_rng(0)
+        self.w = rng.normal(0.0, 0.2, size=(P.OBS_DIM, 2)).astype(np.float32)
+        self.shapes = []
+
+    def predict(self, obs, deterministic=True):
+        obs = np.asarray(obs, dtype=np.float32)
+        self.shapes.append(obs.shape)
+        return np.tanh(obs @ self.w), None
+
+
+def _session(n_vessels):
+    with mock.patch.object(EX, "_load_run_metrics", return_value={"mode": "avoid"}), mock.patch.object(
+        EX, "load_policy", return_value=_LinearPolicy()
+    ):
+        return EX.ExerciseSession("fake_run", starts=EX.default_starts(n_vessels))
+
+
+class TestExerciseBatchedStep(unittest.TestCase):
+    def test_default_starts(self):
+        self.assertEqual(EX.default_starts(3), EX.DEFAULT_STARTS)
+        self.assertEqual(len(EX.default_starts(7)), 7)
+
+    def test_one_forward_per_tick_matches_per_vessel_loop(self):
+        batched = _session(5)
+        reference = _session(5)
+        for s in (batched, reference):
+            s.add_intruder(0.0, 100.0, 270.0, 4.0, "freighter")
+        batched.model.shapes.clear()
+        batched.step(4)
+        self.assertEqual(batched.model.shapes, [(5, P.OBS_DIM)] * 4)
+
+        for _ in range(4):
+            for c in reference.contacts:
+                c.step(P.DT_S)
+            for env in reference.vessels:
+                env.contacts = reference.contacts
+                action, _ = reference.model.predict(env._last_obs[None, :])
+                env._last_obs, *_ = env.step(action[0], advance_contacts=False)
+        for a, b in zip(batched.vessels, reference.vessels):
+            np.testing.assert_allclose(a._last_obs, b._last_obs, rtol=1e-5, atol=1e-5)
+            self.assertAlmostEqual(a.own.x_m, b.own.x_m, places=3)
+        state = batched.to_dict()
+        self.assertEqual(len(state["vessels"]), 5)
+        self.assertEqual([v["vessel"] for v in state["colregs"]["vessels"]], list("ABCDE"))
+
+
+if __name__ == "__main__":
+    unittest.main()
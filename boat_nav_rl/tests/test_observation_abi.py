@@ -101,6 +101,80 @@ class TestObservationAbi(unittest.TestCase):
         self.assertAlmostEqual(cos_a, math.cos(math.radians(90.0)), places=5)
         self.assertAlmostEqual(cos_b, 1.0, places=5)
 
+    def _legacy_contact_slots(self, own, contacts, current, rng=None, noise_m=0.0, noise_brg=0.0):
+        """Per-contact reference: bearing_range, per-contact noise draws, sort by sensed range."""
+        rows = []
+        for c in contacts:
+            brg, dist = P.bearing_range(own.x_m, own.y_m, c.x_m, c.y_m)
+            if rng is not None:
+                brg = P.wrap_angle(brg + float(rng.normal(0.0, noise_brg)))
+                dist = max(0.0, dist + float(rng.normal(0.0, noise_m)))
+            s, co, fwd, stbd = P.contact_relative_motion(own, c, current)
+            feat = [
+                math.sin(brg),
+                math.cos(brg),
+                min(dist / P.RANGE_SCALE_M, 1.0),
+                s,
+                co,
+                fwd / P.REL_VEL_SCALE_MPS,
+                stbd / P.REL_VEL_SCALE_MPS,
+                c.radius_m / P.RADIUS_SCALE_M,
+            ]
+            rows.append((dist, feat))
+        rows.sort(key=lambda r: r[0])
+        slots = np.zeros((P.N_MAX_CONTACTS, P.OBS_CONTACT_DIM), dtype=np.float32)
+        for i, (_, feat) in enumerate(rows[: P.N_MAX_CONTACTS]):
+            slots[i] = feat
+        return slots
+
+    def test_contact_slots_match_per_contact_reference(self):
+        own = P.VesselState(x_m=30.0, y_m=-10.0, heading_rad=2.9, speed_mps=3.0)
+        current = P.WaterCurrent(vx_mps=0.2, vy_mps=-0.3)
+        gen = np.random.default_rng(11)
+        base = P.OBS_OWN_DIM + P.OBS_CURRENT_DIM
+        # Scalar path and the array path (>= CONTACT_VECTORIZE_MIN rows, nearest 8 kept).
+        for n in (3, P.CONTACT_VECTORIZE_MIN + 4):
+            contacts = [
+                P.ContactState(
+                    x_m=float(gen.uniform(-900.0, 900.0)),
+                    y_m=float(gen.uniform(-900.0, 900.0)),
+                    cog_rad=float(gen.uniform(-3.0 * math.pi, 3.0 * math.pi)),
+                    sog_mps=float(gen.uniform(0.0, 6.0)),
+                    speed_mps=3.0,
+                    radius_m=float(gen.uniform(5.0, 60.0)),
+                )
+                for _ in range(n)
+            ]
+            for noisy in (False, True):
+                kwargs = {}
+                ref_rng = None
+                if noisy:
+                    kwargs = {
+                        "contact_noise_m": 5.0,
+                        "contact_noise_bearing_rad": 0.03,
+                        "rng": np.random.default_rng(4),
+                    }
+                    ref_rng = np.random.default_rng(4)
+                out = np.full(P.OBS_DIM, 7.0, dtype=np.float32)
+                obs = P.pack_observation(
+                    own, 0.0, 0.0, False, contacts, 0.0, 0.0, current, out, **kwargs
+                )
+                expected = self._legacy_contact_slots(own, contacts, current, ref_rng, 5.0, 0.03)
+                k = min(n, P.N_MAX_CONTACTS)
+                with self.subTest(n=n, noisy=noisy):
+                    self.assertIs(obs, out)
+                    np.testing.assert_allclose(
+                        obs[base:P.OBS_MASK_OFFSET].reshape(P.N_MAX_CONTACTS, P.OBS_CONTACT_DIM),
+                        expected,
+                        atol=1e-6,
+                    )
+                    mask = obs[P.OBS_MASK_OFFSET : P.OBS_GOAL_OFFSET]
+                    np.testing.assert_array_equal(mask[:k], 1.0)
+                    self.assertEqual(mask[k:].sum(), 0.0)
+                    if noisy:
+                        # Batched draws consume the stream exactly like per-contact calls.
+                        self.assertEqual(kwargs["rng"].random(), ref_rng.random())
+
     def test_golden_vector_digest(self):
         """Regression fingerprint — update only when OBS layout changes intentionally."""
         own = P.VesselState(x_m=0.0, y_m=0.0, heading_rad=0.0, speed_mps=2.0)
@@ -95,6 +95,98 @@ class TestSafeModelPredict(unittest.TestCase):
         self.assertEqual(max_active, 1)
 
 
+
+class TestFastPolicy(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from stable_baselines3 import PPO
+
+        from env import BoatNavEnv
+
+        cls.model = PPO("MlpPolicy", BoatNavEnv(mode="avoid"), seed=0, device="cpu")
+        cls.obs = np.random.default_rng(0).normal(0.0, 2.0, (8, P.OBS_DIM)).astype(np.float32)
+
+    def _reference(self, obs):
+        import torch
+
+        with torch.no_grad():
+            return self.model.predict(obs, deterministic=True)[0]
+
+    def test_matches_sb3_predict(self):
+        fast = PI.fast_policy(self.model)
+        self.assertIsInstance(fast, PI.NumpyPolicy)
+        batch, _ = PI.safe_model_predict(self.model, self.obs)
+        np.testing.assert_allclose(batch, self._reference(self.obs), atol=1e-6)
+        single, _ = PI.safe_model_predict(self.model, self.obs[0])
+        self.assertEqual(single.shape, (2,))
+        np.testing.assert_allclose(single, self._reference(self.obs[0]), atol=1e-6)
+
+    def test_rebuilt_after_weight_update(self):
+        import torch
+
+        before = PI.fast_policy(self.model)
+        self.assertIs(PI.fast_policy(self.model), before)
+        head = self.model.policy.action_net.bias
+        with torch.no_grad():
+            head.add_(0.25)
+        try:
+            after = PI.fast_policy(self.model)
+            self.assertIsNot(after, before)
+            np.testing.assert_allclose(after.predict(self.obs)[0], self._reference(self.obs), atol=1e-6)
+        finally:
+            with torch.no_grad():
+                head.sub_(0.25)
+
+    def test_load_from_checkpoint(self):
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "model"
+            self.model.save(str(path))
+            fast = PI.NumpyPolicy.load(path.with_suffix(".zip"))
+        np.testing.assert_allclose(fast.predict(self.obs)[0], self._reference(self.obs), atol=1e-6)
+
+    def test_stochastic_predict_keeps_sb3_path(self):
+        from unittest import mock
+
+        with mock.patch.object(PI, "fast_policy") as fast:
+            PI.safe_model_predict(self.model, self.obs[0], deterministic=False)
+        fast.assert_not_called()
+
+    def test_held_copy_ignores_in_place_updates(self):
+        import torch
+
+        fast = PI.fast_policy(self.model)
+        before = fast.predict(self.obs)[0].copy()
+        bias = self.model.policy.mlp_extractor.policy_net[0].bias
+        with torch.no_grad():
+            bias.add_(1.0)
+        try:
+            np.testing.assert_array_equal(fast.predict(self.obs)[0], before)
+            np.testing.assert_allclose(
+                PI.safe_model_predict(self.model, self.obs)[0], self._reference(self.obs), atol=1e-6
+            )
+        finally:
+            with torch.no_grad():
+                bias.sub_(1.0)
+
+    def test_eval_workers_load_numpy_policy(self):
+        import tempfile
+
+        import eval_parallel
+
+        with tempfile.TemporaryDirectory() as tmp:
+            stem = Path(tmp) / "model"
+            self.model.save(str(stem))
+            eval_parallel._init_eval_worker(str(stem))
+        worker_model = eval_parallel._WORKER_MODEL
+        self.assertIsInstance(worker_model, PI.NumpyPolicy)
+        action, _ = PI.safe_model_predict(worker_model, self.obs)
+        np.testing.assert_allclose(action, self._reference(self.obs), atol=1e-6)
+        with self.assertRaises(ValueError):
+            PI.safe_model_predict(worker_model, self.obs, deterministic=False)
+
+
 class TestLiveEvalAsync(unittest.TestCase):
     def test_live_metrics_callback_uses_async_runner(self):
         from train import LiveMetricsCallback
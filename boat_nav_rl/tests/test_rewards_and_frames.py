@@ -180,6 +180,33 @@ class TestContactStepMetrics(unittest.TestCase):
         self.assertEqual(penalty, metrics.cpa_penalty)
         self.assertEqual(threat, metrics.threat)
 
+    def test_contact_table_matches_list(self):
+        own = P.VesselState(x_m=10.0, y_m=-20.0, heading_rad=0.4, speed_mps=4.0)
+        current = P.WaterCurrent(vx_mps=0.3, vy_mps=-0.1)
+        rng = np.random.default_rng(7)
+        # Scalar and NumPy (>= CONTACT_VECTORIZE_MIN rows) paths; one contact is in collision
+        # range and one is stopped.
+        for n in (5, P.CONTACT_VECTORIZE_MIN + 9):
+            contacts = [
+                P.ContactState(
+                    x_m=float(rng.uniform(-400.0, 400.0)),
+                    y_m=float(rng.uniform(-400.0, 400.0)),
+                    cog_rad=float(rng.uniform(-math.pi, math.pi)),
+                    sog_mps=float(rng.uniform(0.0, 6.0)),
+                    speed_mps=3.0,
+                    radius_m=float(rng.uniform(5.0, 40.0)),
+                )
+                for _ in range(n)
+            ]
+            contacts[0].x_m, contacts[0].y_m = own.x_m + 5.0, own.y_m
+            contacts[-1].sog_mps = 0.0
+            table = P.ContactTable(contacts)
+            with self.subTest(n=n):
+                self.assertEqual(
+                    contact_step_metrics(own, table, current, P.OWN_RADIUS_M),
+                    contact_step_metrics(own, contacts, current, P.OWN_RADIUS_M),
+                )
+
 
 class TestComputeStepReward(unittest.TestCase):
     def test_en_route_breakdown_components(self):
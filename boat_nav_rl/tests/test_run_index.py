@@ -0,0 +1,84 @@
+"""Run index: incremental updates, hand-edit reconcile, paging, and projection."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import run_index as RI
+import serve
+import training_job as TJ
+
+
+class TestRunIndex(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.runs = Path(self._tmp.name)
+        (self.runs / "_training").mkdir()
+        for i in range(1, 4):
+            self._write_run(f"20260101_00000{i}", {"mode": "avoid", "avoid_score": i / 10, "notes": f"n{i}"})
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write_run(self, run_id, metrics):
+        run_dir = self.runs / run_id
+        run_dir.mkdir(exist_ok=True)
+        (run_dir / "metrics.json").write_text(json.dumps(metrics), encoding="utf-8")
+        return run_dir
+
+    def test_reconcile_parses_only_changed_runs(self):
+        self.assertEqual(RI.reconcile(self.runs), {"added": 3, "updated": 0, "removed": 0})
+        with mock.patch.object(RI, "run_record", wraps=RI.run_record) as parse:
+            self.assertEqual(RI.reconcile(self.runs), {"added": 0, "updated": 0, "removed": 0})
+            self.assertEqual(parse.call_count, 0)
+            edited = self._write_run("20260101_000002", {"mode": "navigate", "nav_score": 0.9})
+            os.utime(edited / "metrics.json", ns=(1, 1))
+            shutil.rmtree(self.runs / "20260101_000001")
+            self._write_run("20260101_000004", {"mode": "navigate"})
+            self.assertEqual(RI.reconcile(self.runs), {"added": 1, "updated": 1, "removed": 1})
+            self.assertEqual(parse.call_count, 2)
+        records, total = RI.query_runs(self.runs)
+        self.assertEqual(total, 3)
+        self.assertEqual([r["run_id"] for r in records], ["20260101_000004", "20260101_000003", "20260101_000002"])
+        self.assertEqual(records[2]["score"], 0.9)
+
+    def test_update_run(self):
+        RI.reconcile(self.runs)
+        run_dir = self._write_run("20260101_000003", {"mode": "avoid", "avoid_score": 0.75})
+        RI.update_run(run_dir)
+        with mock.patch.object(RI, "run_record", wraps=RI.run_record) as parse:
+            records, _ = RI.query_runs(self.runs, limit=1)
+            self.assertEqual(parse.call_count, 0)
+        self.assertEqual(records[0]["score"], 0.75)
+        (run_dir / "metrics.json").unlink()
+        RI.update_run(run_dir)
+        self.assertEqual(RI.query_runs(self.runs)[1], 2)
+
+    def test_endpoints_page_and_project(self):
+        (self.runs / "20260101_000005").mkdir()
+        (self.runs / "20260101_000005" / "metrics.json").write_text("{not json", encoding="utf-8")
+        with mock.patch.object(TJ, "RUNS_DIR", self.runs):
+            data = TJ.training_history(limit=2, offset=1, fields=["run_id", "score"])
+        self.assertEqual(data["total"], 3)
+        self.assertEqual(
+            data["runs"],
+            [{"run_id": "20260101_000001", "score": 0.1}, {"run_id": "20260101_000002", "score": 0.2}],
+        )
+        with mock.patch.object(serve, "RUNS_DIR", self.runs):
+            listed = serve.list_runs(limit=2)
+        self.assertEqual(listed["total"], 4)
+        self.assertEqual([r["id"] for r in listed["runs"]], ["20260101_000005", "20260101_000003"])
+        self.assertEqual(listed["runs"][0]["mode"], "?")
+        self.assertEqual(listed["runs"][1]["notes"], "n3")
+
+
+if __name__ == "__main__":
+    unittest.main()
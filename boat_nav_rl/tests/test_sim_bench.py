@@ -0,0 +1,58 @@
+"""Benchmark suite: case sweep, report shape and regression diff."""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sim_bench import bench_cases, compare_bench, run_bench_suite, write_bench_report
+
+
+class TestSimBench(unittest.TestCase):
+    def test_cases_skip_contacts_for_navigate_and_cap_process_backends(self):
+        cases = bench_cases(["subproc", "cpu-batched"], [1, 8, 4096], ["navigate", "avoid"], [1, 8])
+        nav = [c for c in cases if c.mode == "navigate"]
+        self.assertTrue(all(c.max_contacts is None for c in nav))
+        self.assertEqual({c.n_envs for c in cases if c.backend == "subproc"}, {8})
+        self.assertEqual(len([c for c in cases if c.backend == "cpu-batched" and c.mode == "avoid"]), 6)
+
+    def test_suite_writes_json_report(self):
+        report = run_bench_suite(
+            backends=["dummy", "cpu-batched"],
+            n_envs=[2],
+            modes=["avoid"],
+            contacts=[2],
+            steps=3,
+            warmup=1,
+            log=None,
+        )
+        self.assertEqual(len(report["results"]), 2)
+        for row in report["results"]:
+            self.assertGreater(row["env_steps_per_sec"], 0.0)
+            self.assertLessEqual(row["step_ms_p50"], row["step_ms_p99"])
+            self.assertEqual(row["max_contacts"], 2)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_bench_report(report, Path(tmp))
+            self.assertEqual(json.loads(path.read_text()), report)
+            self.assertTrue((Path(tmp) / "latest.json").exists())
+
+    def test_compare_flags_only_drops_beyond_tolerance(self):
+        def report(sps_a, sps_b):
+            return {
+                "results": [
+                    {"backend": "a", "n_envs": 8, "mode": "avoid", "max_contacts": 4, "env_steps_per_sec": sps_a},
+                    {"backend": "b", "n_envs": 8, "mode": "avoid", "max_contacts": 4, "env_steps_per_sec": sps_b},
+                ]
+            }
+
+        regressions = compare_bench(report(1000.0, 1000.0), report(950.0, 700.0), tolerance=0.1)
+        self.assertEqual([r["backend"] for r in regressions], ["b"])
+        self.assertAlmostEqual(regressions[0]["ratio"], 0.7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""NumPy batched sim: parity with BoatNavEnv / BatchedBoatSim and VecEnv smoke."""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import torch
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import prepare as P
+from env import BoatNavEnv
+from sim_numpy import NumpyBatchedBoatSim
+from sim_torch import BatchedBoatSim, BatchedBoatSimConfig
+
+
+class TestSimNumpyParity(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not P.EVAL_SEEDS_PATH.exists():
+            P.write_scenario_splits()
+
+    def _run_vs_cpu(self, seed, goal_hold_sec=0, missions=False, steps=40):
+        cpu = BoatNavEnv(
+            mode="navigate",
+            scenario=seed,
+            training_randomize=False,
+            current_enabled=False,
+            dynamics_jitter=False,
+            goal_hold_sec=goal_hold_sec,
+            max_episode_steps=600,
+        )
+        obs, _ = cpu.reset(seed=seed.seed)
+        cfg = BatchedBoatSimConfig(
+            n_envs=1,
+            max_episode_steps=600,
+            goal_hold_sec=goal_hold_sec,
+            auto_reset=False,
+            train_seeds=[seed] if missions else None,
+            scenario_missions=missions,
+        )
+        sim = NumpyBatchedBoatSim(cfg)
+        sim.sync_from_cpu_env(cpu)
+        np.testing.assert_allclose(obs, sim._pack_obs()[0], atol=1e-4)
+        rng = np.random.default_rng(3)
+        for _ in range(steps):
+            action = rng.uniform(-1, 1, size=2).astype(np.float32)
+            cpu_obs, cpu_r, term, trunc, _ = cpu.step(action)
+            sim_obs, sim_r, term_s, _ = sim.step(action.reshape(1, 2))
+            np.testing.assert_allclose(cpu_obs, sim_obs[0], rtol=5e-3, atol=5e-3)
+            self.assertAlmostEqual(cpu_r, float(sim_r[0]), places=2)
+            self.assertEqual(bool(term), bool(term_s[0]))
+            if term or trunc:
+                break
+
+    def test_step_parity_clear_and_traffic(self):
+        seeds = P.load_eval_seeds()
+        clear = next(s for s in seeds if s.mode == "navigate" and not s.contacts)
+        traffic = next(s for s in seeds if s.mode == "navigate" and s.contacts)
+        self._run_vs_cpu(clear)
+        self._run_vs_cpu(traffic)
+
+    def test_matches_torch_sim_from_same_state(self):
+        cfg = BatchedBoatSimConfig(
+            mode="avoid",
+            n_envs=48,
+            train_seeds=P.load_train_seeds()[:64],
+            auto_reset=False,
+            dynamics_jitter=True,
+            current_enabled=True,
+        )
+        ref = NumpyBatchedBoatSim(cfg)
+        ref.reset(seed=4)
+        sim = BatchedBoatSim(cfg, device="cpu")
+        for name, val in vars(ref).items():
+            t = getattr(sim, name, None)
+            if not name.startswith("_") and isinstance(t, torch.Tensor) and t.shape == val.shape:
+                t.copy_(torch.as_tensor(val))
+        rng = np.random.default_rng(0)
+        for _ in range(100):
+            actions = rng.uniform(-1, 1, (48, 2)).astype(np.float32)
+            obs_n, rew_n, term_n, trunc_n = ref.step(actions)
+            obs_t, rew_t, term_t, trunc_t = sim.step(torch.as_tensor(actions))
+            obs_t = obs_t.numpy()
+            # Heading / pi may land on +1 vs -1 at the wrap; compare it modulo 2.
+            np.testing.assert_allclose((obs_n[:, 0] - obs_t[:, 0] + 1.0) % 2.0 - 1.0, 0.0, atol=2e-3)
+            np.testing.assert_allclose(obs_n[:, 1:], obs_t[:, 1:], atol=2e-3)
+            np.testing.assert_allclose(rew_n, rew_t.numpy(), atol=2e-3)
+            np.testing.assert_array_equal(term_n, term_t.numpy())
+            np.testing.assert_array_equal(trunc_n, trunc_t.numpy())
+        self.assertEqual(obs_n.dtype, np.float32)
+        self.assertEqual(rew_n.dtype, np.float32)
+
+
+class TestNumpyVecEnv(unittest.TestCase):
+    def test_episode_infos_and_post_reset_obs(self):
+        from batched_boat_vecenv import make_cpu_batched_vec_env
+
+        env = make_cpu_batched_vec_env(n_envs=6, mode="avoid", max_episode_steps=5, seed=1)
+        env.reset()
+        actions = np.zeros((6, 2), dtype=np.float32)
+        reported = 0
+        for _ in range(5):
+            env.step_async(actions)
+            obs, rews, dones, infos = env.step_wait()
+            reported += sum("episode" in info for info in infos)
+        self.assertEqual(obs.shape, (6, P.OBS_DIM))
+        self.assertTrue(dones.all())
+        for info in infos:
+            self.assertEqual(info["episode"]["l"], int(info["episode"]["l"]))
+            self.assertEqual(info["terminal_observation"].shape, (P.OBS_DIM,))
+        self.assertTrue((env.sim.step_count == 0).all())
+        self.assertEqual(int(env.sim.episode_count.sum()), reported)
+        env.step_async(actions)
+        _, _, _, infos = env.step_wait()
+        self.assertFalse(any(infos))
+        env.close()
+
+    def test_auto_backend_without_cuda(self):
+        from unittest import mock
+
+        from vecenv_util import make_vec_env, resolve_vecenv_backend
+
+        with mock.patch("vecenv_util._cuda_available", return_value=False):
+            self.assertEqual(resolve_vecenv_backend(64), "cpu-batched")
+            env = make_vec_env([], 8, "auto", mode="navigate")
+        self.assertIsInstance(env.sim, NumpyBatchedBoatSim)
+        env.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -99,6 +99,130 @@ class TestSimTorchParity(unittest.TestCase):
             self.assertAlmostEqual(cpu_r, float(gpu_r[0]), places=2)
 
 
+class TestSimTorchMissionParity(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not P.EVAL_SEEDS_PATH.exists():
+            P.write_scenario_splits()
+
+    def _run_mission(self, category: str, goal_hold_sec: int):
+        import torch
+
+        seeds = [s for s in P.load_eval_seeds() if category in s.category and not s.contacts]
+        if not seeds:
+            raise unittest.SkipTest(f"no {category} seed")
+        seed = seeds[0]
+        cpu = BoatNavEnv(
+            mode="navigate",
+            scenario=seed,
+            training_randomize=False,
+            current_enabled=False,
+            dynamics_jitter=False,
+            goal_hold_sec=goal_hold_sec,
+            max_episode_steps=600,
+        )
+        cpu.reset(seed=seed.seed)
+        cfg = BatchedBoatSimConfig(
+            n_envs=1,
+            max_episode_steps=600,
+            goal_hold_sec=goal_hold_sec,
+            auto_reset=False,
+            train_seeds=[seed],
+            scenario_missions=True,
+        )
+        gpu = BatchedBoatSim(cfg, device="cpu")
+        gpu.sync_from_cpu_env(cpu)
+        self.assertEqual(float(gpu.max_steps_env[0]), float(cpu.max_steps))
+        changes = 0
+        for _ in range(cpu.max_steps):
+            dx, dy = cpu.goal_x - cpu.own.x_m, cpu.goal_y - cpu.own.y_m
+            throttle = -1.0 if np.hypot(dx, dy) < 35.0 else 0.3
+            action = np.array([np.arctan2(dx, dy) / np.pi, throttle], dtype=np.float32)
+            cpu_obs, cpu_r, term, trunc, info = cpu.step(action)
+            gpu_obs, gpu_r, term_t, trunc_t = gpu.step(torch.as_tensor(action.reshape(1, 2)))
+            np.testing.assert_allclose(cpu_obs, gpu_obs.numpy()[0], rtol=2e-3, atol=2e-3)
+            self.assertAlmostEqual(cpu_r, float(gpu_r[0]), places=3)
+            changes += int(bool(info.get("goal_changed")))
+            self.assertEqual(bool(term), bool(term_t[0]))
+            if term or trunc:
+                break
+        self.assertGreaterEqual(changes, 1)
+        self.assertEqual(int(gpu.m_leg[0]), changes)
+
+    def test_progress_reassign_parity(self):
+        self._run_mission("reassign_enroute", goal_hold_sec=0)
+
+    def test_hold_advance_multi_leg_parity(self):
+        self._run_mission("multi_leg", goal_hold_sec=3)
+
+
+class TestSimTorchScenarioReset(unittest.TestCase):
+    def test_reset_samples_train_seeds(self):
+        import torch
+
+        seeds = [s for s in P.load_train_seeds() if s.contacts][:16]
+        cfg = BatchedBoatSimConfig(
+            mode="avoid", n_envs=64, train_seeds=seeds, train_max_contacts=3, auto_reset=False
+        )
+        sim = BatchedBoatSim(cfg, device="cpu")
+        sim.reset(seed=3)
+        poses = {(round(s.own_x_m, 2), round(s.own_y_m, 2)) for s in seeds}
+        for i in range(sim.n):
+            self.assertIn((round(float(sim.x[i]), 2), round(float(sim.y[i]), 2)), poses)
+        counts = sim.c_active.sum(dim=1)
+        self.assertTrue(bool(((counts >= 1) & (counts <= 3)).all()))
+        self.assertTrue(torch.equal(sim.origin_x, sim.x))
+        radii = set(sim.c_radius[sim.c_active].tolist())
+        self.assertTrue(radii <= set(P.VESSEL_CLASSES.values()))
+
+
+class TestSimTorchRobustness(unittest.TestCase):
+    def test_dynamics_jitter_samples_envelope(self):
+        cfg = BatchedBoatSimConfig(n_envs=256, dynamics_jitter=True, current_enabled=True)
+        sim = BatchedBoatSim(cfg, device="cpu")
+        sim.reset(seed=11)
+        tau_h = sim.tau_h.numpy()
+        self.assertGreaterEqual(tau_h.min(), P.PLANT_AGILE["tau_heading_s"])
+        self.assertLessEqual(tau_h.max(), P.PLANT_FREIGHTER["tau_heading_s"])
+        self.assertGreater(tau_h.std(), 0.5)
+        self.assertLessEqual(float(sim.max_yaw.max()), np.radians(P.PLANT_AGILE["max_yaw_rate_deg_s"]) + 1e-6)
+        self.assertLessEqual(float(sim.cur_speed.max()), P.CURRENT_MAX_MPS)
+
+    def test_contact_obs_noise_only_perturbs_sensed_fields(self):
+        cfg = BatchedBoatSimConfig(mode="avoid", n_envs=32, auto_reset=False)
+        clean = BatchedBoatSim(cfg, device="cpu")
+        clean.reset(seed=5)
+        noisy_cfg = BatchedBoatSimConfig(
+            mode="avoid",
+            n_envs=32,
+            auto_reset=False,
+            contact_obs_noise_m=5.0,
+            contact_obs_noise_bearing_rad=0.03,
+        )
+        noisy = BatchedBoatSim(noisy_cfg, device="cpu")
+        noisy.reset(seed=5)
+        obs_clean = clean._pack_obs().numpy().copy()
+        obs_noisy = noisy._pack_obs().numpy()
+        mask = slice(P.OBS_MASK_OFFSET, P.OBS_GOAL_OFFSET)
+        np.testing.assert_array_equal(obs_clean[:, mask], obs_noisy[:, mask])
+        np.testing.assert_array_equal(obs_clean[:, P.OBS_GOAL_OFFSET:], obs_noisy[:, P.OBS_GOAL_OFFSET:])
+        self.assertFalse(np.allclose(obs_clean[:, 9:P.OBS_MASK_OFFSET], obs_noisy[:, 9:P.OBS_MASK_OFFSET]))
+
+
+class TestSimTorchStepBuffers(unittest.TestCase):
+    def test_returned_obs_survives_next_step(self):
+        import torch
+
+        sim = BatchedBoatSim(BatchedBoatSimConfig(mode="avoid", n_envs=16), device="cpu")
+        sim.reset(seed=2)
+        actions = torch.zeros(16, 2)
+        obs1, _, _, _ = sim.step(actions)
+        snapshot = obs1.clone()
+        obs2, _, _, _ = sim.step(actions)
+        self.assertNotEqual(obs1.data_ptr(), obs2.data_ptr())
+        self.assertTrue(torch.equal(obs1, snapshot))
+
+
 class TestBatchedVecEnv(unittest.TestCase):
     def test_sb3_vecenv_smoke(self):
         from batched_boat_vecenv import make_gpu_vec_env
@@ -117,6 +241,52 @@ class TestBatchedVecEnv(unittest.TestCase):
         self.assertEqual(len(infos), 8)
         env.close()
 
+    def test_cpu_handoff_is_zero_copy(self):
+        from batched_boat_vecenv import make_gpu_vec_env
+
+        env = make_gpu_vec_env(n_envs=4, mode="avoid", device="cpu")
+        env.reset()
+        env.step_async(np.full((4, 2), 0.25, dtype=np.float32))
+        obs, rews, _, _ = env.step_wait()
+        self.assertTrue(np.shares_memory(obs, env.sim._obs_bufs[env.sim._obs_slot].numpy()))
+        np.testing.assert_allclose(env.sim.prev_action.numpy(), 0.25)
+        env.step_async(np.zeros((4, 2), dtype=np.float32))
+        obs2, _, _, _ = env.step_wait()
+        self.assertFalse(np.shares_memory(obs, obs2))
+        env.close()
+
+    def test_finished_envs_report_episode_and_terminal_obs(self):
+        from batched_boat_vecenv import make_gpu_vec_env
+
+        env = make_gpu_vec_env(n_envs=6, mode="navigate", device="cpu", max_episode_steps=5, seed=1)
+        env.reset()
+        actions = np.zeros((6, 2), dtype=np.float32)
+        returns = np.zeros(6)
+        for _ in range(4):
+            env.step_async(actions)
+            _, rews, dones, infos = env.step_wait()
+            returns += rews
+            self.assertFalse(dones.any())
+            self.assertFalse(any(infos))
+        env.step_async(actions)
+        obs, rews, dones, infos = env.step_wait()
+        returns += rews
+        self.assertTrue(dones.all())
+        for i, info in enumerate(infos):
+            self.assertEqual(info["episode"]["l"], 5)
+            self.assertAlmostEqual(info["episode"]["r"], returns[i], places=4)
+            self.assertTrue(info["TimeLimit.truncated"])
+            self.assertFalse(info["success"])
+            self.assertEqual(info["terminal_observation"].shape, (P.OBS_DIM,))
+            self.assertFalse(np.allclose(info["terminal_observation"], obs[i]))
+        self.assertEqual(env.sim.episode_count.tolist(), [1] * 6)
+        # Returned obs for finished rows is the post-reset obs (row-subset pack == full pack).
+        np.testing.assert_allclose(obs, env.sim._pack_obs().numpy(), atol=1e-6)
+        env.step_async(actions)
+        _, _, _, infos = env.step_wait()
+        self.assertFalse(any(infos))
+        env.close()
+
 
 class TestVecenvBackend(unittest.TestCase):
     def test_gpu_backend_resolves(self):
@@ -0,0 +1,75 @@
+"""Columnar trace recorder: legacy snapshot parity, growth, pickle / JSON round-trips."""
+
+import json
+import pickle
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import prepare as P
+from env import BoatNavEnv
+from rewards import energy_score_from_trace
+from trace_recorder import TraceRecorder, TraceSteps, trace_json_default
+
+
+class TestTraceRecorder(unittest.TestCase):
+    def _record_both(self, env, steps):
+        recorder = TraceRecorder(capacity=4, max_contacts=1)
+        legacy = []
+        rng = np.random.default_rng(0)
+        for t in range(steps):
+            recorder.record(t, env.own, env.goal_x, env.goal_y, env.contacts)
+            legacy.append(P.snapshot_step(t, env.own, env.goal_x, env.goal_y, env.contacts))
+            env.step(rng.uniform(-1.0, 1.0, size=2).astype(np.float32))
+        return recorder, legacy
+
+    def test_matches_snapshot_step(self):
+        env = BoatNavEnv(mode="avoid", training_randomize=True, train_max_contacts=8)
+        env.reset(seed=3)
+        recorder, legacy = self._record_both(env, 25)
+        # The last steps drop to zero contacts (legacy min_range_m None).
+        env.contacts = []
+        recorder.record(25, env.own, env.goal_x, env.goal_y, env.contacts)
+        legacy.append(P.snapshot_step(25, env.own, env.goal_x, env.goal_y, env.contacts))
+        steps = recorder.steps()
+        self.assertEqual(len(steps), 26)
+        self.assertEqual(steps, legacy)
+        self.assertEqual(steps[3], legacy[3])
+        self.assertEqual(steps[-3:], legacy[-3:])
+        self.assertEqual(
+            json.dumps({"steps": steps}, default=trace_json_default), json.dumps({"steps": legacy})
+        )
+
+    def test_pickle_ships_columns_only(self):
+        env = BoatNavEnv(mode="avoid", training_randomize=True, train_max_contacts=4)
+        env.reset(seed=1)
+        recorder, legacy = self._record_both(env, 10)
+        steps = recorder.steps()
+        self.assertEqual(list(steps), legacy)  # materialize, then the cache must not travel
+        blob = pickle.dumps(steps)
+        self.assertLess(len(blob), len(pickle.dumps(legacy)))
+        clone = pickle.loads(blob)
+        self.assertIsInstance(clone, TraceSteps)
+        self.assertIsNone(clone._dicts)
+        self.assertEqual(clone, legacy)
+
+    def test_rollout_episode_trace(self):
+        class _Model:
+            def predict(self, obs, deterministic=True):
+                return np.array([0.1, 0.5], dtype=np.float32), None
+
+        env = BoatNavEnv(mode="avoid", training_randomize=True, train_max_contacts=3)
+        episode = env.rollout_episode(_Model(), max_steps=20, reset_seed=5)
+        steps = episode["steps"]
+        self.assertIsInstance(steps, TraceSteps)
+        self.assertEqual(steps[0]["t"], 0)
+        self.assertEqual(episode["energy_score"], energy_score_from_trace(steps))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Columnar eval trace store: round-trips, JSON fallback, and migration."""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import prepare as P
+import serve
+from env import BoatNavEnv
+from trace_recorder import TraceSteps, trace_json_default
+from trace_store import (
+    TRACE_JSON_NAME,
+    TraceStore,
+    has_trace_store,
+    load_trace_episodes,
+    migrate_run_traces,
+    write_trace_store,
+)
+
+
+class _Model:
+    def predict(self, obs, deterministic=True):
+        return np.array([0.2, 0.3], dtype=np.float32), None
+
+
+def _episodes():
+    env = BoatNavEnv(mode="avoid", training_randomize=True, train_max_contacts=6)
+    episodes = [env.rollout_episode(_Model(), max_steps=12, reset_seed=seed) for seed in (1, 2)]
+    # Legacy dict steps with a class name outside the built-in registry.
+    env.reset(seed=3)
+    env.contacts[0].vessel_class = "trace_store_test_class"
+    legacy = [P.snapshot_step(t, env.own, env.goal_x, env.goal_y, env.contacts) for t in range(3)]
+    episodes.append({"scenario_name": "legacy", "steps": legacy})
+    episodes.append({"scenario_name": "no-trace", "success": False})
+    return episodes
+
+
+class TestTraceStore(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.run_dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _as_json(self, episodes):
+        return json.loads(json.dumps(episodes, default=trace_json_default))
+
+    def test_roundtrip_matches_json(self):
+        episodes = _episodes()
+        write_trace_store(self.run_dir, episodes)
+        store = TraceStore.open(self.run_dir)
+        self.assertEqual(len(store), len(episodes))
+        self.assertIsInstance(store.columns["own"], np.memmap)
+        loaded = load_trace_episodes(self.run_dir)
+        self.assertIsInstance(loaded[0]["steps"], TraceSteps)
+        self.assertNotIn("steps", loaded[-1])
+        self.assertEqual(self._as_json(loaded), self._as_json(episodes))
+        meta = load_trace_episodes(self.run_dir, with_steps=False)
+        self.assertTrue(all("steps" not in ep for ep in meta))
+        self.assertEqual(meta[1]["scenario_seed"], episodes[1]["scenario_seed"])
+
+    def test_json_fallback_and_migration(self):
+        episodes = self._as_json(_episodes())
+        (self.run_dir / TRACE_JSON_NAME).write_text(json.dumps({"episodes": episodes}))
+        self.assertFalse(has_trace_store(self.run_dir))
+        self.assertEqual(load_trace_episodes(self.run_dir), episodes)
+        migrate_run_traces(self.run_dir, remove_json=True)
+        self.assertFalse((self.run_dir / TRACE_JSON_NAME).exists())
+        self.assertEqual(self._as_json(load_trace_episodes(self.run_dir)), episodes)
+
+    def test_missing_traces(self):
+        self.assertEqual(load_trace_episodes(self.run_dir), [])
+        self.assertIsNone(migrate_run_traces(self.run_dir))
+        write_trace_store(self.run_dir, [])
+        self.assertEqual(load_trace_episodes(self.run_dir), [])
+
+
+class TestEnrichedTraceCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.run_dir = Path(self._tmp.name)
+        write_trace_store(self.run_dir, _episodes()[:2])
+        serve._enriched_lru.clear()
+
+    def tearDown(self):
+        serve._enriched_lru.clear()
+        self._tmp.cleanup()
+
+    def test_enriches_once_then_serves_cache(self):
+        with mock.patch.object(serve, "enrich_trace_file", wraps=serve.enrich_trace_file) as enrich:
+            first = serve._enriched_traces(self.run_dir)
+            self.assertIs(serve._enriched_traces(self.run_dir), first)  # in-memory LRU
+            serve._enriched_lru.clear()
+            self.assertEqual(serve._enriched_traces(self.run_dir), first)  # on-disk cache
+            self.assertEqual(enrich.call_count, 1)
+        self.assertTrue((self.run_dir / serve.ENRICHED_TRACES_NAME).exists())
+        self.assertIn("colregs", first["episodes"][0])
+
+    def test_rebuilt_when_traces_or_config_change(self):
+        serve._enriched_traces(self.run_dir)
+        with mock.patch.object(serve, "enrich_trace_file", wraps=serve.enrich_trace_file) as enrich:
+            write_trace_store(self.run_dir, _episodes()[:1])
+            self.assertEqual(len(serve._enriched_traces(self.run_dir)["episodes"]), 1)
+            config = self.run_dir / "colregs_config.json"
+            config.write_text(serve.COLREGS_CONFIG_PATH.read_text(encoding="utf-8") + "\n")
+            with mock.patch.object(serve, "COLREGS_CONFIG_PATH", config):
+                serve._enriched_traces(self.run_dir)
+            self.assertEqual(enrich.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -153,7 +153,14 @@ class TestRunEvalReturn(unittest.TestCase):
         from eval_parallel import EvalResult
 
         fake_metrics = {"avoid_score": 0.42, "nav_score": 0.5}
-        with mock.patch("eval_runner.run_eval", return_value=EvalResult(fake_metrics, [])):
+        def fake_grid(model, groups, *, on_group=None, **_):
+            for g in range(len(groups)):
+                on_group(g, [])
+            return [[] for _ in groups]
+
+        with mock.patch("eval_runner.rollout_grid", side_effect=fake_grid), mock.patch(
+            "eval_runner.aggregate_eval_metrics", return_value=EvalResult(fake_metrics, [])
+        ):
             result = run_robust_eval(mock.Mock(), "avoid")
         self.assertAlmostEqual(result["robust_eval_score"], 0.42, places=4)
         self.assertEqual(result["robust_eval_samples"], 5)
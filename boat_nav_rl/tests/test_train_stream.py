@@ -0,0 +1,82 @@
+"""SSE train stream: shared watcher, incremental log tail, status change fan-out."""
+
+import json
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from train_stream import TrainStream  # noqa: E402
+
+
+def _events(q, timeout=2.0):
+    """Drain queued SSE chunks into (event, data) pairs until idle for 0.3 s."""
+    out = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            chunk = q.get(timeout=0.3)
+        except Exception:
+            break
+        head, data = chunk.decode("utf-8").strip().split("\n")
+        out.append((head[len("event: "):], json.loads(data[len("data: "):])))
+    return out
+
+
+class TestTrainStream(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.status_path = root / "status.json"
+        self.log_path = root / "current.log"
+        self.status_path.write_text(json.dumps({"state": "running"}))
+        self.log_path.write_text("line 1\n")
+        self.reads = 0
+        self.stream = TrainStream(
+            log_path=self.log_path,
+            watch_paths=[self.status_path],
+            read_status=self._read_status,
+            poll_sec=0.02,
+            heartbeat_sec=60.0,
+        )
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _read_status(self):
+        self.reads += 1
+        return json.loads(self.status_path.read_text())
+
+    def test_fan_out_without_per_client_reads(self):
+        a = self.stream.subscribe()
+        b = self.stream.subscribe()
+        self.assertEqual(self.reads, 1)
+        for q in (a, b):
+            self.assertEqual(
+                _events(q),
+                [("status", {"state": "running"}), ("log", {"reset": True, "text": "line 1\n"})],
+            )
+
+        with self.log_path.open("a") as f:
+            f.write("line 2 é\n")
+        self.status_path.write_text(json.dumps({"state": "completed", "run_id": "r1"}))
+        for q in (a, b):
+            got = _events(q)
+            self.assertIn(("log", {"append": "line 2 é\n"}), got)
+            self.assertIn(("status", {"state": "completed", "run_id": "r1"}), got)
+        self.assertEqual(self.reads, 2)
+
+        self.log_path.write_text("new job\n")
+        self.assertIn(("log", {"reset": True, "text": "new job\n"}), _events(a))
+        self.stream.unsubscribe(a)
+        self.stream.unsubscribe(b)
+        time.sleep(0.1)
+        self.assertIsNone(self.stream._thread)
+
+
+if __name__ == "__main__":
+    unittest.main()
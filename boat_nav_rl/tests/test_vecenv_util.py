@@ -45,9 +45,13 @@ class TestVecenvUtil(unittest.TestCase):
     def test_resolve_vecenv_backend(self):
         with mock.patch("vecenv_util._cuda_available", return_value=False):
             self.assertEqual(resolve_vecenv_backend(1), "dummy")
-            self.assertEqual(resolve_vecenv_backend(8), "subproc")
+            self.assertEqual(resolve_vecenv_backend(8), "cpu-batched")
+            self.assertEqual(resolve_vecenv_backend(2), "subproc")
         self.assertEqual(resolve_vecenv_backend(8, "dummy"), "dummy")
         self.assertEqual(resolve_vecenv_backend(8, "gpu"), "gpu")
+        self.assertEqual(resolve_vecenv_backend(1, "cpu-batched"), "cpu-batched")
+        with self.assertRaises(ValueError):
+            resolve_vecenv_backend(8, "numpy")
 
     def test_training_perf_defaults_keys(self):
         perf = training_perf_defaults()
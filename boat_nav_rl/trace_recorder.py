@@ -0,0 +1,207 @@
+"""Columnar episode traces: per-step state appended into preallocated NumPy columns.
+
+``BoatNavEnv.rollout_episode`` records into a ``TraceRecorder`` instead of building one
+``P.snapshot_step`` dict per step. The episode's ``steps`` value is a ``TraceSteps``: a
+read-only sequence that materializes the legacy snapshot dicts only when a consumer
+indexes or iterates it. Pickling (eval workers -> parent) ships only the arrays; JSON
+writers pass ``default=trace_json_default``.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union, overload
+
+import numpy as np
+
+import prepare as P
+
+# Column order of ``own`` / ``contacts``; names are the legacy snapshot keys.
+OWN_FIELDS = ("x", "y", "heading", "speed", "cmd_heading", "cmd_speed")
+CONTACT_FIELDS = ("x", "y", "cog", "sog", "radius_m")
+COLUMN_NAMES = (
+    "t",
+    "own",
+    "goal",
+    "n_contacts",
+    "contacts",
+    "contact_class",
+    "min_range",
+    "goal_range",
+)
+_CONTACT_ROWS = [P.CONTACT_COLUMNS.index(name) for name in ("x", "y", "cog", "sog", "radius")]
+
+
+class TraceRecorder:
+    """Append-only per-step trace; columns grow geometrically in steps and contacts."""
+
+    def __init__(self, capacity: int = 256, max_contacts: int = P.N_MAX_CONTACTS) -> None:
+        capacity = max(1, int(capacity))
+        k = max(1, int(max_contacts))
+        self.n = 0
+        self.t = np.zeros(capacity, dtype=np.int32)
+        self.own = np.zeros((capacity, len(OWN_FIELDS)), dtype=np.float64)
+        self.goal = np.zeros((capacity, 2), dtype=np.float64)
+        self.n_contacts = np.zeros(capacity, dtype=np.int16)
+        self.contacts = np.zeros((capacity, k, len(CONTACT_FIELDS)), dtype=np.float64)
+        self.contact_class = np.zeros((capacity, k), dtype=np.int16)
+        # NaN = no contacts (legacy ``min_range_m: None``).
+        self.min_range = np.zeros(capacity, dtype=np.float64)
+        self.goal_range = np.zeros(capacity, dtype=np.float64)
+
+    def _grow(self, steps: int, contacts: int) -> None:
+        for name in COLUMN_NAMES:
+            old = getattr(self, name)
+            shape = list(old.shape)
+            shape[0] = steps
+            if name in ("contacts", "contact_class"):
+                shape[1] = contacts
+            new = np.zeros(shape, dtype=old.dtype)
+            new[tuple(slice(0, d) for d in old.shape)] = old
+            setattr(self, name, new)
+
+    def _next_row(self, k: int) -> int:
+        i = self.n
+        cap, k_cap = self.contacts.shape[:2]
+        if i == cap or k > k_cap:
+            self._grow(2 * cap if i == cap else cap, max(k_cap, k))
+        self.n_contacts[i] = k
+        self.n = i + 1
+        return i
+
+    def record(
+        self,
+        t: int,
+        own: P.VesselState,
+        goal_x: float,
+        goal_y: float,
+        contacts: Sequence[P.ContactState],
+    ) -> None:
+        """Same content as ``P.snapshot_step(t, own, goal_x, goal_y, contacts)``."""
+        table = P.as_contact_table(contacts)
+        k = table.n
+        i = self._next_row(k)
+        self.t[i] = t
+        self.own[i] = (
+            own.x_m,
+            own.y_m,
+            own.heading_rad,
+            own.speed_mps,
+            own.cmd_heading_rad,
+            own.cmd_speed_mps,
+        )
+        self.goal[i] = (goal_x, goal_y)
+        if k:
+            self.contacts[i, :k] = table.data[_CONTACT_ROWS, :k].T
+            self.contact_class[i, :k] = table.class_id[:k]
+        self.min_range[i] = P.min_contact_range(own, table) if k else math.nan
+        self.goal_range[i] = P.goal_range(own, goal_x, goal_y)
+
+    def record_snapshot(self, step: Dict[str, Any]) -> None:
+        """Append a legacy ``P.snapshot_step`` dict as stored (values are not recomputed)."""
+        contacts = step.get("contacts") or []
+        i = self._next_row(len(contacts))
+        self.t[i] = step["t"]
+        own = step["own"]
+        self.own[i] = [own[name] for name in OWN_FIELDS]
+        self.goal[i] = (step["goal"]["x"], step["goal"]["y"])
+        for j, c in enumerate(contacts):
+            self.contacts[i, j] = [c[name] for name in CONTACT_FIELDS]
+            self.contact_class[i, j] = P.vessel_class_id(c["vessel_class"])
+        min_range = step.get("min_range_m")
+        self.min_range[i] = math.nan if min_range is None else min_range
+        self.goal_range[i] = step["goal_range_m"]
+
+    def steps(self) -> "TraceSteps":
+        """Trimmed, detached snapshot of what has been recorded so far."""
+        n = self.n
+        k = int(self.n_contacts[:n].max()) if n else 0
+        columns = {
+            name: getattr(self, name)[:n].copy()
+            for name in COLUMN_NAMES
+            if name not in ("contacts", "contact_class")
+        }
+        columns["contacts"] = self.contacts[:n, :k].copy()
+        columns["contact_class"] = self.contact_class[:n, :k].copy()
+        return TraceSteps(columns, P.vessel_class_names())
+
+
+class TraceSteps(Sequence[Dict[str, Any]]):
+    """Episode ``steps`` backed by trace columns; legacy dicts are built on first access."""
+
+    def __init__(self, columns: Dict[str, np.ndarray], class_names: List[str]) -> None:
+        self.columns = columns
+        self.class_names = class_names
+        self._dicts: Optional[List[Dict[str, Any]]] = None
+
+    def __len__(self) -> int:
+        return int(self.columns["t"].shape[0])
+
+    @overload
+    def __getitem__(self, index: int) -> Dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dict[str, Any]]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        return self.to_list()[index]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.to_list())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TraceSteps):
+            other = other.to_list()
+        if not isinstance(other, (list, tuple)):
+            return NotImplemented
+        return self.to_list() == list(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"TraceSteps(<{len(self)} steps>)"
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"columns": self.columns, "class_names": self.class_names, "_dicts": None}
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Legacy ``P.snapshot_step`` dicts (cached; treat as read-only)."""
+        if self._dicts is None:
+            self._dicts = self._materialize()
+        return self._dicts
+
+    def _materialize(self) -> List[Dict[str, Any]]:
+        c = self.columns
+        names = self.class_names
+        t = c["t"].tolist()
+        own = c["own"].tolist()
+        goal = c["goal"].tolist()
+        n_contacts = c["n_contacts"].tolist()
+        contacts = c["contacts"].tolist()
+        classes = c["contact_class"].tolist()
+        min_range = c["min_range"].tolist()
+        goal_range = c["goal_range"].tolist()
+        steps: List[Dict[str, Any]] = []
+        for i in range(len(t)):
+            k = n_contacts[i]
+            steps.append(
+                {
+                    "t": t[i],
+                    "own": dict(zip(OWN_FIELDS, own[i])),
+                    "goal": {"x": goal[i][0], "y": goal[i][1]},
+                    "contacts": [
+                        {**dict(zip(CONTACT_FIELDS, row)), "vessel_class": names[cls]}
+                        for row, cls in zip(contacts[i][:k], classes[i][:k])
+                    ],
+                    "min_range_m": min_range[i] if k else None,
+                    "goal_range_m": goal_range[i],
+                }
+            )
+        return steps
+
+
+def trace_json_default(obj: Any) -> Any:
+    """``json.dumps(default=...)`` hook: trace sequences serialize as legacy step lists."""
+    if isinstance(obj, TraceSteps):
+        return obj.to_list()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,179 @@
+"""Columnar on-disk eval traces: ``<run>/eval_traces/`` beside (or instead of) ``eval_traces.json``.
+
+Layout: one raw ``.npy`` per ``TraceRecorder`` column, every episode's steps concatenated,
+plus ``index.json`` with per-episode metadata (all non-``steps`` fields) and the
+``[steps_start, steps_start + steps_count)`` row range. Readers memory-map the columns, so
+listing episodes touches only the index and one episode's steps are a slice.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from trace_recorder import COLUMN_NAMES, TraceRecorder, TraceSteps
+
+TRACE_STORE_DIRNAME = "eval_traces"
+TRACE_JSON_NAME = "eval_traces.json"
+TRACE_STORE_SCHEMA_VERSION = 1
+_INDEX_NAME = "index.json"
+
+
+def trace_store_dir(run_dir: Path) -> Path:
+    return run_dir / TRACE_STORE_DIRNAME
+
+
+def has_trace_store(run_dir: Path) -> bool:
+    return (trace_store_dir(run_dir) / _INDEX_NAME).exists()
+
+
+def has_traces(run_dir: Path) -> bool:
+    return has_trace_store(run_dir) or (run_dir / TRACE_JSON_NAME).exists()
+
+
+def trace_source_files(run_dir: Path) -> List[Path]:
+    """Files ``load_trace_episodes`` reads for this run (store wins over JSON)."""
+    if has_trace_store(run_dir):
+        root = trace_store_dir(run_dir)
+        return [root / _INDEX_NAME] + [root / f"{name}.npy" for name in COLUMN_NAMES]
+    json_path = run_dir / TRACE_JSON_NAME
+    return [json_path] if json_path.exists() else []
+
+
+def _episode_steps(steps: Any) -> TraceSteps:
+    if isinstance(steps, TraceSteps):
+        return steps
+    recorder = TraceRecorder(max(1, len(steps)))
+    for step in steps:
+        recorder.record_snapshot(step)
+    return recorder.steps()
+
+
+def write_trace_store(run_dir: Path, episodes: Sequence[Dict[str, Any]]) -> Path:
+    """Write ``episodes`` (``steps`` as ``TraceSteps`` or legacy dicts) atomically."""
+    parts = [_episode_steps(ep.get("steps") or []) for ep in episodes]
+    class_names: List[str] = []
+    for part in parts:
+        class_names.extend(name for name in part.class_names if name not in class_names)
+    k = max([part.columns["contacts"].shape[1] for part in parts] + [0])
+
+    columns: Dict[str, List[np.ndarray]] = {name: [] for name in COLUMN_NAMES}
+    index: List[Dict[str, Any]] = []
+    start = 0
+    for ep, part in zip(episodes, parts):
+        cols = part.columns
+        n = len(part)
+        remap = np.array(
+            [class_names.index(name) for name in part.class_names] or [0], dtype=np.int16
+        )
+        for name in COLUMN_NAMES:
+            col = cols[name]
+            if name in ("contacts", "contact_class"):
+                padded = np.zeros((n, k) + col.shape[2:], dtype=col.dtype)
+                padded[:, : col.shape[1]] = remap[col] if name == "contact_class" else col
+                col = padded
+            columns[name].append(col)
+        meta = {key: val for key, val in ep.items() if key != "steps"}
+        meta["steps_start"] = start
+        meta["steps_count"] = n
+        index.append(meta)
+        start += n
+
+    root = trace_store_dir(run_dir)
+    tmp = root.with_name(root.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    for name, chunks in columns.items():
+        arr = np.concatenate(chunks) if chunks else TraceRecorder(1).steps().columns[name]
+        np.save(tmp / f"{name}.npy", arr)
+    (tmp / _INDEX_NAME).write_text(
+        json.dumps(
+            {
+                "schema_version": TRACE_STORE_SCHEMA_VERSION,
+                "n_steps": start,
+                "class_names": class_names,
+                "episodes": index,
+            },
+            separators=(",", ":"),
+        ),
+        encoding="utf-8",
+    )
+    shutil.rmtree(root, ignore_errors=True)
+    tmp.rename(root)
+    return root
+
+
+class TraceStore:
+    """Read side of a run's ``eval_traces/`` directory (columns memory-mapped on demand)."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        raw = json.loads((root / _INDEX_NAME).read_text(encoding="utf-8"))
+        version = raw.get("schema_version")
+        if version != TRACE_STORE_SCHEMA_VERSION:
+            raise ValueError(f"unsupported trace store schema {version!r} in {root}")
+        self.index: List[Dict[str, Any]] = list(raw.get("episodes") or [])
+        self.class_names: List[str] = list(raw.get("class_names") or [])
+        self._columns: Optional[Dict[str, np.ndarray]] = None
+
+    @classmethod
+    def open(cls, run_dir: Path) -> Optional["TraceStore"]:
+        return cls(trace_store_dir(run_dir)) if has_trace_store(run_dir) else None
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        if self._columns is None:
+            self._columns = {
+                name: np.load(self.root / f"{name}.npy", mmap_mode="r") for name in COLUMN_NAMES
+            }
+        return self._columns
+
+    def steps(self, i: int) -> TraceSteps:
+        meta = self.index[i]
+        start = int(meta["steps_start"])
+        rows = slice(start, start + int(meta["steps_count"]))
+        return TraceSteps({name: col[rows] for name, col in self.columns.items()}, self.class_names)
+
+    def episode(self, i: int, *, with_steps: bool = True) -> Dict[str, Any]:
+        """Episode dict as in ``eval_traces.json`` (``steps`` lazily built from the slice)."""
+        ep = {k: v for k, v in self.index[i].items() if k not in ("steps_start", "steps_count")}
+        if with_steps and self.index[i]["steps_count"]:
+            ep["steps"] = self.steps(i)
+        return ep
+
+    def episodes(self, *, with_steps: bool = True) -> List[Dict[str, Any]]:
+        return [self.episode(i, with_steps=with_steps) for i in range(len(self))]
+
+
+def load_trace_episodes(run_dir: Path, *, with_steps: bool = True) -> List[Dict[str, Any]]:
+    """Run's eval episodes: columnar store when present, else ``eval_traces.json``, else []."""
+    store = TraceStore.open(run_dir)
+    if store is not None:
+        return store.episodes(with_steps=with_steps)
+    json_path = run_dir / TRACE_JSON_NAME
+    if not json_path.exists():
+        return []
+    raw = json.loads(json_path.read_text(encoding="utf-8"))
+    episodes = list(raw.get("episodes") or [])
+    if not with_steps:
+        episodes = [{k: v for k, v in ep.items() if k != "steps"} for ep in episodes]
+    return episodes
+
+
+def migrate_run_traces(run_dir: Path, *, remove_json: bool = False) -> Optional[Path]:
+    """Convert ``eval_traces.json`` into the columnar store; None when there is no JSON."""
+    json_path = run_dir / TRACE_JSON_NAME
+    if not json_path.exists():
+        return None
+    raw = json.loads(json_path.read_text(encoding="utf-8"))
+    root = write_trace_store(run_dir, list(raw.get("episodes") or []))
+    if remove_json:
+        json_path.unlink()
+    return root
@@ -27,10 +27,12 @@ from vecenv_util import (
 
 import prepare as P
 from checkpoint_util import copy_best_to_final, load_best_metrics, resolve_resume_checkpoint
+from curriculum import get_phase
 from device_util import configure_training_backend, resolve_device, torch_device_info
 from callbacks import CurriculumCheckpointCallback, LiveMetricsCallback, PeriodicSnapshotCallback, TimeBudgetCallback
 from env import BoatNavEnv, DEFAULT_TRAIN_MAX_CONTACTS
 from env_factory import make_env
+from eval_pool import start_eval_pool, stop_eval_pool
 from eval_runner import run_eval, run_robust_eval
 from run_outputs import create_run_dir, load_parent_metrics, write_run_outputs
 from runs_util import score_key_for_mode
@@ -164,6 +166,12 @@ def main() -> None:
         goal_hold_sec=C.GOAL_HOLD_SEC,
         max_episode_steps=C.MAX_EPISODE_STEPS,
         current_enabled=C.CURRENT_ENABLED,
+        train_seeds=train_seeds,
+        train_max_contacts=C.TRAIN_MAX_CONTACTS,
+        nominal_plant=C.NOMINAL_PLANT,
+        dynamics_jitter=C.DYNAMICS_JITTER,
+        contact_obs_noise_m=C.CONTACT_OBS_NOISE_M,
+        contact_obs_noise_bearing_rad=C.CONTACT_OBS_NOISE_BEARING_RAD,
     )
 
     model_holder: Dict[str, Any] = {}
@@ -186,6 +194,12 @@ def main() -> None:
             verbose=1,
         )
     model_holder["model"] = model
+    try:
+        pool = start_eval_pool(model)
+        if pool is not None:
+            print(f"[train] warm eval pool: {pool.workers} worker(s), shared-memory weights")
+    except Exception as exc:
+        print(f"[train] eval pool disabled ({exc}); evals use per-call snapshots")
 
     budget_cb = TimeBudgetCallback(C.TRAIN_BUDGET_SEC)
     async_eval_cb: Optional[BaseCallback] = None
@@ -233,16 +247,21 @@ def main() -> None:
     eval_metrics: Dict[str, Any] = {}
     traces: List[Dict[str, Any]] = []
     try:
-        eval_result = run_eval(model, C.MODE, max_scenarios=eval_limit, collect_traces=True)
+        eval_result = run_eval(model, C.MODE, max_scenarios=eval_limit, collect_traces=True, use_cache=True)
         eval_metrics, traces = eval_result.metrics, eval_result.traces
         if C.ROBUST_EVAL_ENABLED:
-            eval_metrics.update(run_robust_eval(model, C.MODE))
+            gate = None
+            if C.ROBUST_EVAL_EARLY_EXIT and C.CURRICULUM_PHASE is not None:
+                gate = get_phase(C.CURRICULUM_PHASE)
+            eval_metrics.update(run_robust_eval(model, C.MODE, gate=gate))
             print(
                 f"[train] robust_eval score={eval_metrics.get('robust_eval_score')} "
                 f"worst={eval_metrics.get('robust_eval_worst')}"
             )
     except Exception as exc:
         print(f"[train] final eval failed ({exc}); saving checkpoint without full eval")
+    finally:
+        stop_eval_pool()
 
     write_run_outputs(
         run_dir,
@@ -25,6 +25,8 @@ LIVE_EVAL_SCENARIOS = int(os.environ.get("LIVE_EVAL_SCENARIOS", "6"))
 LIVE_EVAL_INTERVAL_SEC = float(os.environ.get("LIVE_EVAL_INTERVAL_SEC", "45.0"))
 ROBUST_EVAL_SAMPLES = int(os.environ.get("ROBUST_EVAL_SAMPLES", "5"))
 ROBUST_EVAL_SCENARIOS = int(os.environ.get("ROBUST_EVAL_SCENARIOS", "12"))
+# Stop the end-of-training robust eval once one plant already fails the curriculum phase gate.
+ROBUST_EVAL_EARLY_EXIT = os.environ.get("ROBUST_EVAL_EARLY_EXIT", "0") == "1"
 
 DYNAMICS_JITTER = os.environ.get("DYNAMICS_JITTER", "0") == "1"
 ROBUST_EVAL_ENABLED = os.environ.get("ROBUST_EVAL_ENABLED", "0") == "1"
@@ -34,6 +36,8 @@ CURRENT_ENABLED = os.environ.get("CURRENT_ENABLED", "0") == "1"
 MONTAGE_ENABLED = os.environ.get("MONTAGE_ENABLED", "0") == "1"
 MONTAGE_MAX_EPISODES = int(os.environ.get("MONTAGE_MAX_EPISODES", "48"))
 MONTAGE_STEP_COLS = int(os.environ.get("MONTAGE_STEP_COLS", "12"))
+# eval_traces/ (columnar, memory-mapped) is always written; the legacy JSON copy is optional.
+EVAL_TRACES_JSON = os.environ.get("EVAL_TRACES_JSON", "1") == "1"
 NOMINAL_PLANT = P.plant_from_dict(P.PLANT_NOMINAL)
 
 NET_ARCH: List[int] = [256, 256]
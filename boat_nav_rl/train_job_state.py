@@ -39,6 +39,8 @@ def live_eval_extras(metrics: Dict[str, Any]) -> Dict[str, Any]:
         "mean_speed_mps",
         "mean_goal_zone_speed_mps",
         "pct_goal_zone_at_min_speed",
+        "eval_episodes_planned",
+        "sequential_decision",
     ):
         if metrics.get(key) is not None:
             extras[key] = metrics[key]
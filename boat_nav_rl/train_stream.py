@@ -0,0 +1,171 @@
+"""Server-Sent Events fan-out for ``GET /api/train/stream``.
+
+One watcher thread per server polls file stats every ``poll_sec``. It tails ``current.log``
+from the last offset, re-reads status (``TJ.read_status``) only when ``status.json`` /
+``live_metrics.json`` / ``train.pid`` change (plus a 1 s liveness heartbeat), and pushes
+pre-encoded events to every subscriber's queue. Clients never touch the disk.
+
+Events: ``status`` (the ``/api/train/status`` payload without ``log_tail``) and ``log``
+(``{"append": text}``, or ``{"reset": true, "text": tail}`` on connect and log truncation).
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import training_job as TJ
+
+STREAM_POLL_SEC = 0.1
+STREAM_HEARTBEAT_SEC = 1.0
+STREAM_KEEPALIVE_SEC = 15.0
+STREAM_TAIL_BYTES = 12000
+_QUEUE_MAX = 256
+
+
+def encode_event(event: str, data: Any) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode("utf-8")
+
+
+class TrainStream:
+    """Single watcher thread (started on first subscriber, parked when none remain)."""
+
+    def __init__(
+        self,
+        *,
+        log_path: Optional[Path] = None,
+        watch_paths: Optional[List[Path]] = None,
+        read_status: Optional[Callable[[], Dict[str, Any]]] = None,
+        poll_sec: float = STREAM_POLL_SEC,
+        heartbeat_sec: float = STREAM_HEARTBEAT_SEC,
+    ) -> None:
+        self.log_path = log_path or TJ.LOG_PATH
+        self.watch_paths = watch_paths or [TJ.STATUS_PATH, TJ.LIVE_METRICS_PATH, TJ.PID_PATH]
+        self.read_status = read_status or TJ.read_status
+        self.poll_sec = poll_sec
+        self.heartbeat_sec = heartbeat_sec
+        self._lock = threading.Lock()
+        self._subscribers: List["queue.Queue[bytes]"] = []
+        self._thread: Optional[threading.Thread] = None
+        # Watcher state (owned by the watcher thread once running).
+        self._stamps: List[Optional[Tuple[int, int]]] = []
+        self._status_text = ""
+        self._next_heartbeat = 0.0
+        self._log_key: Optional[Tuple[int, int]] = None
+        self._log_offset = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._tail = ""
+        self._status_event = b""
+
+    def subscribe(self) -> "queue.Queue[bytes]":
+        """New client queue, primed with the current status and log tail."""
+        q: "queue.Queue[bytes]" = queue.Queue(maxsize=_QUEUE_MAX)
+        with self._lock:
+            if self._thread is None:
+                self._poll_status(force=True)
+                self._poll_log()
+                self._thread = threading.Thread(target=self._run, name="train-stream", daemon=True)
+                self._thread.start()
+            q.put_nowait(self._status_event)
+            q.put_nowait(encode_event("log", {"reset": True, "text": self._tail}))
+            self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q: "queue.Queue[bytes]") -> None:
+        with self._lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.poll_sec)
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+                try:
+                    self._poll_status()
+                    self._poll_log()
+                except Exception as exc:  # keep streaming; next tick retries
+                    print(f"[train-stream] poll failed: {exc!r}")
+
+    def _publish(self, payload: bytes) -> None:
+        for q in list(self._subscribers):
+            try:
+                q.put_nowait(payload)
+            except queue.Full:  # stalled client: drop it, its handler ends on the sentinel
+                self._subscribers.remove(q)
+                with q.mutex:
+                    q.queue.clear()
+                q.put_nowait(b"")
+
+    def _poll_status(self, force: bool = False) -> None:
+        stamps = []
+        for path in self.watch_paths:
+            try:
+                st = os.stat(path)
+                stamps.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamps.append(None)
+        now = time.monotonic()
+        if not force and stamps == self._stamps and now < self._next_heartbeat:
+            return
+        self._stamps = stamps
+        self._next_heartbeat = now + self.heartbeat_sec
+        status = self.read_status()
+        text = json.dumps(status, sort_keys=True)
+        if text != self._status_text or force:
+            self._status_text = text
+            self._status_event = encode_event("status", status)
+            if not force:
+                self._publish(self._status_event)
+
+    def _poll_log(self) -> None:
+        try:
+            st = os.stat(self.log_path)
+        except OSError:
+            st = None
+        key = (st.st_dev, st.st_ino) if st is not None else None
+        size = st.st_size if st is not None else 0
+        if key != self._log_key or size < self._log_offset:
+            self._log_key = key
+            self._decoder.reset()
+            self._log_offset = max(0, size - STREAM_TAIL_BYTES)
+            self._tail = self._read_log(size)
+            if self._subscribers:
+                self._publish(encode_event("log", {"reset": True, "text": self._tail}))
+            return
+        if size == self._log_offset:
+            return
+        text = self._read_log(size)
+        if text:
+            self._tail = (self._tail + text)[-STREAM_TAIL_BYTES:]
+            self._publish(encode_event("log", {"append": text}))
+
+    def _read_log(self, size: int) -> str:
+        if size <= self._log_offset:
+            return ""
+        with open(self.log_path, "rb") as f:
+            f.seek(self._log_offset)
+            data = f.read(size - self._log_offset)
+        self._log_offset += len(data)
+        return self._decoder.decode(data)
+
+
+_stream: Optional[TrainStream] = None
+_stream_lock = threading.Lock()
+
+
+def train_stream() -> TrainStream:
+    """Process-wide stream shared by every ``/api/train/stream`` client."""
+    global _stream
+    with _stream_lock:
+        if _stream is None:
+            _stream = TrainStream()
+        return _stream
@@ -14,7 +14,8 @@ from typing import Any, Dict, List, Optional
 
 from vecenv_util import recommended_n_envs
 import prepare as P
-from runs_util import safe_run_dir, score_from_metrics, validate_run_id
+import run_index as RI
+from runs_util import safe_run_dir, validate_run_id
 
 ROOT = Path(__file__).resolve().parent
 RUNS_DIR = ROOT / "runs"
@@ -309,62 +310,12 @@ def cancel_training() -> Dict[str, Any]:
     return {"ok": True, "message": "Pause requested — saving checkpoint after current step"}
 
 
-def training_history(limit: int = 200) -> Dict[str, Any]:
-    runs = sorted(
-        [
-            p
-            for p in RUNS_DIR.iterdir()
-            if p.is_dir()
-            and p.name != "_training"
-            and (p / "metrics.json").exists()
-        ],
-        key=lambda p: p.name,
+def training_history(
+    limit: int = 200, offset: int = 0, fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Most recent ``limit`` readable runs after skipping ``offset``, oldest first."""
+    records, total = RI.query_runs(
+        RUNS_DIR, limit=limit, offset=offset, newest_first=False, readable_only=True
     )
-    if limit:
-        runs = runs[-limit:]
-
-    series = []
-    for run_dir in runs:
-        metrics_path = run_dir / "metrics.json"
-        try:
-            metrics = json.loads(metrics_path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
-            continue
-        mode = metrics.get("mode", P.DEFAULT_MODE)
-        score = score_from_metrics(metrics)
-        avg_rng = metrics.get("avg_final_goal_range_m")
-        if avg_rng is None:
-            traces_path = run_dir / "eval_traces.json"
-            if traces_path.exists():
-                traces = json.loads(traces_path.read_text(encoding="utf-8"))
-                ranges = [
-                    ep.get("final_goal_range_m")
-                    for ep in traces.get("episodes", [])
-                    if ep.get("final_goal_range_m") is not None
-                ]
-                if ranges:
-                    avg_rng = round(sum(ranges) / len(ranges), 2)
-        series.append(
-            {
-                "run_id": run_dir.name,
-                "mode": mode,
-                "nav_score": metrics.get("nav_score"),
-                "avoid_score": metrics.get("avoid_score"),
-                "score": score,
-                "success_rate": metrics.get("success_rate"),
-                "collision_rate": metrics.get("collision_rate"),
-                "avg_final_goal_range_m": avg_rng,
-                "mean_goal_zone_speed_mps": metrics.get("mean_goal_zone_speed_mps"),
-                "pct_goal_zone_at_min_speed": metrics.get("pct_goal_zone_at_min_speed"),
-                "reward_breakdown_mean": metrics.get("reward_breakdown_mean"),
-                "reward_weights": (metrics.get("config") or {}).get("reward_weights"),
-                "gated_hold": (metrics.get("config") or {}).get("gated_hold"),
-                "notes": metrics.get("notes", ""),
-                "parent_run_id": metrics.get("parent_run_id"),
-                "train_session": metrics.get("train_session", 1),
-                "cumulative_train_sec": metrics.get("cumulative_train_sec"),
-                "train_elapsed_sec": metrics.get("train_elapsed_sec"),
-            }
-        )
-
-    return {"runs": series, "count": len(series)}
+    series = [{**rec, "mode": rec.get("mode", P.DEFAULT_MODE)} for rec in records]
+    return {"runs": RI.project(series, fields), "count": len(series), "total": total, "offset": offset}
@@ -11,6 +11,7 @@ from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecEnv
 # Cap parallel env processes (each runs a full Python interpreter on Windows spawn).
 MAX_N_ENVS = int(os.environ.get("MAX_N_ENVS", "64"))
 GPU_MAX_N_ENVS = int(os.environ.get("GPU_MAX_N_ENVS", "512"))
+CPU_BATCHED_MAX_N_ENVS = int(os.environ.get("CPU_BATCHED_MAX_N_ENVS", "4096"))
 MIN_N_ENVS = 1
 ENVS_PER_CORE = int(os.environ.get("ENVS_PER_CORE", "4"))
 MIN_ROLLOUT_STEPS = int(os.environ.get("MIN_ROLLOUT_STEPS", "4096"))
@@ -37,6 +38,8 @@ def max_n_envs(backend: Optional[str] = None) -> int:
         cap = GPU_MAX_N_ENVS
     elif normalized == "auto" and _cuda_available():
         cap = GPU_MAX_N_ENVS
+    elif normalized in ("cpu-batched", "auto"):
+        cap = CPU_BATCHED_MAX_N_ENVS
     else:
         cap = MAX_N_ENVS
     return max(MIN_N_ENVS, cap)
@@ -76,14 +79,16 @@ def ppo_batch_size(device: str, rollout_total: int, *, base: int = 256) -> int:
 def resolve_vecenv_backend(n_envs: int, backend: str = VECENV_BACKEND) -> str:
     n_envs = max(1, int(n_envs))
     normalized = (backend or "auto").strip().lower()
-    if normalized not in ("auto", "subproc", "dummy", "gpu"):
-        raise ValueError(f"Unknown VECENV_BACKEND {backend!r} — use auto, subproc, dummy, or gpu")
-    if n_envs <= 1 and normalized != "gpu":
+    if normalized not in ("auto", "subproc", "dummy", "gpu", "cpu-batched"):
+        raise ValueError(
+            f"Unknown VECENV_BACKEND {backend!r} — use auto, subproc, dummy, gpu, or cpu-batched"
+        )
+    if n_envs <= 1 and normalized not in ("gpu", "cpu-batched"):
         return "dummy"
     if normalized == "auto":
-        if _cuda_available() and n_envs >= 4:
-            return "gpu"
-        return "subproc"
+        if n_envs < 4:
+            return "subproc"
+        return "gpu" if _cuda_available() else "cpu-batched"
     return normalized
 
 
@@ -97,20 +102,34 @@ def make_vec_env(
     goal_hold_sec: int = 0,
     max_episode_steps: Optional[int] = None,
     current_enabled: bool = False,
+    train_seeds: Optional[Sequence[Any]] = None,
+    train_max_contacts: int = 4,
+    nominal_plant: Optional[Any] = None,
+    dynamics_jitter: bool = False,
+    contact_obs_noise_m: float = 0.0,
+    contact_obs_noise_bearing_rad: float = 0.0,
 ) -> VecEnv:
     n_envs = max(1, int(n_envs))
     chosen = resolve_vecenv_backend(n_envs, backend)
-    if chosen == "gpu":
-        from batched_boat_vecenv import make_gpu_vec_env
+    if chosen in ("gpu", "cpu-batched"):
+        from batched_boat_vecenv import make_cpu_batched_vec_env, make_gpu_vec_env
 
-        return make_gpu_vec_env(
+        sim_kwargs = dict(
             n_envs=n_envs,
             mode=mode,
-            device=device,
             goal_hold_sec=goal_hold_sec,
             max_episode_steps=max_episode_steps,
             current_enabled=current_enabled,
+            train_seeds=train_seeds,
+            train_max_contacts=train_max_contacts,
+            nominal_plant=nominal_plant,
+            dynamics_jitter=dynamics_jitter,
+            contact_obs_noise_m=contact_obs_noise_m,
+            contact_obs_noise_bearing_rad=contact_obs_noise_bearing_rad,
         )
+        if chosen == "cpu-batched":
+            return make_cpu_batched_vec_env(**sim_kwargs)
+        return make_gpu_vec_env(device=device, **sim_kwargs)
     if chosen == "dummy":
         return DummyVecEnv(list(factories))
     start_method = "spawn" if sys.platform == "win32" else "fork"
@@ -121,11 +140,12 @@ def training_perf_defaults() -> dict[str, Any]:
     n = recommended_n_envs()
     rollout = rollout_steps_total(n)
     backend = resolve_vecenv_backend(n)
-    note = (
-        "Rollouts on GPU (BatchedBoatVecEnv); PPO policy updates on CUDA."
-        if backend == "gpu"
-        else "Rollouts run on CPU (SubprocVecEnv); PPO policy updates use GPU when available."
-    )
+    if backend == "gpu":
+        note = "Rollouts on GPU (BatchedBoatVecEnv); PPO policy updates on CUDA."
+    elif backend == "cpu-batched":
+        note = "Rollouts in one process (NumpyBatchedBoatVecEnv); PPO policy updates on CPU."
+    else:
+        note = "Rollouts run on CPU (SubprocVecEnv); PPO policy updates use GPU when available."
     return {
         "cpu_count": cpu_count(),
         "recommended_n_envs": n,
@@ -358,8 +358,8 @@ function renderFrame() {
     );
   }
   state.vessels.forEach((v, i) => {
-    drawTrail(state.trails[i], VESSEL_COLORS[i]);
-    drawVessel(v, VESSEL_COLORS[i]);
+    drawTrail(state.trails[i], VESSEL_COLORS[i % VESSEL_COLORS.length]);
+    drawVessel(v, VESSEL_COLORS[i % VESSEL_COLORS.length]);
   });
   drawGoal();
 }
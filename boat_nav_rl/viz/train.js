@@ -52,6 +52,8 @@ let jobRunning = false;
 let lastLiveHash = "";
 let pollInFlight = false;
 let animFrameId = null;
+let trainStream = null;
+let streamLogText = "";
 
 let plantConfig = null;
 let defaultRewardWeights = null;
@@ -777,60 +779,33 @@ function stopLiveLoop() {
   }
 }
 
-async function pollJobStatus() {
-  if (pollInFlight) return;
-  pollInFlight = true;
-  try {
-    const st = await fetchJson("/api/train/status");
-    const running = st.running || st.state === "running" || st.state === "cancelling";
-    setJobRunning(running);
-
-    jobStatus.className = "job-status " + (running ? "running" : st.state || "idle");
-    if (st.state === "cancelling") {
-      jobStatus.textContent = "Pausing… finishing current step and saving checkpoint";
-    } else if (running) {
-      const live = st.live_elapsed_sec != null ? ` · ${st.live_elapsed_sec}s` : "";
-      const sc = st.live_score != null ? ` · score=${(st.live_score * 100).toFixed(0)}%` : "";
-      const succ =
-        st.live_successes != null && st.live_eval_episodes
-          ? ` · ${st.live_successes}/${st.live_eval_episodes} eval`
-          : "";
-      const dev = st.device ? ` · ${st.device}` : "";
-      const jit = st.dynamics_jitter ? " · jitter" : "";
-      const cur = st.current_enabled ? " · current" : "";
-      const hold = st.goal_hold_sec != null ? ` · hold=${st.goal_hold_sec}s` : "";
-      jobStatus.textContent = `Training… mode=${st.mode || "?"}${hold}${cur}${jit}${dev}${live}${succ}${sc}`;
-    } else if (st.state === "completed") {
-      jobStatus.textContent = `Completed → run ${st.run_id || "?"} score=${st.score != null ? st.score.toFixed(3) : "?"}`;
-    } else if (st.state === "cancelled") {
-      jobStatus.textContent = `Paused → saved run ${st.run_id || "?"} (checkpoint + eval)`;
-    } else if (st.state === "failed") {
-      jobStatus.textContent = `Failed (exit ${st.exit_code})`;
-    } else {
-      jobStatus.textContent = "Idle";
-    }
+function trainStreamOpen() {
+  return trainStream != null && trainStream.readyState === EventSource.OPEN;
+}
 
-    trainLog.textContent = st.log_tail || "";
+/** SSE push from /api/train/stream; polling only runs while it is not connected. */
+function connectTrainStream() {
+  if (!window.EventSource || trainStream) return;
+  trainStream = new EventSource("/api/train/stream");
+  trainStream.addEventListener("status", (e) => {
+    applyJobStatus(JSON.parse(e.data)).catch((err) => {
+      jobStatus.textContent = `Status error: ${err.message}`;
+      jobStatus.className = "job-status failed";
+    });
+  });
+  trainStream.addEventListener("log", (e) => {
+    const msg = JSON.parse(e.data);
+    streamLogText = msg.reset ? msg.text : (streamLogText + msg.append).slice(-12000);
+    trainLog.textContent = streamLogText;
     trainLog.scrollTop = trainLog.scrollHeight;
+  });
+}
 
-    const lm = st.live_metrics && st.live_metrics.series ? st.live_metrics.series : [];
-    const hash = liveMetricsFingerprint(lm);
-    if (hash !== lastLiveHash) {
-      lastLiveHash = hash;
-      liveSeries = lm;
-    }
-
-    if (!running && (st.state === "completed" || st.state === "cancelled") && st.run_id && st.run_id !== lastCompletedRun) {
-      lastCompletedRun = st.run_id;
-      liveSeries = [];
-      lastLiveHash = "";
-      montageLockedRunId = st.run_id;
-      montageRunId = null;
-      montageEpisodes = [];
-      montageMetaCache = "";
-      await loadHistory();
-      await loadMontageForRun(st.run_id, { force: true });
-    }
+async function pollJobStatus() {
+  if (pollInFlight || trainStreamOpen()) return;
+  pollInFlight = true;
+  try {
+    await applyJobStatus(await fetchJson("/api/train/status"));
   } catch (err) {
     jobStatus.textContent = `Status error: ${err.message}`;
     jobStatus.className = "job-status failed";
@@ -839,6 +814,60 @@ async function pollJobStatus() {
   }
 }
 
+async function applyJobStatus(st) {
+  const running = st.running || st.state === "running" || st.state === "cancelling";
+  setJobRunning(running);
+
+  jobStatus.className = "job-status " + (running ? "running" : st.state || "idle");
+  if (st.state === "cancelling") {
+    jobStatus.textContent = "Pausing… finishing current step and saving checkpoint";
+  } else if (running) {
+    const live = st.live_elapsed_sec != null ? ` · ${st.live_elapsed_sec}s` : "";
+    const sc = st.live_score != null ? ` · score=${(st.live_score * 100).toFixed(0)}%` : "";
+    const succ =
+      st.live_successes != null && st.live_eval_episodes
+        ? ` · ${st.live_successes}/${st.live_eval_episodes} eval`
+        : "";
+    const dev = st.device ? ` · ${st.device}` : "";
+    const jit = st.dynamics_jitter ? " · jitter" : "";
+    const cur = st.current_enabled ? " · current" : "";
+    const hold = st.goal_hold_sec != null ? ` · hold=${st.goal_hold_sec}s` : "";
+    jobStatus.textContent = `Training… mode=${st.mode || "?"}${hold}${cur}${jit}${dev}${live}${succ}${sc}`;
+  } else if (st.state === "completed") {
+    jobStatus.textContent = `Completed → run ${st.run_id || "?"} score=${st.score != null ? st.score.toFixed(3) : "?"}`;
+  } else if (st.state === "cancelled") {
+    jobStatus.textContent = `Paused → saved run ${st.run_id || "?"} (checkpoint + eval)`;
+  } else if (st.state === "failed") {
+    jobStatus.textContent = `Failed (exit ${st.exit_code})`;
+  } else {
+    jobStatus.textContent = "Idle";
+  }
+
+  if (st.log_tail !== undefined) {
+    trainLog.textContent = st.log_tail || "";
+    trainLog.scrollTop = trainLog.scrollHeight;
+  }
+
+  const lm = st.live_metrics && st.live_metrics.series ? st.live_metrics.series : [];
+  const hash = liveMetricsFingerprint(lm);
+  if (hash !== lastLiveHash) {
+    lastLiveHash = hash;
+    liveSeries = lm;
+  }
+
+  if (!running && (st.state === "completed" || st.state === "cancelled") && st.run_id && st.run_id !== lastCompletedRun) {
+    lastCompletedRun = st.run_id;
+    liveSeries = [];
+    lastLiveHash = "";
+    montageLockedRunId = st.run_id;
+    montageRunId = null;
+    montageEpisodes = [];
+    montageMetaCache = "";
+    await loadHistory();
+    await loadMontageForRun(st.run_id, { force: true });
+  }
+}
+
 async function startTraining(resumeRunId) {
   liveSeries = [];
   lastLiveHash = "";
@@ -955,6 +984,7 @@ loadPlantConfig()
       statusLine.textContent = "Server connection failed";
       throw err;
     }
+    connectTrainStream();
     return pollJobStatus();
   })
   .catch((err) => {